@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+업종 트리 기반 algorithm_type 분류기
+- algorithm_rules.json 의 규칙(id / path / name → type)을 CategoryIndex 트리에 적용
+- 규칙이 없는 하위 카테고리는 가장 가까운 조상의 type 을 상속 (한식, 카페,디저트 → 음식점 규칙)
+- 생성 시 id → type, 이름 → type 테이블을 한 번 계산하고 이후에는 dict 조회만 수행
+- classify_many() 는 (categoryCode, category) 조합별로 한 번만 판정해 대량 재분류에 사용
+사용법:
+  python algorithm_classifier.py scrape_results/*.json           # 재분류 결과 집계만 출력
+  python algorithm_classifier.py --write scrape_results/*.json   # algorithm_type 을 갱신해 저장
+"""
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import json_codec
+from category_index import CATEGORY_JSON, CATEGORY_TSV, CategoryIndex
+
+BASE_DIR = Path(__file__).parent
+RULES_FILE = BASE_DIR / "algorithm_rules.json"
+
+DEFAULT_TYPE = "TYPE_A"
+# HTML 검색 결과의 category 문자열은 "카페,디저트", "한식>국밥" 처럼 묶여 올 수 있음
+NAME_SPLIT = re.compile(r"[,>/]")
+
+
+def load_rules(path: Path = RULES_FILE) -> Dict[str, Any]:
+    if Path(path).exists():
+        try:
+            return json_codec.read(path)
+        except Exception as e:
+            print(f"[WARN] failed to load rules {path}: {e}")
+    return {"default": DEFAULT_TYPE, "rules": []}
+
+
+class AlgorithmClassifier:
+    """
+    규칙 + 카테고리 트리 → 조회 테이블.
+    - by_id: categoryId → type
+    - by_name: 카테고리 이름(및 콤마 분리 토큰) → (depth, type), 동명이면 가장 얕은 노드 기준
+    - 레코드에 여러 카테고리가 있으면 가장 깊은(구체적인) 것이 우선
+    """
+
+    def __init__(self, rules: Dict[str, Any], index: Optional[CategoryIndex] = None):
+        self.default = rules.get("default") or DEFAULT_TYPE
+        self.by_id: Dict[str, str] = {}
+        self.by_name: Dict[str, Tuple[int, str]] = {}
+        rule_list = rules.get("rules", [])
+        id_rules = {str(r["id"]): r["type"] for r in rule_list if r.get("id")}
+        path_rules = {r["path"]: r["type"] for r in rule_list if r.get("path")}
+        name_rules = {r["name"]: r["type"] for r in rule_list if r.get("name")}
+
+        if index is not None:
+            # 전위순회 순서이므로 부모 type 이 항상 먼저 계산됨
+            types: List[str] = []
+            for pos in range(len(index)):
+                parent = index.parent[pos]
+                own = (
+                    id_rules.get(index.ids[pos])
+                    or path_rules.get(index.paths[pos])
+                    or name_rules.get(index.names[pos])
+                )
+                t = own or (types[parent] if parent >= 0 else self.default)
+                types.append(t)
+                if index.ids[pos]:
+                    self.by_id[index.ids[pos]] = t
+                depth = index.depth[pos]
+                self._add_name(index.names[pos], depth, t)
+                for part in NAME_SPLIT.split(index.names[pos]):
+                    self._add_name(part.strip(), depth, t)
+        # 트리에 없는 이름도 규칙 문자열 그대로는 판정 가능해야 함 (트리 미생성 환경)
+        for name, t in name_rules.items():
+            self.by_name.setdefault(name, (0, t))
+        self.by_id.update(id_rules)
+
+    def _add_name(self, name: str, depth: int, t: str) -> None:
+        if not name:
+            return
+        cur = self.by_name.get(name)
+        if cur is None or depth < cur[0]:
+            self.by_name[name] = (depth, t)
+
+    @classmethod
+    def load(cls, rules_path: Path = RULES_FILE, index: Optional[CategoryIndex] = None) -> "AlgorithmClassifier":
+        if index is None and (CATEGORY_JSON.exists() or CATEGORY_TSV.exists()):
+            try:
+                index = CategoryIndex.load_or_build()
+            except Exception as e:
+                print(f"[WARN] category index unavailable, using literal rules only: {e}")
+        return cls(load_rules(rules_path), index)
+
+    def _lookup_name(self, name: str) -> Optional[Tuple[int, str]]:
+        hit = self.by_name.get(name)
+        if hit is not None:
+            return hit
+        best = None
+        for part in NAME_SPLIT.split(name):
+            h = self.by_name.get(part.strip())
+            if h is not None and (best is None or h[0] > best[0]):
+                best = h
+        return best
+
+    def classify(self, category: Iterable[str], category_code: str = "") -> str:
+        if category_code:
+            t = self.by_id.get(str(category_code))
+            if t:
+                return t
+        best = None
+        for name in category or []:
+            hit = self._lookup_name(name)
+            if hit is not None and (best is None or hit[0] > best[0]):
+                best = hit
+        return best[1] if best else self.default
+
+    def classify_record(self, rec: Dict[str, Any]) -> str:
+        return self.classify(rec.get("category", []), rec.get("categoryCode", ""))
+
+    def classify_many(self, records: Iterable[Dict[str, Any]], assign: bool = False) -> List[str]:
+        """
+        대량 분류. 서로 다른 (categoryCode, category) 조합 수만큼만 판정하고 나머지는 캐시 조회.
+        assign=True 면 각 레코드의 algorithm_type 도 갱신.
+        """
+        memo: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        out: List[str] = []
+        append = out.append
+        for rec in records:
+            key = (rec.get("categoryCode") or "", tuple(rec.get("category") or ()))
+            t = memo.get(key)
+            if t is None:
+                t = memo[key] = self.classify(key[1], key[0])
+            if assign:
+                rec["algorithm_type"] = t
+            append(t)
+        return out
+
+
+_default: Optional[AlgorithmClassifier] = None
+
+
+def default_classifier() -> AlgorithmClassifier:
+    global _default
+    if _default is None:
+        _default = AlgorithmClassifier.load()
+    return _default
+
+
+def main():
+    args = sys.argv[1:]
+    write = "--write" in args
+    paths = [Path(a) for a in args if a != "--write"]
+    if not paths:
+        print("usage: python algorithm_classifier.py [--write] <snapshot.json> ...")
+        return
+    clf = default_classifier()
+    total = changed = 0
+    started = time.perf_counter()
+    for path in paths:
+        try:
+            data = json_codec.read(path)
+        except Exception as e:
+            print(f"[WARN] skip {path}: {e}")
+            continue
+        records = data.get("records", [])
+        before = [r.get("algorithm_type") for r in records]
+        after = clf.classify_many(records, assign=True)
+        diff = sum(1 for a, b in zip(before, after) if a != b)
+        total += len(records)
+        changed += diff
+        if write and diff:
+            json_codec.write(path, data)
+        print(f"[INFO] {path.name}: records={len(records)} changed={diff}")
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] total={total} changed={changed} elapsed={elapsed:.2f}s" + ("" if write else " (dry-run)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Playwright 도구들이 함께 쓰는 상주 Chromium 서비스
+- persistent context(out/browser_profile)로 Chromium 을 띄우고 CDP 포트를 열어 둠
+- 접속 정보는 browser_service.json 에 기록 → category_playwright 등은 connect_over_cdp 로 즉시 붙음
+  (서비스가 없으면 기존처럼 chromium.launch() 로 직접 실행)
+- 로그인 상태는 storage_state.json 으로 공유: login_cookie_capture 가 저장, 새 컨텍스트는 이 파일로 시작
+- 서비스는 storage_state.json 을 쓰지 않음(저장은 login_cookie_capture 몫)
+  대신 파일 mtime 을 주기적으로 보고 바뀌면 쿠키를 add_cookies 로 다시 읽어 들임
+사용법:
+  python browser_service.py                 # headless 서비스 시작 (Ctrl+C 로 종료)
+  python browser_service.py --headed --port=9333
+  python browser_service.py --status
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent
+SERVICE_FILE = BASE_DIR / "browser_service.json"
+STORAGE_STATE = BASE_DIR / "storage_state.json"
+PROFILE_DIR = BASE_DIR / "out" / "browser_profile"
+DEFAULT_PORT = 9222
+CONNECT_TIMEOUT_MS = 3000
+STATE_POLL_EVERY = 5  # 초
+
+
+def read_service() -> Optional[Dict[str, Any]]:
+    if not SERVICE_FILE.exists():
+        return None
+    try:
+        return json_codec.read(SERVICE_FILE)
+    except Exception:
+        return None
+
+
+def context_kwargs() -> Dict[str, Any]:
+    """new_context() 에 넘길 인자: 저장된 로그인 상태가 있으면 그걸로 시작"""
+    if STORAGE_STATE.exists():
+        return {"storage_state": str(STORAGE_STATE)}
+    return {}
+
+
+async def connect_async(p, headless: bool = True) -> Tuple[Any, bool]:
+    """
+    async API 용. (browser, owned) 반환.
+    owned=False 면 상주 서비스에 붙은 것 → close() 는 연결만 끊고 브라우저는 계속 살아 있음.
+    """
+    info = read_service()
+    if info:
+        try:
+            browser = await p.chromium.connect_over_cdp(info["endpoint"], timeout=CONNECT_TIMEOUT_MS)
+            return browser, False
+        except Exception as e:
+            print(f"[WARN] browser service unreachable ({info.get('endpoint')}), launching locally: {e}")
+    return await p.chromium.launch(headless=headless), True
+
+
+def connect_sync(p, headless: bool = True) -> Tuple[Any, bool]:
+    """sync API 용. connect_async 와 동일한 규칙."""
+    info = read_service()
+    if info:
+        try:
+            return p.chromium.connect_over_cdp(info["endpoint"], timeout=CONNECT_TIMEOUT_MS), False
+        except Exception as e:
+            print(f"[WARN] browser service unreachable ({info.get('endpoint')}), launching locally: {e}")
+    return p.chromium.launch(headless=headless), True
+
+
+def _state_mtime() -> Optional[float]:
+    try:
+        return STORAGE_STATE.stat().st_mtime
+    except OSError:
+        return None
+
+
+async def _load_state(context) -> None:
+    try:
+        state = json_codec.read(STORAGE_STATE)
+        await context.add_cookies(state.get("cookies", []))
+    except Exception as e:
+        print(f"[WARN] failed to load {STORAGE_STATE.name}: {e}")
+
+
+async def serve(port: int = DEFAULT_PORT, headless: bool = True) -> None:
+    from playwright.async_api import async_playwright
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    async with async_playwright() as p:
+        context = await p.chromium.launch_persistent_context(
+            str(PROFILE_DIR),
+            headless=headless,
+            args=[f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"],
+        )
+        loaded = _state_mtime()
+        if loaded is not None:
+            await _load_state(context)
+        info = {
+            "endpoint": f"http://127.0.0.1:{port}",
+            "pid": os.getpid(),
+            "headless": headless,
+            "started": int(time.time()),
+        }
+        json_codec.write(SERVICE_FILE, info)
+        print(f"[INFO] browser service ready -> {info['endpoint']} (profile: {PROFILE_DIR})")
+        try:
+            while True:
+                await asyncio.sleep(STATE_POLL_EVERY)
+                mtime = _state_mtime()
+                if mtime is not None and mtime != loaded:
+                    loaded = mtime
+                    await _load_state(context)
+                    print(f"[INFO] reloaded cookies from {STORAGE_STATE.name}")
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            pass
+        finally:
+            if SERVICE_FILE.exists():
+                SERVICE_FILE.unlink()
+            await context.close()
+            print("[INFO] browser service stopped")
+
+
+def main():
+    args = sys.argv[1:]
+    if "--status" in args:
+        info = read_service()
+        print(json_codec.dumps(info, indent=True) if info else "browser service not running")
+        return
+    port = DEFAULT_PORT
+    for a in args:
+        if a.startswith("--port="):
+            port = int(a.split("=", 1)[1])
+    try:
+        asyncio.run(serve(port=port, headless="--headed" not in args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
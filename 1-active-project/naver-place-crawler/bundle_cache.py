@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+JS 번들 로컬 캐시 (category_scraper 용)
+- URL 별 ETag / Last-Modified / 본문 sha256 기록 → 재실행 시 If-None-Match / If-Modified-Since 로 조건부 요청
+- 본문은 해시 이름의 gzip 파일로 보관 (패턴이 바뀌어도 재다운로드 없이 재스캔 가능)
+- 추출 결과(code → name, 하위 JS 경로)는 "본문 해시 + 패턴 시그니처" 단위로 캐시 → 같은 번들은 다시 스캔하지 않음
+- 저장 위치: out/bundle_cache/index.json, out/bundle_cache/bodies/<sha>.js.gz
+- fetch / 추출 결과 기록은 스레드 여러 개가 동시에 호출해도 안전 (내부 lock)
+"""
+import gzip
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import json_codec
+
+CACHE_DIR = Path("out/bundle_cache")
+INDEX_NAME = "index.json"
+STREAM_CHUNK = 1 << 16
+
+
+def pattern_signature(patterns: Iterable[Any]) -> str:
+    """추출 규칙이 바뀌면 캐시가 자동 무효화되도록 정규식 원문으로 시그니처 생성"""
+    raw = "\n".join(getattr(p, "pattern", str(p)) for p in patterns)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+class BundleCache:
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.dir = Path(cache_dir)
+        self.body_dir = self.dir / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / INDEX_NAME
+        self.urls: Dict[str, Dict[str, Any]] = {}
+        self.extracted: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "scan_hits": 0, "scan_misses": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        if self.index_path.exists():
+            try:
+                data = json_codec.read(self.index_path)
+                self.urls = data.get("urls", {})
+                self.extracted = data.get("extracted", {})
+            except Exception as e:
+                print(f"[WARN] bundle cache index unreadable, starting fresh: {e}")
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"urls": self.urls, "extracted": self.extracted}
+            data = json_codec.dumpb(payload, indent=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(self.index_path)
+
+    # ---------- 본문 ----------
+    def body_path(self, sha: str) -> Path:
+        return self.body_dir / f"{sha}.js.gz"
+
+    def read_body(self, sha: str) -> Optional[str]:
+        path = self.body_path(sha)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def fetch(self, session, url: str, headers: Dict[str, str], timeout: float = 10) -> str:
+        """
+        조건부 GET. 본문 sha256 을 반환한다.
+        - 304 면 기존 해시를 그대로 반환 (추출 결과가 캐시에 있으면 본문이 필요 없음)
+        - 새 본문은 청크 단위로 해시 계산 + gzip 저장 → 번들 크기와 무관하게 메모리 사용량 고정
+        """
+        with self._lock:
+            meta = dict(self.urls.get(url) or {})
+        req_headers = dict(headers)
+        if meta.get("sha") and self.body_path(meta["sha"]).exists():
+            if meta.get("etag"):
+                req_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                req_headers["If-Modified-Since"] = meta["last_modified"]
+        r = session.get(url, headers=req_headers, timeout=timeout, stream=True)
+        try:
+            if r.status_code == 304 and meta.get("sha"):
+                with self._lock:
+                    self.stats["not_modified"] += 1
+                    self.urls[url]["checked_at"] = int(time.time())
+                return meta["sha"]
+            r.raise_for_status()
+            hasher = hashlib.sha256()
+            size = 0
+            tmp = self.body_dir / f"{threading.get_ident()}_{time.time_ns()}.tmp"
+            try:
+                with gzip.open(tmp, "wb", compresslevel=6) as f:
+                    for chunk in r.iter_content(STREAM_CHUNK):
+                        hasher.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            except BaseException:
+                tmp.unlink(missing_ok=True)  # 받다가 끊긴 본문은 남기지 않음
+                raise
+        finally:
+            r.close()
+        sha = hasher.hexdigest()
+        path = self.body_path(sha)
+        if path.exists():
+            tmp.unlink()
+        else:
+            tmp.replace(path)
+        with self._lock:
+            self.stats["fetched"] += 1
+            self.stats["bytes"] += size
+            self.urls[url] = {
+                "etag": r.headers.get("ETag", ""),
+                "last_modified": r.headers.get("Last-Modified", ""),
+                "sha": sha,
+                "size": size,
+                "checked_at": int(time.time()),
+            }
+        return sha
+
+    # ---------- 추출 결과 ----------
+    def get_extracted(self, sha: str, signature: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hit = self.extracted.get(f"{sha}:{signature}")
+            self.stats["scan_hits" if hit is not None else "scan_misses"] += 1
+        return hit
+
+    def put_extracted(self, sha: str, signature: str, codes: Dict[str, str], js_urls: List[str]) -> None:
+        with self._lock:
+            self.extracted[f"{sha}:{signature}"] = {"codes": codes, "js_urls": sorted(js_urls)}
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"fetched={s['fetched']} not_modified={s['not_modified']} "
+                f"scan_hits={s['scan_hits']} scan_misses={s['scan_misses']} "
+                f"downloaded={s['bytes'] / 1024:.0f}KB")
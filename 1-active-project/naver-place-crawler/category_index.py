@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+lPath 기반 업종 카테고리 트리 인덱스
+- category_token_result.json / .tsv 의 평면 레코드({id, name, path})를 한 번만 파싱해 트리로 구성
+- id 조회 O(1), 이름 조회, 이름 접두사 검색, 조상/자손/경로 접두사 질의 지원
+- 노드는 전위순회(preorder) 순서의 배열로 저장 → 자손 = 연속 구간, 조상 판정 = 구간 비교
+- pickle 직렬화(category_index.pkl)로 다음 실행부터 수 ms 안에 로드
+사용법:
+  python category_index.py            # category_token_result.json → category_index.pkl
+  python category_index.py 카페        # 이름 접두사 검색
+"""
+import bisect
+import pickle
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent
+CATEGORY_JSON = BASE_DIR / "category_token_result.json"
+CATEGORY_TSV = BASE_DIR / "category_token_result.tsv"
+INDEX_FILE = BASE_DIR / "category_index.pkl"
+
+PATH_SEP = "||"
+INDEX_VERSION = 1
+
+
+def split_lpath(lpath: str) -> List[str]:
+    """'||음식점||카페,디저트||카페' → ['음식점', '카페,디저트', '카페']"""
+    return [seg.strip() for seg in (lpath or "").split(PATH_SEP) if seg.strip()]
+
+
+def join_lpath(segments: Iterable[str]) -> str:
+    segs = list(segments)
+    return PATH_SEP + PATH_SEP.join(segs) if segs else ""
+
+
+def normalize_record(rec: Dict[str, Any]) -> Dict[str, str]:
+    """json/tsv/GraphQL 응답의 키 변형(id/code/categoryId, path/lPath)을 통일한다."""
+    cid = rec.get("id") or rec.get("code") or rec.get("categoryId") or ""
+    name = rec.get("name") or rec.get("categoryName") or ""
+    path = rec.get("path") or rec.get("lPath") or ""
+    return {"id": str(cid), "name": str(name), "path": str(path)}
+
+
+def read_category_records(path: Path) -> List[Dict[str, str]]:
+    """category_token_result.json(categories 배열) 또는 .tsv 를 읽어 정규화된 레코드 목록으로 반환"""
+    path = Path(path)
+    if path.suffix.lower() == ".tsv":
+        out = []
+        with path.open("r", encoding="utf-8") as f:
+            header = f.readline().rstrip("\n").split("\t")
+            for line in f:
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) < len(header):
+                    continue
+                out.append(normalize_record(dict(zip(header, cols))))
+        return out
+    data = json_codec.read(path)
+    return [normalize_record(c) for c in data.get("categories", [])]
+
+
+class CategoryIndex:
+    """
+    배열 기반 카테고리 트리.
+    - 노드 i 의 자손은 [i+1, end[i]) 구간, 조상은 parent 배열을 따라 올라감
+    - lPath 중간 단계가 별도 레코드로 존재하지 않으면 id="" 인 합성 노드로 채움
+    - 조회 결과는 기존 레코드와 같은 {id, name, path} dict 로 반환
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.paths: List[str] = []
+        self.parent = array("i")
+        self.depth = array("i")
+        self.end = array("i")
+        self.by_id: Dict[str, int] = {}
+        self.by_path: Dict[str, int] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self._sorted_names: List[str] = []
+        self._sorted_pos: List[int] = []
+        self._sorted_ids: List[str] = []
+        self._sorted_id_pos: List[int] = []
+
+    # ---------- 생성 ----------
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CategoryIndex":
+        # 1) 경로 단위로 노드 수집 (중간 경로 포함)
+        node_id: Dict[str, str] = {}
+        node_name: Dict[str, str] = {}
+        children: Dict[str, List[str]] = {"": []}
+        for raw in records:
+            rec = normalize_record(raw)
+            segs = split_lpath(rec["path"])
+            if not segs:
+                # 경로가 없으면 이름 하나짜리 루트로 취급
+                segs = [rec["name"]] if rec["name"] else []
+            if not segs:
+                continue
+            parent_key = ""
+            for depth in range(1, len(segs) + 1):
+                key = join_lpath(segs[:depth])
+                if key not in node_name:
+                    node_name[key] = segs[depth - 1]
+                    children[key] = []
+                    children[parent_key].append(key)
+                parent_key = key
+            if rec["id"]:
+                node_id[parent_key] = rec["id"]
+                if rec["name"]:
+                    node_name[parent_key] = rec["name"]
+
+        # 2) 전위순회로 배열 배치 (형제는 이름순)
+        idx = cls()
+        stack = [(k, -1, 0) for k in sorted(children[""], key=lambda k: node_name[k], reverse=True)]
+        while stack:
+            key, parent, depth = stack.pop()
+            pos = len(idx.names)
+            idx.ids.append(node_id.get(key, ""))
+            idx.names.append(node_name[key])
+            idx.paths.append(key)
+            idx.parent.append(parent)
+            idx.depth.append(depth)
+            idx.end.append(0)
+            for child in sorted(children[key], key=lambda k: node_name[k], reverse=True):
+                stack.append((child, pos, depth + 1))
+        # 자손 구간 끝: 뒤에서부터 depth 가 같거나 얕은 첫 노드 위치
+        n = len(idx.names)
+        open_nodes: List[int] = []
+        for pos in range(n):
+            while open_nodes and idx.depth[open_nodes[-1]] >= idx.depth[pos]:
+                idx.end[open_nodes.pop()] = pos
+            open_nodes.append(pos)
+        for pos in open_nodes:
+            idx.end[pos] = n
+        idx._build_lookups()
+        return idx
+
+    @classmethod
+    def from_file(cls, path: Path) -> "CategoryIndex":
+        return cls.from_records(read_category_records(path))
+
+    def _build_lookups(self) -> None:
+        self.by_id = {cid: i for i, cid in enumerate(self.ids) if cid}
+        self.by_path = {p: i for i, p in enumerate(self.paths)}
+        self.by_name = {}
+        for i, name in enumerate(self.names):
+            self.by_name.setdefault(name, []).append(i)
+        order = sorted(range(len(self.names)), key=lambda i: self.names[i])
+        self._sorted_names = [self.names[i] for i in order]
+        self._sorted_pos = order
+        id_order = sorted(self.by_id.values(), key=lambda i: self.ids[i])
+        self._sorted_ids = [self.ids[i] for i in id_order]
+        self._sorted_id_pos = id_order
+
+    # ---------- 직렬화 ----------
+    def save(self, path: Path = INDEX_FILE) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "ids": self.ids,
+            "names": self.names,
+            "paths": self.paths,
+            "parent": self.parent.tobytes(),
+            "depth": self.depth.tobytes(),
+            "end": self.end.tobytes(),
+        }
+        tmp = Path(path).with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_FILE) -> "CategoryIndex":
+        with Path(path).open("rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported index version: {payload.get('version')}")
+        idx = cls()
+        idx.ids = payload["ids"]
+        idx.names = payload["names"]
+        idx.paths = payload["paths"]
+        for attr in ("parent", "depth", "end"):
+            arr = array("i")
+            arr.frombytes(payload[attr])
+            setattr(idx, attr, arr)
+        idx._build_lookups()
+        return idx
+
+    @classmethod
+    def load_or_build(cls, source: Optional[Path] = None, index_path: Path = INDEX_FILE) -> "CategoryIndex":
+        """인덱스 파일이 원본보다 최신이면 로드, 아니면 원본에서 다시 만들어 저장"""
+        if source is None:
+            source = CATEGORY_JSON if CATEGORY_JSON.exists() else CATEGORY_TSV
+        source = Path(source)
+        index_path = Path(index_path)
+        if index_path.exists() and (not source.exists() or index_path.stat().st_mtime >= source.stat().st_mtime):
+            try:
+                return cls.load(index_path)
+            except Exception as e:
+                print(f"[WARN] category index load failed, rebuilding: {e}")
+        idx = cls.from_file(source)
+        try:
+            idx.save(index_path)
+        except Exception as e:
+            print(f"[WARN] category index save failed: {e}")
+        return idx
+
+    # ---------- 조회 ----------
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, cid: str) -> bool:
+        return cid in self.by_id
+
+    def node(self, pos: int) -> Dict[str, str]:
+        return {"id": self.ids[pos], "name": self.names[pos], "path": self.paths[pos]}
+
+    def position(self, cid: str) -> Optional[int]:
+        return self.by_id.get(str(cid))
+
+    def get(self, cid: str) -> Optional[Dict[str, str]]:
+        pos = self.by_id.get(str(cid))
+        return None if pos is None else self.node(pos)
+
+    def get_by_path(self, lpath: str) -> Optional[Dict[str, str]]:
+        pos = self.by_path.get(join_lpath(split_lpath(lpath)))
+        return None if pos is None else self.node(pos)
+
+    def find(self, name: str) -> List[Dict[str, str]]:
+        """이름이 정확히 일치하는 노드 (동명 카테고리는 여러 개일 수 있음)"""
+        return [self.node(i) for i in self.by_name.get(name, [])]
+
+    @staticmethod
+    def _prefix_range(keys: List[str], positions: List[int], prefix: str, limit: int) -> List[int]:
+        out = []
+        i = bisect.bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix) and len(out) < limit:
+            out.append(positions[i])
+            i += 1
+        return out
+
+    def search(self, prefix: str, limit: int = 100) -> List[Dict[str, str]]:
+        """이름 접두사 검색 (정렬된 이름 배열 + 이분 탐색)"""
+        return [self.node(i) for i in self._prefix_range(self._sorted_names, self._sorted_pos, prefix, limit)]
+
+    def search_positions(self, text: str, limit: int = 100) -> List[int]:
+        """id 접두사 + 이름 접두사 검색 결과 위치 (id 일치가 먼저, 중복 제거)"""
+        text = text.strip()
+        if not text:
+            return []
+        hits = self._prefix_range(self._sorted_ids, self._sorted_id_pos, text, limit)
+        seen = set(hits)
+        for pos in self._prefix_range(self._sorted_names, self._sorted_pos, text, limit):
+            if len(hits) >= limit:
+                break
+            if pos not in seen:
+                hits.append(pos)
+        return hits
+
+    def root_positions(self) -> List[int]:
+        # 루트끼리는 자손 구간 끝(end)으로 건너뛰며 이어짐 → 전체 노드를 훑지 않음
+        out = []
+        i = 0
+        while i < len(self.names):
+            out.append(i)
+            i = self.end[i]
+        return out
+
+    def roots(self) -> List[Dict[str, str]]:
+        return [self.node(i) for i in self.root_positions()]
+
+    def has_children(self, pos: int) -> bool:
+        return self.end[pos] > pos + 1
+
+    def children_of(self, pos: int) -> List[int]:
+        out = []
+        i = pos + 1
+        while i < self.end[pos]:
+            out.append(i)
+            i = self.end[i]
+        return out
+
+    def children(self, cid: str) -> List[Dict[str, str]]:
+        pos = self.by_id.get(str(cid))
+        return [] if pos is None else [self.node(i) for i in self.children_of(pos)]
+
+    def ancestor_positions(self, pos: int) -> List[int]:
+        """루트 → 부모 순서"""
+        out = []
+        p = self.parent[pos]
+        while p >= 0:
+            out.append(p)
+            p = self.parent[p]
+        out.reverse()
+        return out
+
+    def ancestors(self, cid: str) -> List[Dict[str, str]]:
+        pos = self.by_id.get(str(cid))
+        return [] if pos is None else [self.node(i) for i in self.ancestor_positions(pos)]
+
+    def descendants(self, cid: str) -> List[Dict[str, str]]:
+        pos = self.by_id.get(str(cid))
+        return [] if pos is None else [self.node(i) for i in range(pos + 1, self.end[pos])]
+
+    def is_ancestor(self, ancestor_id: str, cid: str) -> bool:
+        a = self.by_id.get(str(ancestor_id))
+        b = self.by_id.get(str(cid))
+        if a is None or b is None:
+            return False
+        return a < b < self.end[a]
+
+    def with_path_prefix(self, lpath: str) -> List[Dict[str, str]]:
+        """해당 lPath 노드 자신과 모든 하위 카테고리"""
+        pos = self.by_path.get(join_lpath(split_lpath(lpath)))
+        return [] if pos is None else [self.node(i) for i in range(pos, self.end[pos])]
+
+
+def main():
+    source = CATEGORY_JSON if CATEGORY_JSON.exists() else CATEGORY_TSV
+    idx = CategoryIndex.from_file(source)
+    idx.save(INDEX_FILE)
+    print(f"[INFO] category index saved -> {INDEX_FILE} (nodes={len(idx)}, ids={len(idx.by_id)})")
+    for prefix in sys.argv[1:]:
+        for node in idx.search(prefix):
+            print(f"{node['id'] or '-'}\t{node['name']}\t{node['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,66 @@
 ﻿"""
 Playwright 기반 카테고리 수집 (강화)
 - map.naver.com/v5/ 및 m.place.naver.com 검색 페이지를 순회
-- 모든 응답 텍스트를 검사하여 code/name 패턴 추출
-- category/cat 문자열이 포함된 응답은 원문 저장(out/categories_raw)
+- 모든 응답 텍스트를 검사하여 code/name 패턴 추출 (stream_scanner 로 응답당 1회 스캔)
+- JS/JSON/HTML 응답만 본문을 읽고, MAX_BODY_BYTES 초과 응답은 건너뜀
+- category/cat 문자열이 포함되거나 패턴이 잡힌 응답은 원문 저장
+  (out/categories_raw: sha256 → zstd/gzip 파일 + index.json, 같은 본문은 한 번만 저장)
 - 페이지 전역 객체 dump (window.__APOLLO_STATE__, window.__PLACE_STATE__ 등) 저장
+- 기본(fast) 모드: 이미지/폰트/미디어/트래커 요청은 route 로 차단하고,
+  networkidle 이 되거나 QUIET_MS 동안 새 카테고리 응답이 없으면 다음 타겟으로 이동
+  (PAGE_MAX_WAIT_MS 는 상한으로만 사용)
+- Chromium 1개에 컨텍스트 CONTEXTS 개를 띄워 타겟 큐를 병렬 처리, 결과는 하나의 code map 으로 병합
+- browser_service.py 가 실행 중이면 그 Chromium 에 접속하고 저장된 로그인 상태(storage_state.json)로 컨텍스트 생성
+사용법:
+  python category_playwright.py                 # 기본 타겟, fast 모드
+  python category_playwright.py --legacy        # 타겟마다 고정 12초 대기 (이전 동작)
+  python category_playwright.py http://127.0.0.1:8000/list.html ...   # 타겟 직접 지정
+  python category_playwright.py --contexts=8 --targets-file=targets.txt  # 한 줄에 URL 하나
+  python category_playwright.py --selftest      # 로컬 http.server 픽스처로 content-type/크기 필터,
+                                                # MAX_BODY_BYTES 상한, 컨텍스트 풀 점검 (네이버 접속 없음)
 """
 import asyncio
 import re
-import json
+import sys
+import tempfile
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import urlsplit
 from playwright.async_api import async_playwright
 
+import json_codec
+from browser_service import connect_async, context_kwargs
+from raw_store import ContentStore
+from stream_scanner import ScanPattern, StreamScanner
+
 OUT_FILE = "category_master.json"
+TARGETS = [
+    "https://map.naver.com/v5/",
+    "https://m.place.naver.com/restaurant/list?query=%EC%B9%B4%ED%8E%98",
+    "https://m.place.naver.com/restaurant/list?query=%EB%A7%9B%EC%A7%91",
+    "https://m.place.naver.com/beauty/hair/list?query=%EB%AF%B8%EC%9A%A9%EC%8B%A4",
+]
+PAGE_MAX_WAIT_MS = 12000  # 타겟당 최대 대기 (legacy 모드에서는 항상 이만큼 대기)
+QUIET_MS = 2500           # 이 시간 동안 새 카테고리 응답이 없으면 페이지 완료로 간주
+CONTEXTS = 4              # 동시에 타겟을 처리할 브라우저 컨텍스트 수
+BLOCK_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCK_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "nlog.naver.com", "lcs.naver.com", "wcs.naver.net", "veta.naver.com", "tivan.naver.com",
+)
 RAW_DIR = Path("out/categories_raw")
-RAW_DIR.mkdir(parents=True, exist_ok=True)
+SCAN_CONTENT_TYPES = ("javascript", "json", "html")
+MAX_BODY_BYTES = 8 * 1024 * 1024
 
 PATTERN1 = re.compile(r"\"code\":\"([A-Za-z0-9_-]+)\"[^}]{0,400}?\"name\":\"([^\"]+)\"")
 PATTERN2 = re.compile(r"\"categoryCode\":\"([A-Za-z0-9_-]+)\"[^}]{0,400}?\"category\":\"([^\"]+)\"")
+# PATTERN1/PATTERN2 를 응답당 한 번의 청크 스캔으로 처리 (리터럴 프리필터 후 정규식)
+SCANNER = StreamScanner([
+    ScanPattern("code", PATTERN1, '"code":"', 1024),
+    ScanPattern("categoryCode", PATTERN2, '"categoryCode":"', 1024),
+])
 
 
 def dedup(categories):
@@ -27,69 +70,139 @@ def dedup(categories):
     return m
 
 
-def save_text(idx: int, label: str, text: str):
-    fname = RAW_DIR / f"resp_{idx}_{label}.txt"
-    fname.write_text(text, encoding="utf-8", errors="replace")
+async def block_unneeded(route):
+    req = route.request
+    host = urlsplit(req.url).hostname or ""
+    if req.resource_type in BLOCK_RESOURCE_TYPES or any(host == h or host.endswith("." + h) for h in BLOCK_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
 
 
-async def scrape():
-    targets = [
-        "https://map.naver.com/v5/",
-        "https://m.place.naver.com/restaurant/list?query=%EC%B9%B4%ED%8E%98",
-        "https://m.place.naver.com/restaurant/list?query=%EB%A7%9B%EC%A7%91",
-        "https://m.place.naver.com/beauty/hair/list?query=%EB%AF%B8%EC%9A%A9%EC%8B%A4",
-    ]
+async def wait_for_settle(page, activity, quiet_ms: int = QUIET_MS, max_wait_ms: int = PAGE_MAX_WAIT_MS):
+    """networkidle 도달, QUIET_MS 동안 새 카테고리 응답 없음, 상한 도달 중 먼저 오는 조건에서 반환"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    idle = asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=max_wait_ms))
+    try:
+        while not idle.done():
+            now = loop.time()
+            if now - max(activity["last_hit"], started) >= quiet_ms / 1000:
+                return "quiet"
+            if now - started >= max_wait_ms / 1000:
+                return "timeout"
+            await asyncio.wait({idle}, timeout=0.1)
+        return "networkidle" if idle.exception() is None else "timeout"
+    finally:
+        if not idle.done():
+            idle.cancel()
+
+
+async def context_worker(browser, wid: int, queue: "asyncio.Queue", code_map: dict, stats: dict,
+                         store: ContentStore, fast: bool):
+    """
+    브라우저 컨텍스트 하나를 맡아 큐가 빌 때까지 타겟을 처리.
+    컨텍스트마다 자체 응답 핸들러/활동 시각을 두고, 타겟이 끝날 때마다 공용 code_map 에 병합.
+    """
+    context = await browser.new_context(**context_kwargs())
+    if fast:
+        await context.route("**/*", block_unneeded)
+    page = await context.new_page()
     categories = []
-    resp_count = 0
-    saved = 0
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    activity = {"last_hit": 0.0}
 
-        async def handle_response(response):
-            nonlocal resp_count, saved, categories
-            try:
-                url = response.url
-                ct = response.headers.get("content-type", "")
-                text = await response.text()
-                # 원문 저장 조건: url에 category/cat 포함 또는 code/name 패턴 존재
-                hit = False
-                if ("category" in url.lower()) or ("cat" in url.lower()):
-                    hit = True
-                if PATTERN1.search(text) or PATTERN2.search(text):
-                    hit = True
-                if hit:
-                    saved += 1
-                    save_text(resp_count, "raw", text)
-                if "javascript" in ct or "json" in ct or "html" in ct:
-                    resp_count += 1
-                    for m in PATTERN1.finditer(text):
-                        categories.append((m.group(1), m.group(2)))
-                    for m in PATTERN2.finditer(text):
-                        categories.append((m.group(1), m.group(2)))
-            except Exception:
+    async def handle_response(response):
+        try:
+            url = response.url
+            ct = response.headers.get("content-type", "")
+            # 이미지/폰트 등은 본문을 읽지 않음
+            if not any(t in ct for t in SCAN_CONTENT_TYPES):
+                stats["skipped_type"] += 1
                 return
+            if int(response.headers.get("content-length") or 0) > MAX_BODY_BYTES:
+                stats["skipped_size"] += 1
+                return
+            body = await response.body()
+            # content-length 가 없는(chunked) 응답은 읽은 뒤에 판정
+            if len(body) > MAX_BODY_BYTES:
+                stats["skipped_size"] += 1
+                return
+            found = [groups for _, groups in SCANNER.scan_text(body)]
+            # 원문 저장 조건: url에 category/cat 포함 또는 code/name 패턴 존재
+            hit = False
+            if ("category" in url.lower()) or ("cat" in url.lower()):
+                hit = True
+            if found:
+                hit = True
+                activity["last_hit"] = asyncio.get_running_loop().time()
+            if hit:
+                stats["saved"] += 1
+                # 압축/파일 쓰기는 이벤트 루프 밖에서 (다른 응답 핸들러를 막지 않도록)
+                await asyncio.to_thread(store.put, body, url=url, label="raw")
+            stats["responses"] += 1
+            categories.extend(found)
+        except Exception:
+            return
 
-        page.on("response", handle_response)
-        for u in targets:
-            await page.goto(u, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(12000)
+    page.on("response", handle_response)
+    try:
+        while True:
+            try:
+                u = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                await page.goto(u, wait_until="domcontentloaded", timeout=60000)
+                if fast:
+                    reason = await wait_for_settle(page, activity)
+                    print(f"[INFO] [ctx{wid}] {u} settled ({reason})")
+                else:
+                    await page.wait_for_timeout(PAGE_MAX_WAIT_MS)
+            except Exception as e:
+                print(f"[WARN] [ctx{wid}] {u} failed: {e}")
+                continue
             # 전역 상태 덤프
             try:
                 apollo = await page.evaluate("() => window.__APOLLO_STATE__")
                 if apollo:
-                    save_text(int(time.time()*1000), "apollo", json.dumps(apollo, ensure_ascii=False))
+                    await asyncio.to_thread(store.put, json_codec.dumpb(apollo), url=u, label="apollo")
             except Exception:
                 pass
             try:
                 place_state = await page.evaluate("() => window.__PLACE_STATE__")
                 if place_state:
-                    save_text(int(time.time()*1000), "place", json.dumps(place_state, ensure_ascii=False))
+                    await asyncio.to_thread(store.put, json_codec.dumpb(place_state), url=u, label="place")
             except Exception:
                 pass
-        await browser.close()
+            code_map.update(dedup(categories))
+            categories.clear()
+    finally:
+        code_map.update(dedup(categories))
+        await context.close()
+
+
+async def scrape(targets=None, fast: bool = True, contexts: int = CONTEXTS, out_file=OUT_FILE, raw_dir=RAW_DIR):
+    """타겟 전체 처리 → (code_map, stats, 사용한 컨텍스트 수)"""
+    targets = targets or TARGETS
+    queue = asyncio.Queue()
+    for u in dict.fromkeys(targets):
+        queue.put_nowait(u)
+    code_map = {}
+    stats = {"responses": 0, "saved": 0, "skipped_type": 0, "skipped_size": 0}
+    store = ContentStore(raw_dir)
+    started = time.perf_counter()
+    async with async_playwright() as p:
+        # Chromium 한 개에 컨텍스트 N 개 → 쿠키/캐시는 분리되고 타겟은 병렬 처리
+        # browser_service 가 떠 있으면 그 브라우저에 붙어 기동 비용 없이 시작
+        browser, owned = await connect_async(p)
+        n = max(1, min(contexts, queue.qsize()))
+        await asyncio.gather(*(context_worker(browser, i, queue, code_map, stats, store, fast) for i in range(n)))
+        # 만든 컨텍스트는 context_worker 가 닫음. 브라우저는 직접 띄운 경우에만 종료
+        # (상주 서비스 브라우저는 다른 작업도 쓰므로 연결만 끊김 — async_playwright 종료 시)
+        if owned:
+            await browser.close()
+    store.save()
 
-    code_map = dedup(categories)
     data = {
         "timestamp": int(time.time()),
         "count": len(code_map),
@@ -97,10 +210,121 @@ async def scrape():
             {"code": k, "name": v} for k, v in sorted(code_map.items())
         ],
     }
-    Path(OUT_FILE).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"responses scanned: {resp_count}, raw_saved: {saved}")
-    print(f"saved {OUT_FILE}, codes={len(code_map)}")
+    json_codec.write(out_file, data)
+    print(f"responses scanned: {stats['responses']}, raw_saved: {stats['saved']}, "
+          f"skipped(type/size): {stats['skipped_type']}/{stats['skipped_size']}")
+    print(f"raw store: {store.summary()}")
+    print(f"saved {out_file}, codes={len(code_map)}, targets={len(targets)}, contexts={n}, "
+          f"browser={'local' if owned else 'service'}, elapsed {time.perf_counter() - started:.1f}s")
+    return code_map, stats, n
+
+
+# ---------- 자체 점검 (로컬 픽스처) ----------
+SELFTEST_PAGES = 8
+SELFTEST_SLOW_SEC = 0.5  # /slow 응답 지연 → 컨텍스트들이 겹쳐 도는지 동시 요청 수로 확인
+
+
+def _fixture_server():
+    """
+    list{i}.html 이 fetch 로 부르는 응답:
+      cat{i}.json  카테고리 패턴 (스캔/저장 대상)       pixel.png   image/png (content-type 으로 건너뜀)
+      big.js       content-length > MAX_BODY_BYTES   stream.js   길이 헤더 없이 MAX_BODY_BYTES + 1 바이트
+      slow{i}.json SELFTEST_SLOW_SEC 지연
+    """
+    big = b"/*" + b"x" * MAX_BODY_BYTES + b"*/"
+    state = {"in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: bytes, ctype: str, length: bool = True):
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            if length:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            name = self.path.lstrip("/").split("?")[0]
+            if name.startswith("list"):
+                i = name[4:].split(".")[0]
+                urls = [f"/cat{i}.json", "/pixel.png", "/big.js", "/stream.js", f"/slow{i}.json"]
+                script = "".join(f"fetch('{u}').then(r => r.arrayBuffer()).catch(() => 0);" for u in urls)
+                self._send(f"<html><body>list {i}<script>{script}</script></body></html>".encode(), "text/html")
+            elif name.startswith("cat"):
+                i = name[3:].split(".")[0]
+                body = json_codec.dumpb({"items": [{"code": f"SELFTEST{i}", "name": f"카테고리{i}"}]})
+                self._send(body, "application/json")
+            elif name == "pixel.png":
+                self._send(b"\x89PNG" + b"0" * 64, "image/png")
+            elif name == "big.js":
+                self._send(big, "application/javascript")
+            elif name == "stream.js":
+                self._send(big, "application/javascript", length=False)  # HTTP/1.0: 연결 종료로 끝 표시
+            elif name.startswith("slow"):
+                with lock:
+                    state["in_flight"] += 1
+                    state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                time.sleep(SELFTEST_SLOW_SEC)
+                with lock:
+                    state["in_flight"] -= 1
+                self._send(b"{}", "application/json")
+            else:
+                self.send_error(404)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def selftest(contexts: int = CONTEXTS) -> bool:
+    server, state = _fixture_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    targets = [f"{base}/list{i}.html" for i in range(SELFTEST_PAGES)]
+    try:
+        with tempfile.TemporaryDirectory(prefix="category_selftest_") as tmp:
+            code_map, stats, n = asyncio.run(scrape(targets, True, contexts, out_file=str(Path(tmp) / OUT_FILE),
+                                                    raw_dir=Path(tmp) / "raw"))
+    finally:
+        server.shutdown()
+    want = {f"SELFTEST{i}": f"카테고리{i}" for i in range(SELFTEST_PAGES)}
+    checks = [
+        ("categories from every page", all(code_map.get(k) == v for k, v in want.items())),
+        ("image skipped by content-type", stats["skipped_type"] >= SELFTEST_PAGES),
+        ("oversized bodies skipped (header + no length)", stats["skipped_size"] == 2 * SELFTEST_PAGES),
+        ("category responses saved", stats["saved"] >= SELFTEST_PAGES),
+        (f"contexts overlap ({state['max_in_flight']} in flight, {n} context(s))",
+         n == 1 or state["max_in_flight"] > 1),
+    ]
+    for label, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {label}")
+    return all(ok for _, ok in checks)
+
+
+def parse_args(args):
+    targets = []
+    opts = {"fast": True, "contexts": CONTEXTS}
+    for a in args:
+        if a == "--legacy":
+            opts["fast"] = False
+        elif a == "--selftest":
+            opts["selftest"] = True
+        elif a.startswith("--contexts="):
+            opts["contexts"] = int(a.split("=", 1)[1])
+        elif a.startswith("--targets-file="):
+            path = Path(a.split("=", 1)[1])
+            targets.extend(line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip())
+        elif not a.startswith("--"):
+            targets.append(a)
+    return targets, opts
 
 
 if __name__ == "__main__":
-    asyncio.run(scrape())
+    targets, opts = parse_args(sys.argv[1:])
+    if opts.pop("selftest", False):
+        sys.exit(0 if selftest(opts["contexts"]) else 1)
+    asyncio.run(scrape(targets, **opts))
@@ -4,13 +4,25 @@ Naver Map category code scraper (from public JS bundles).
 - Fetches referenced JS bundles
 - Extracts occurrences of "code":"<CODE>", "name":"<NAME>"
 - Saves to category_master.json
+- Bundles go through a conditional-GET cache (bundle_cache.py): unchanged bundles
+  answer 304 and their code/name pairs come from the per-hash extraction cache
+- Crawl runs FETCH_WORKERS fetch threads against a deduplicating frontier while
+  regex scanning of bundle bodies runs in a SCAN_WORKERS process pool
+- Each bundle is scanned once, chunk by chunk, for all patterns (stream_scanner.py)
 """
 import re
-import json
+import gzip
 import time
 import os
+import threading
 import requests
-from urllib.parse import urljoin
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin
+
+import json_codec
+from bundle_cache import BundleCache, pattern_signature
+from stream_scanner import ScanPattern, StreamScanner
 
 BASE_URL = "https://map.naver.com/v5/"
 HEADERS = {
@@ -19,6 +31,29 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 OUT_FILE = "category_master.json"
+CODE_PATTERN = re.compile(r'"code":"([A-Z0-9]+)"[^}]{0,120}?"name":"([^"]+)"')
+ABS_JS_PATTERN = re.compile(r'https?://[^"\'\s]+?\.js\b')
+REL_JS_PATTERN = re.compile(r'(?<=["\'])/[A-Za-z0-9_./-]+\.js\b')
+
+BUNDLE_SCANNER = StreamScanner([
+    ScanPattern("code", CODE_PATTERN, '"code":"', 512),
+    ScanPattern("abs_js", ABS_JS_PATTERN, "http", 2048),
+    ScanPattern("rel_js", REL_JS_PATTERN, ".js", 1024, anchored=False),
+])
+
+MAX_BUNDLES = 180      # safety limit
+MAX_CODES = 800
+FETCH_WORKERS = 6
+SCAN_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+_local = threading.local()
+
+
+def thread_session():
+    # requests.Session 은 스레드 간 공유가 보장되지 않으므로 fetch 스레드마다 하나씩
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
 
 
 def fetch(url, session):
@@ -29,11 +64,49 @@ def fetch(url, session):
 
 def extract_js_urls(text: str):
     urls = set()
-    urls.update(re.findall(r'https?://[^"\\s]+\\.js', text))
-    urls.update(re.findall(r'/[A-Za-z0-9_./-]+\\.js', text))
+    urls.update(ABS_JS_PATTERN.findall(text))
+    urls.update(REL_JS_PATTERN.findall(text))
     return urls
 
 
+def scan_bundle(body_path: str):
+    """프로세스 풀에서 실행: 캐시된 번들 본문을 청크 단위로 한 번 훑어 code/name 쌍과 하위 JS 경로 추출"""
+    codes = {}
+    urls = set()
+    for name, groups in BUNDLE_SCANNER.scan_file(body_path, binary_open=gzip.open):
+        if name == "code":
+            codes[groups[0]] = groups[1]
+        else:
+            urls.add(groups[0])
+    return codes, sorted(urls)
+
+
+class Frontier:
+    """방문 예정/완료 URL 을 한 번만 큐에 넣는 중복 제거 프론티어"""
+
+    def __init__(self):
+        self.queue = deque()
+        self.seen = set()
+
+    def add(self, url: str) -> bool:
+        url = urldefrag(url)[0]
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self.queue.append(url)
+        return True
+
+    def pop(self) -> str:
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+
+def fetch_bundle(cache: BundleCache, url: str):
+    return cache.fetch(thread_session(), url, HEADERS)
+
+
 def main():
     sess = requests.Session()
     html = fetch(BASE_URL, sess)
@@ -47,30 +120,60 @@ def main():
     print(f"[INFO] seed js urls: {len(js_urls)}")
 
     code_map = {}
-    pattern = re.compile(r'"code":"([A-Z0-9]+)"[^}]{0,120}?"name":"([^"]+)"')
-    visited = set()
-    queue = list(js_urls)
-    i = 0
-    while queue and i < 180:  # safety limit
-        js_url = queue.pop()
-        if js_url in visited:
-            continue
-        visited.add(js_url)
-        i += 1
-        try:
-            txt = fetch(js_url, sess)
-        except Exception as e:
-            print(f"[WARN] fetch fail {js_url}: {e}")
-            continue
-        for m in pattern.finditer(txt):
-            code, name = m.group(1), m.group(2)
-            code_map[code] = name
-        # JS 내부의 또다른 JS 경로를 큐에 추가
-        for u in extract_js_urls(txt):
-            queue.append(u if u.startswith("http") else urljoin(js_url, u))
-        print(f"[INFO] parsed {i}, codes {len(code_map)}, queue {len(queue)}")
-        if len(code_map) > 800:
-            break
+    cache = BundleCache()
+    signature = pattern_signature([CODE_PATTERN, ABS_JS_PATTERN, REL_JS_PATTERN])
+    frontier = Frontier()
+    for u in sorted(js_urls):
+        frontier.add(u)
+
+    def absorb(base_url, found):
+        code_map.update(found["codes"])
+        # JS 내부의 또다른 JS 경로를 프론티어에 추가 (이미 본 URL 은 무시)
+        for u in found["js_urls"]:
+            frontier.add(u if u.startswith("http") else urljoin(base_url, u))
+
+    dispatched = 0
+    done = 0
+    fetching = {}   # future -> url
+    scanning = {}   # future -> (url, sha)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=SCAN_WORKERS) as scan_pool:
+        while True:
+            stop = len(code_map) > MAX_CODES
+            while not stop and frontier and dispatched < MAX_BUNDLES and len(fetching) < FETCH_WORKERS:
+                url = frontier.pop()
+                fetching[fetch_pool.submit(fetch_bundle, cache, url)] = url
+                dispatched += 1
+            if not fetching and not scanning:
+                break
+            finished, _ = wait(list(fetching) + list(scanning), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                if fut in fetching:
+                    url = fetching.pop(fut)
+                    try:
+                        sha = fut.result()
+                    except Exception as e:
+                        print(f"[WARN] fetch fail {url}: {e}")
+                        continue
+                    found = cache.get_extracted(sha, signature)
+                    if found is None:
+                        scanning[scan_pool.submit(scan_bundle, str(cache.body_path(sha)))] = (url, sha)
+                        continue
+                else:
+                    url, sha = scanning.pop(fut)
+                    try:
+                        codes, urls = fut.result()
+                    except Exception as e:
+                        print(f"[WARN] scan fail {url}: {e}")
+                        continue
+                    cache.put_extracted(sha, signature, codes, urls)
+                    found = {"codes": codes, "js_urls": urls}
+                absorb(url, found)
+                done += 1
+                print(f"[INFO] parsed {done}, codes {len(code_map)}, queue {len(frontier)}, "
+                      f"in-flight {len(fetching)}/{len(scanning)}")
+    cache.save()
+    print(f"[INFO] bundle cache: {cache.summary()}")
 
     ts = int(time.time())
     data = {
@@ -80,8 +183,7 @@ def main():
             {"code": c, "name": n} for c, n in sorted(code_map.items())
         ],
     }
-    with open(OUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    json_codec.write(OUT_FILE, data)
     print(f"[INFO] saved {OUT_FILE} (codes={len(code_map)})")
 
 
@@ -4,14 +4,18 @@
 - 사용자 제공 쿠키/헤더 사용
 - BFS로 검색 키워드 확장, 최대 요청 캡을 걸어 타임아웃 방지
 - 결과: category_token_result.json, category_token_result.tsv
+- GUI 작업 관리자의 중단 요청(job_control) 시 수집을 멈추고 지금까지의 코드로 결과 저장
 """
 import requests
 import time
-import json
 import sys
 from collections import deque
 from pathlib import Path
 
+import job_control
+import json_codec
+from category_index import CategoryIndex, INDEX_FILE
+
 # Windows 기본 콘솔(cp949)에서 한글/기호가 깨지지 않도록 UTF-8로 재설정
 try:
     sys.stdout.reconfigure(encoding="utf-8")
@@ -20,7 +24,7 @@ except Exception:
     pass
 
 TARGET_URL = "https://new.smartplace.naver.com/graphql?opName=categories"
-CONFIG_FILE = Path(__file__).parent / "runtime_config.json"
+CONFIG_FILE = job_control.config_path(Path(__file__).parent / "runtime_config.json")
 
 USER_COOKIE = 'NNB=IV7SUWHXYQMGS; NAC=j7YxB0Qz1Psh; CBI_SES=p2kWg5X/a9nh8HxKd72mM6smJ99B5Vr61B702eAg4/nHftVSzXoKWUHZf+0OeOVhQ/CGd+++z/RsHkjGpTrLb8Ha4JoNhhabYLeLT2fv9Mb2sIzpT+jzIVhW467q3gWlHix7PD9nQ2AbbhJB0qF3X0Mzjh69V+4ipBw8Ep65wbF9oK9u3az42EsxgvRIqgzpyoYLxlkI6zDuPiSzUjfVHJyMP1SPvxwgwrZrvo5TJIm0PvYSkXKr2ewdW38OVH/dq5iYWIrBkwMShnHAEdRsThUDb7NORNPiQPOZlc8A8BgPBvZIw4Qoc1VsQeYStsIgvdFUNiAcNcPb2OH/5A09zmIL1xk7y2q7gTUNKHyxGEVIqmeD4w6VC14U2BZqfMz8MIxuH/5rRSBzRqL6HnD4wCDgCgZwQF4FcwnCf0tRHPo7OHxU9Tc5iiGVaMCJXZz7; CBI_CHK=\"r5V0mf9uRUZHZ/vmLGy3ez7f4/k4aqWXL5o03eN68fqFnx+6x21/uaZrHTUzbK/8UwnCK4T6evQ2PqeyHeFkuRh+DcutoYMMSILq53HD0Wq/Vy+ZLA1t+Oa/u+/bWIXGma0BL6V574SaB89iBqFk+EvMrgeKHGeeu4U/Q6Wqu2M=\"; ASID=afd14a610000019a90c872d200000024; nid_inf=1392559216; NID_AUT=vbGUPY2IdILTiVDDStCvb5z7DluTt/BXkeSyP9es9eZ1oc+/vaQHRkA1jF1X6nCJ; NACT=1; MM_PF=SEARCH; SRT30=1763620459; SRT5=1763620459; _naver_usersession_=UWsRK47vux8+p8irQnhLXg==; page_uid=jeI3Csqo1SCss7ZRPqNssssss8d-033344; csrf_token=cc652a3eb45ae8597cb9c249e83d73c83a97c36771b4066a34d1c14016fc87f868fe799659ba7748d314572f970a191f71817eb6123aeffc244a4c93be2eb8cd; JSESSIONID=BD02B1D257096A8946FCE8D18C1B4435; NID_SES=AAABqwCZXajhacbO/u+WIVeEwUZhlRKmcxvwgxZVQ+ROQcYNLL1w0AGnvLbQT7nDB5I6P9zAlkVHXejG/15G0o88VqPPcYLeNUl+QVQUdzGmngskR3Jf4qGXB+RbUNB5y6B4amE8BybXeHNhTUuxFOTDrA+qJutm+qeg1dpT9/yO9p84vTTPZ6+DYO7fExW1lkrKQvJ4I+buLT+X2Ig34ReqeetrIl7XWGTUjJtIKggG1P1gt/VJgxflPge8Poh009sCp6fyrlibJGk/lN1601dbJ8R6ycosdIXpQ8cC5BcQC8l2vCzyTxMQ30B1MjkR/Fzw+x8IHrcyTkn+he5qiJ69/I1XKaBrTWAHXOJDQzuOKgx+kDaIEVzs2/aPowipf9YQmNGpt7H2JDg6V00liQIxFvMqiivk1Qa0/bZR6NCMIRaA7/Ee4393iyQuJBqL61LqbzPfIwrR1hYojEfPYX5viAvqr+/W7btJtKxMzu2ZeFJVVyQS0bKWleLuhRqMB/spgWWBQWsSG38+TXYKgBugtrvGxCI8XjCN2uKVryScFqEyeMc0ovoEGmCE9oM9ZpApkQ==; BUC=mVbxHis3qmFcmuQF7hOXUonvXqjUtmnAjvVxTNoSXpo='
 
@@ -35,7 +39,7 @@ HEADERS = {
 
 # runtime_config.json 에 cookie 키가 있으면 덮어씀
 try:
-    cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8")) if CONFIG_FILE.exists() else {}
+    cfg = json_codec.read(CONFIG_FILE) if CONFIG_FILE.exists() else {}
     if cfg.get("cookie"):
         HEADERS["Cookie"] = cfg["cookie"]
 except Exception:
@@ -57,7 +61,7 @@ ensure_anon_cookie()
 
 # runtime_config.json 에 cookie 키가 있으면 덮어씀
 try:
-    cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8")) if CONFIG_FILE.exists() else {}
+    cfg = json_codec.read(CONFIG_FILE) if CONFIG_FILE.exists() else {}
     if cfg.get("cookie"):
         HEADERS["Cookie"] = cfg["cookie"]
 except Exception:
@@ -119,7 +123,7 @@ def main():
     collected_codes = {}
     if OUT_JSON.exists():
         try:
-            old = json.loads(OUT_JSON.read_text(encoding="utf-8"))
+            old = json_codec.read(OUT_JSON)
             for c in old.get("categories", []):
                 cid = c.get("id") or c.get("categoryId")
                 collected_codes[cid] = {"name": c.get("name") or c.get("categoryName"), "path": c.get("path") or c.get("lPath","")}
@@ -133,18 +137,24 @@ def main():
     print(f"[START] 네이버 플레이스 업종 코드 수집 시작 (초기 시드: {len(seed_keywords)}개)")
     print("-" * 60)
 
+    job_control.install_stop_handler()
     # leaf=False, True 두 번 패스
     for leaf_mode in (False, True):
+        if job_control.stop_requested():
+            break
         search_queue = deque(seed_keywords)
         visited_keywords = set(seed_keywords)
         while search_queue and req_count < MAX_REQUESTS:
+            if job_control.stop_requested():
+                print(f"[WARN] 중단 요청: 누적 {len(collected_codes)}개 코드로 결과를 저장합니다.")
+                break
             current_keyword = search_queue.popleft()
             print(f"[SEARCH:{'leaf' if leaf_mode else 'branch'}] {current_keyword} ... ", end="")
             items = fetch_categories(current_keyword, leaf=leaf_mode)
             req_count += 1
             if req_count % COOLDOWN_EVERY == 0:
                 print(f"[INFO] {req_count}회 요청, 쿨다운 {COOLDOWN_SEC}s")
-                time.sleep(COOLDOWN_SEC)
+                job_control.sleep(COOLDOWN_SEC)
 
             if not items:
                 print("결과 없음")
@@ -173,7 +183,7 @@ def main():
                     "count": len(collected_codes),
                     "categories": [{"id": cid, **info} for cid, info in sorted(collected_codes.items())],
                 }
-                OUT_JSON.write_text(json.dumps(tmp, ensure_ascii=False, indent=2), encoding="utf-8")
+                json_codec.write(OUT_JSON, tmp, atomic=True)
                 print(f"  -> partial saved ({len(collected_codes)} codes)")
             time.sleep(DELAY)
         # 다음 패스 전에 시드 확장: 수집된 path 토큰을 추가
@@ -185,11 +195,17 @@ def main():
         "count": len(collected_codes),
         "categories": [{"id": cid, **info} for cid, info in sorted(collected_codes.items())],
     }
-    OUT_JSON.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    json_codec.write(OUT_JSON, data, atomic=True)
     with OUT_TSV.open("w", encoding="utf-8") as f:
         f.write("categoryId\tcategoryName\tlPath\n")
         for cid, info in sorted(collected_codes.items()):
             f.write(f"{cid}\t{info['name']}\t{info['path']}\n")
+    # 소비자(GUI, 분류기)가 평면 목록을 다시 훑지 않도록 트리 인덱스도 갱신
+    try:
+        CategoryIndex.from_records(data["categories"]).save(INDEX_FILE)
+        print("INDEX ->", INDEX_FILE)
+    except Exception as e:
+        print(f"[WARN] category index 저장 실패: {e}")
     print("\n수집 완료 ->", OUT_JSON)
     print("TSV ->", OUT_TSV)
 
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+엔드포인트별 회로 차단기 (collect_master_data 의 검색 HTML / GraphQL 호출용)
+- closed:    정상. 연속 실패(예외, 429/403, 캡차 페이지)가 failure_threshold 에 닿으면 open
+- open:      요청을 보내지 않음. open_sec 가 지나면 half_open
+- half_open: 탐색 요청 한 번만 허용 → 성공하면 closed, 실패하면 다시 open (대기 시간 2배, 최대 max_open_sec)
+- retry_in(): 다음 요청을 보낼 수 있을 때까지 남은 초 → 호출 측이 그만큼 쉬거나 실행을 일찍 끝냄
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3, open_sec: float = 60.0, max_open_sec: float = 600.0,
+                 on_change: Optional[Callable[["CircuitBreaker", str], None]] = None):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_open_sec = open_sec
+        self.max_open_sec = max(open_sec, max_open_sec)
+        self.open_sec = open_sec
+        self.on_change = on_change
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_reason = ""
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _set(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        if self.on_change:
+            self.on_change(self, state)
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            if self.state == HALF_OPEN:
+                return self.open_sec if self._probing else 0.0
+            return max(0.0, self.opened_at + self.open_sec - time.monotonic())
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지. half_open 에서는 탐색 요청 한 번만 True."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self.opened_at + self.open_sec:
+                self._set(HALF_OPEN)
+                self._probing = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self.open_sec = self.base_open_sec
+            self._set(CLOSED)
+
+    def record_failure(self, reason: str = "") -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_reason = reason
+            if self.state == HALF_OPEN:
+                self.open_sec = min(self.max_open_sec, self.open_sec * 2)
+                self._trip()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self) -> None:
+        self.opened_at = time.monotonic()
+        self._probing = False
+        self.trips += 1
+        self._set(OPEN)
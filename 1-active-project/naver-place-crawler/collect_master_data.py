@@ -2,20 +2,38 @@
 """
 Naver Map 크롤러: 산업 마스터 및 키워드 템플릿 초기 SQL 생성.
 - UTF-8 파일 I/O 유지
-- 캡차 차단 시 더미 데이터로 대체해 SQL을 비워두지 않음
+- 검색/GraphQL 엔드포인트마다 회로 차단기(circuit_breaker): 연속 실패나 캡차 페이지면 요청을 멈추고 주기적으로 탐색,
+  차단이 길어지면 실행을 일찍 끝냄. 더미 데이터로 채운 레코드는 fallback 표시 후 fallback_records 로 분리 (SQL 제외)
+- GUI 작업 관리자가 중단을 요청하면(job_control) 수집을 멈추고 그때까지의 결과로 SQL/JSON 저장
+- 수집 중 레코드는 records.Place / KeywordCount (__slots__) 로 보관, 저장할 때만 dict 로 변환
+- 키워드 문자열은 keyword_dict.KeywordDictionary 로 정수 id 에 intern → SQL 은 keywords 차원 + keyword_counts 사실 테이블
+- 받은 원문 응답은 response_archive 에 보관 → 파서를 고친 뒤 `python response_archive.py reparse` 로 재수집 없이 재생성
+- 저장한 스냅샷은 keyword_timeseries 저장소에 변화분만 추가 (업체/키워드별 count 이력)
+- 설정 export_dialects 로 MySQL 외에 PostgreSQL(COPY) / SQLite(.db) 출력도 함께 생성 (exporter.py)
+- 요청마다 진행 이벤트(처리량/지연/중복/쿨다운)를 job_control.emit_progress 로 GUI 대시보드에 전달
 """
 import os
-import json
 import time
 import random
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import exporter
+import job_control
+import json_codec
+import keyword_timeseries
+from algorithm_classifier import default_classifier
+from circuit_breaker import CircuitBreaker
+from keyword_dict import KeywordDictionary
+from records import Place, places_to_dicts, refresh_keyword_ids
+from place_parsers import blocked_reason, parse_search_html, parse_visitor_keywords
+from response_archive import ResponseArchive
+
 SQL_FILE = "init_master_data.sql"
 DATA_DIR = "scrape_results"
 LAST_JSON = "last_result.json"
-CONFIG_FILE = Path(__file__).parent / "runtime_config.json"
+CONFIG_FILE = job_control.config_path(Path(__file__).parent / "runtime_config.json")
 
 SEED_KEYWORDS = [
     "\ud5ec\uc2a4\uc7a5", "\ud54c\ub77c\ud14c\uc2a4", "\uc694\uac00", "\ub9db\uc9d1", "\uce74\ud398", "\uc220\uc9d1",
@@ -38,12 +56,13 @@ BASE_HEADERS = {
 }
 
 SESSION = requests.Session()
+KEYWORDS = KeywordDictionary.load()
 
 
 def load_config():
     if CONFIG_FILE.exists():
         try:
-            return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+            return json_codec.read(CONFIG_FILE)
         except Exception:
             return {}
     return {}
@@ -59,6 +78,11 @@ DEBUG_MODE = bool(cfg.get("debug"))
 MAX_REQUESTS = int(cfg.get("max_requests", 300))  # 리뷰 키워드 요청 안전선
 BATCH_SIZE = int(cfg.get("batch_size", 40))       # 몇 건마다 쿨다운
 COOLDOWN_SEC = float(cfg.get("cooldown_sec", 30)) # 배치 후 쉬는 시간(sec)
+EXPORT_DIALECTS = list(cfg.get("export_dialects", []))  # 추가 출력: "postgres", "sqlite"
+BREAKER_FAILURES = int(cfg.get("breaker_failures", 3))            # 연속 실패 몇 번이면 차단
+BREAKER_OPEN_SEC = float(cfg.get("breaker_open_sec", 60))         # 차단 후 탐색 요청까지 대기(sec)
+BREAKER_MAX_PAUSE_SEC = float(cfg.get("breaker_max_pause_sec", 600))  # 차단 대기 총합 상한, 넘으면 조기 종료
+ARCHIVE = ResponseArchive() if cfg.get("archive_responses", True) else None  # 원문 보관 (reparse 용)
 
 
 def prepare_session():
@@ -86,29 +110,66 @@ FALLBACK_PLACES = [
     {"id": "sample_gym_01", "name": "\uc0d8\ud50c \ud5ec\uc2a4\uc7a5", "categoryCode": "G109", "category": ["\ud5ec\uc2a4\uc7a5"]},
 ]
 
-# 방문자 키워드가 없거나 호출 실패 시 채워줄 더미 키워드
+# 키워드 요청이 실패한 fallback 레코드에 채워줄 더미 키워드 (키워드 사전/SQL 에는 넣지 않음)
 FALLBACK_KEYWORDS = [
     {"keyword": "\uccad\uacb0\ud574\uc694", "count": 5},
     {"keyword": "\uce5c\uc808\ud574\uc694", "count": 7},
     {"keyword": "\uac00\uc131\ube44\uc88b\uc544\uc694", "count": 3},
 ]
+FALLBACK_IDS = {p["id"] for p in FALLBACK_PLACES}
+
+
+def on_breaker_change(breaker: CircuitBreaker, state: str) -> None:
+    if state == "open":
+        print(f"[WARN] circuit '{breaker.name}' open ({breaker.last_reason}), probing again in {breaker.open_sec:.0f}s")
+    elif state == "half_open":
+        print(f"[INFO] circuit '{breaker.name}' half-open, sending probe request")
+    else:
+        print(f"[INFO] circuit '{breaker.name}' closed")
+    job_control.emit_progress("breaker", endpoint=breaker.name, state=state)
 
 
-def safe_request_json(method: str, url: str, **kwargs) -> Any:
-    """HTTP 요청을 실행하고 JSON으로 파싱한다."""
+BREAKERS = {
+    name: CircuitBreaker(name, BREAKER_FAILURES, BREAKER_OPEN_SEC, on_change=on_breaker_change)
+    for name in ("search", "graphql")
+}
+
+
+def safe_request_json(method: str, url: str, breaker: Optional[CircuitBreaker] = None,
+                      archive: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+    """
+    HTTP 요청을 실행하고 JSON으로 파싱한다. breaker 가 열려 있으면 요청하지 않고 None.
+    archive: 원문 보관 메타 (kind 필수) — 응답 본문을 상태와 상관없이 ARCHIVE 에 저장
+    """
+    if breaker is not None and not breaker.allow():
+        return None
     try:
         resp = SESSION.request(method, url, timeout=10, **kwargs)
+        if ARCHIVE is not None and archive is not None:
+            ARCHIVE.record(body=resp.content, status=resp.status_code, url=url, **archive)
+        reason = blocked_reason(resp.status_code, resp.text, resp.url)
+        if reason:
+            raise RuntimeError(reason)
         resp.raise_for_status()
-        return resp.json()
+        data = resp.json()
     except Exception as e:
         print(f"[WARN] Request failed: {url} -> {e}")
+        if breaker is not None:
+            breaker.record_failure(str(e))
         return None
+    if breaker is not None:
+        breaker.record_success()
+    return data
 
 
 def fetch_top_places(keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
     """
-    캡차 없는 검색 HTML을 바로 파싱한다.
+    캡차 없는 검색 HTML을 바로 파싱한다. 검색 차단기가 열려 있으면 요청 없이 더미 플레이스.
     """
+    breaker = BREAKERS["search"]
+    if not breaker.allow():
+        print(f"[WARN] search circuit open, skipping request for {keyword}")
+        return FALLBACK_PLACES[:limit]
     # HTML 검색 파싱
     html_headers = {
         "User-Agent": HEADERS["User-Agent"],
@@ -120,51 +181,29 @@ def fetch_top_places(keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
     try:
         resp = requests.get(HTML_SEARCH_URL, params=params_html, headers=html_headers, timeout=10)
         resp.encoding = "utf-8"
-        if resp.status_code == 429:
-            raise RuntimeError(f"blocked status {resp.status_code}")
-        html = resp.text
-        import re, html as htmllib
-        names = re.findall(r'"name":"([^"]+)"', html)
-        cats = re.findall(r'"category":"([^"]+)"', html)
-        # mark 태그, HTML escape 제거
-        def clean(txt: str) -> str:
-            txt = htmllib.unescape(txt)
-            txt = txt.replace("\\u003C", "<").replace("\\u003E", ">")
-            txt = re.sub(r"<.*?>", "", txt)
-            return txt.strip()
-        names = [clean(n) for n in names]
-        cats = [clean(c) for c in cats]
-        pairs = []
-        for n, c in zip(names, cats + [""] * len(names)):
-            if n.strip() == "" or n.strip() == keyword:
-                continue
-            pairs.append((n, c))
-        cleaned = []
-        seen = set()
-        for n, c in pairs:
-            if n in seen:
-                continue
-            seen.add(n)
-            cleaned.append({
-                "id": f"html_{hash(n) & 0xffffffff}",
-                "name": n,
-                "categoryCode": "",
-                "category": [c] if c else [],
-            })
-            if len(cleaned) >= limit:
-                return cleaned
+        if ARCHIVE is not None:
+            ARCHIVE.record("search", resp.content, resp.status_code, HTML_SEARCH_URL,
+                           keyword=keyword, limit=limit, params=params_html)
+        reason = blocked_reason(resp.status_code, resp.text, resp.url)
+        if reason:
+            raise RuntimeError(reason)
+        resp.raise_for_status()
+        breaker.record_success()
+        # 파싱은 place_parsers (reparse 와 같은 코드)
+        cleaned = parse_search_html(resp.text, keyword, limit)
+        if cleaned:
+            return cleaned
     except Exception as e:
+        breaker.record_failure(str(e))
         print(f"[WARN] HTML search fallback failed for {keyword}: {e}")
 
     print("[WARN] Both API and HTML parsing failed, using fallback places.")
     return FALLBACK_PLACES[:limit]
 
 
-def derive_algorithm_type(category: List[str]) -> str:
-    cat_set = set(category or [])
-    if any(keyword in cat_set for keyword in ["음식점", "카페"]):
-        return "TYPE_B"
-    return "TYPE_A"
+def derive_algorithm_type(category: List[str], category_code: str = "") -> str:
+    """algorithm_rules.json + 업종 트리로 판정 (하위 카테고리는 조상 규칙 상속)"""
+    return default_classifier().classify(category, category_code)
 
 
 GRAPHQL_QUERY = """
@@ -182,87 +221,91 @@ query getVisitorReviewStats($input: VisitorReviewStatsInput!) {
 """
 
 
-def fetch_visitor_keywords(place_id: str) -> List[Dict[str, Any]]:
+def fetch_visitor_keywords(place_id: str, place_name: str = "", rank: int = -1) -> Optional[List[Dict[str, Any]]]:
+    """
+    방문자 키워드 목록. 요청이 실패했거나(차단/오류/차단기 열림) 응답을 해석하지 못하면 None,
+    정상 응답에 키워드가 없으면 빈 목록 (fallback 여부는 내용이 아니라 이 결과로 판단).
+    rank: 직전 검색 결과 목록에서 이 업체의 위치 (원문 보관용)
+    """
     payload = {
         "query": GRAPHQL_QUERY,
         "variables": {"input": {"businessId": place_id, "businessType": "place"}},
     }
-    data = safe_request_json("POST", GRAPHQL_URL, json=payload, headers=HEADERS)
-    if not data:
-        return FALLBACK_KEYWORDS.copy()
+    archive = None
+    if ARCHIVE is not None:
+        # 어느 검색 결과의 몇 번째 업체였는지 남겨 reparse 때 다시 연결
+        # (place_id 는 파싱한 이름의 crc32 라 파서가 바뀌면 달라질 수 있음 → search + rank 로도 연결)
+        archive = {"kind": "keywords", "place_id": place_id, "place_name": place_name,
+                   "search": ARCHIVE.last_search, "rank": rank, "variables": payload["variables"]}
+    data = safe_request_json("POST", GRAPHQL_URL, breaker=BREAKERS["graphql"], archive=archive,
+                             json=payload, headers=HEADERS)
+    if data is None:
+        return None
     try:
-        details = data.get("data", {}).get("getVisitorReviewStats", {}).get("votedKeyword", {}).get("details", [])
-        out = []
-        for d in details:
-            if not isinstance(d, dict):
-                continue
-            keyword = d.get("keyword") or d.get("name")
-            keyword_code = d.get("keywordCode") or d.get("code")
-            count = d.get("count") or d.get("value") or 0
-            if keyword:
-                try:
-                    cnt_int = int(count)
-                except Exception:
-                    cnt_int = 0
-                out.append(
-                    {
-                        "keyword": str(keyword),
-                        "keyword_code": str(keyword_code) if keyword_code else "",
-                        "count": cnt_int,
-                    }
-                )
-        if not out:
-            out = FALLBACK_KEYWORDS.copy()
-        return out
+        return parse_visitor_keywords(data)
     except Exception as e:
         print(f"[WARN] Failed parsing visitor keywords for {place_id}: {e}")
-        return FALLBACK_KEYWORDS.copy()
-
-
-def generate_sql(records: List[Dict[str, Any]], sql_path: str) -> None:
-    lines: List[str] = []
-    lines.append("CREATE TABLE IF NOT EXISTS industry_master (" \
-                 "business_id VARCHAR(64) PRIMARY KEY, " \
-                 "name VARCHAR(255), category_code VARCHAR(64), " \
-                 "category_path TEXT, algorithm_type VARCHAR(16));")
-    lines.append("CREATE TABLE IF NOT EXISTS keyword_templates (" \
-                 "id BIGINT AUTO_INCREMENT PRIMARY KEY, " \
-                 "business_id VARCHAR(64), keyword VARCHAR(255), keyword_code VARCHAR(64), " \
-                 "cnt INT DEFAULT 0, " \
-                 "FOREIGN KEY (business_id) REFERENCES industry_master(business_id));")
-
-    for rec in records:
-        biz = rec.get("id", "")
-        name = rec.get("name", "")
-        category_code = rec.get("categoryCode", "")
-        category_path = ",".join(rec.get("category", []))
-        algorithm_type = rec.get("algorithm_type", "")
-        lines.append(
-            "INSERT IGNORE INTO industry_master (business_id, name, category_code, category_path, algorithm_type) VALUES "
-            f"('{biz.replace("'", "''")}', '{name.replace("'", "''")}', '{category_code.replace("'", "''")}', "
-            f"'{category_path.replace("'", "''")}', '{algorithm_type}');")
-        for kw in rec.get("keywords", []):
-            keyword = kw.get("keyword", "")
-            cnt = kw.get("count", 0)
-            keyword_code = kw.get("keyword_code", "")
-            lines.append(
-                "INSERT IGNORE INTO keyword_templates (business_id, keyword, keyword_code, cnt) VALUES "
-                f"('{biz.replace("'", "''")}', '{keyword.replace("'", "''")}', "
-                f"'{keyword_code.replace("'", "''")}', {cnt});")
-
-    with open(sql_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
-    print(f"[INFO] SQL written -> {sql_path} (lines: {len(lines)})")
+        return None
+
+
+def generate_sql(records: List[Place], sql_path: str, snapshot_ts: int = 0) -> None:
+    """
+    industry_master + keywords(차원) + keyword_counts(사실: business_id, keyword_id, cnt, snapshot_ts).
+    기존 조회용으로 keyword_templates 는 두 테이블을 조인한 VIEW 로 제공.
+    MySQL 스크립트는 항상 sql_path 에, 설정의 export_dialects 에 있는 나머지(postgres/sqlite)는 out/export/ 에
+    같은 레코드 순회 한 번으로 함께 기록 (exporter.py).
+    """
+    targets = {"mysql": Path(sql_path)}
+    for dialect in EXPORT_DIALECTS:
+        if dialect in exporter.EXPORTERS and dialect not in targets:
+            targets[dialect] = exporter.EXPORT_DIR / exporter.DEFAULT_TARGETS[dialect]
+        elif dialect not in exporter.EXPORTERS:
+            print(f"[WARN] unknown export dialect ignored: {dialect}")
+    for backend in exporter.export(records, targets, KEYWORDS, snapshot_ts):
+        print(f"[INFO] SQL written -> {backend.summary()}")
+
+
+def wait_for_circuit(breaker: CircuitBreaker, paused: float) -> float:
+    """
+    차단기가 열려 있으면 탐색 시점까지 쉬고 누적 대기 시간을 반환.
+    누적 대기가 BREAKER_MAX_PAUSE_SEC 를 넘게 되면 쉬지 않고 -1 (실행 조기 종료).
+    """
+    wait = breaker.retry_in()
+    if wait <= 0:
+        return paused
+    if paused + wait > BREAKER_MAX_PAUSE_SEC:
+        print(f"[WARN] circuit '{breaker.name}' still open after {paused:.0f}s of pauses, ending run early.")
+        return -1
+    print(f"[INFO] circuit '{breaker.name}' open, pausing {wait:.0f}s before probing...")
+    job_control.emit_progress("throttle", state="breaker", seconds=wait, endpoint=breaker.name)
+    job_control.sleep(wait)
+    job_control.emit_progress("throttle", state="running")
+    return paused + wait
 
 
 def main():
-    all_records: List[Dict[str, Any]] = []
+    all_records: List[Place] = []
+    fallback_records: List[Place] = []
+    fallback_seen = set()
+    paused = 0.0
     request_count = 0
     batch_count = 0
     seen_biz = set()
+    stopped = False
+    duplicates = 0
+    job_control.install_stop_handler()
+    job_control.emit_progress("start", keywords=len(SEED_KEYWORDS), max_requests=MAX_REQUESTS, per_keyword=5)
 
     for idx, keyword in enumerate(SEED_KEYWORDS, start=1):
+        if stopped or job_control.stop_requested():
+            if job_control.stop_requested():
+                print(f"[WARN] 중단 요청: {idx - 1}/{len(SEED_KEYWORDS)} 키워드까지의 결과를 저장합니다.")
+            break
+        paused = wait_for_circuit(BREAKERS["search"], paused)
+        if paused < 0:
+            break
         print(f"[STEP] ({idx}/{len(SEED_KEYWORDS)}) Searching keyword: {keyword}")
+        job_control.emit_progress("keyword", index=idx, total=len(SEED_KEYWORDS), keyword=keyword)
         places = fetch_top_places(keyword)
         if not places:
             print(f"[WARN] No places found for '{keyword}', adding placeholder.")
@@ -274,47 +317,100 @@ def main():
             }
             places = [placeholder]
 
-        for place in places:
+        for rank, place in enumerate(places):
+            if job_control.stop_requested():
+                stopped = True
+                break
             cat_list = place.get("category", [])
-            algorithm_type = derive_algorithm_type(cat_list)
+            algorithm_type = derive_algorithm_type(cat_list, place.get("categoryCode", ""))
             place["algorithm_type"] = algorithm_type
-            time.sleep(random.uniform(0.6, 1.2))
-            keywords = fetch_visitor_keywords(place["id"])
-            place["keywords"] = keywords
             key = place.get("id") or place.get("name")
-            if key in seen_biz:
+            if key in FALLBACK_IDS or str(key).startswith("placeholder_"):
+                # 더미 플레이스는 키워드 요청 없이 분리 보관
+                place["fallback"] = "place"
+                place["keywords"] = FALLBACK_KEYWORDS
+                if key not in fallback_seen:
+                    fallback_seen.add(key)
+                    fallback_records.append(Place.from_dict(place))  # 더미 키워드는 사전에 넣지 않음
+                continue
+            paused = wait_for_circuit(BREAKERS["graphql"], paused)
+            if paused < 0:
+                stopped = True
+                break
+            time.sleep(random.uniform(0.6, 1.2))
+            t0 = time.perf_counter()
+            keywords = fetch_visitor_keywords(place["id"], place.get("name", ""), rank)
+            latency = time.perf_counter() - t0
+            failed = keywords is None
+            if failed:
+                place["keywords"] = FALLBACK_KEYWORDS
+                place["fallback"] = "keywords"
+                rec = Place.from_dict(place)  # 더미 키워드는 사전에 넣지 않음
+            else:
+                # 키워드 문자열은 KEYWORDS 사전의 객체를 공유하는 슬롯 레코드로 보관
+                place["keywords"] = keywords
+                rec = Place.from_dict(place, KEYWORDS)
+            if failed:
+                if key not in fallback_seen and key not in seen_biz:
+                    fallback_seen.add(key)
+                    fallback_records.append(rec)
+                print(f"  - Fallback keywords for {place.get('name')} ({key}), kept out of results")
+            elif key in seen_biz:
+                duplicates += 1
                 print(f"  - Skip duplicate {place.get('name')} ({key})")
             else:
                 seen_biz.add(key)
-                all_records.append(place)
+                all_records.append(rec)
                 print(f"  - Collected {place.get('name')} / algo={algorithm_type} / keywords={len(keywords)}")
             time.sleep(random.uniform(0.3, 0.7))
 
             # 요청/배치 카운터
             request_count += 1
             batch_count += 1
+            job_control.emit_progress(
+                "request", latency=round(latency, 3), requests=request_count, collected=len(all_records),
+                duplicates=duplicates, failed=failed, keyword_index=idx,
+            )
 
             if request_count >= MAX_REQUESTS:
                 print(f"[WARN] MAX_REQUESTS({MAX_REQUESTS}) 도달. 추가 수집을 중단합니다.")
                 break
             if batch_count >= BATCH_SIZE:
                 print(f"[INFO] 배치 {batch_count}건 처리, {COOLDOWN_SEC}s 쿨다운...")
-                time.sleep(COOLDOWN_SEC)
+                job_control.emit_progress("throttle", state="cooldown", seconds=COOLDOWN_SEC)
+                job_control.sleep(COOLDOWN_SEC)
+                job_control.emit_progress("throttle", state="running")
                 batch_count = 0
 
+    # 나중에 진짜 키워드를 받은 업체는 fallback 목록에서 제외
+    fallback_records = [r for r in fallback_records if r.key not in seen_biz]
+    if fallback_records:
+        print(f"[WARN] {len(fallback_records)} fallback record(s) kept apart from results (not in SQL)")
+    run_ts = int(time.time())
     sql_path = os.path.join(os.getcwd(), SQL_FILE)
-    generate_sql(all_records, sql_path)
+    if KEYWORDS.save():  # 새 키워드 id 확정 (다른 프로세스와 겹쳐 밀렸으면 레코드도 맞춤)
+        refresh_keyword_ids(all_records, KEYWORDS)
+    generate_sql(all_records, sql_path, snapshot_ts=run_ts)
 
     # JSON 저장 (개별 실행 결과 보관 및 최근 결과 덮어쓰기)
     os.makedirs(DATA_DIR, exist_ok=True)
-    run_ts = int(time.time())
     run_file = os.path.join(DATA_DIR, f"{run_ts}.json")
-    payload = {"timestamp": run_ts, "records": all_records}
-    with open(run_file, "w", encoding="utf-8") as jf:
-        json.dump(payload, jf, ensure_ascii=False, indent=2)
-    with open(LAST_JSON, "w", encoding="utf-8") as jf:
-        json.dump(payload, jf, ensure_ascii=False, indent=2)
+    payload = {"timestamp": run_ts, "records": places_to_dicts(all_records)}
+    if fallback_records:
+        payload["fallback_records"] = places_to_dicts(fallback_records)
+    data = json_codec.dumpb(payload, indent=True)  # 한 번 인코딩해서 두 파일에 같은 바이트
+    Path(run_file).write_bytes(data)
+    Path(LAST_JSON).write_bytes(data)
     print(f"[INFO] JSON saved -> {run_file}")
+    if ARCHIVE is not None:
+        ARCHIVE.finish(run_ts)
+        print(f"[INFO] raw responses archived -> {ARCHIVE.root} ({ARCHIVE.store.summary()})")
+    try:
+        written = keyword_timeseries.import_file(Path(run_file))
+        print(f"[INFO] timeseries updated -> {keyword_timeseries.DB_FILE.name} (delta rows: {written})")
+    except Exception as e:
+        print(f"[WARN] timeseries update failed: {e}")
+    job_control.emit_progress("end", requests=request_count, collected=len(all_records), duplicates=duplicates)
 
 
 if __name__ == "__main__":
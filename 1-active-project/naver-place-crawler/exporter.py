@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+수집 결과 → DB 적재용 파일 내보내기 (dialect 별 백엔드)
+- 공통: iter_rows() 가 레코드를 한 번만 훑으며 (테이블, 행) 을 흘려보냄 → 백엔드는 받는 대로 기록 (전체를 메모리에 모으지 않음)
+  테이블: industry_master, keywords(차원), keyword_counts(사실) + keyword_templates VIEW
+- 예전 스키마(keyword_templates 가 TABLE)로 만든 DB 는 스키마 앞부분에서 그 테이블을 keyword_templates_legacy 로
+  이름만 바꾼 뒤 VIEW 를 만듦 (기존 행은 legacy 테이블에 그대로 남음, 이미 VIEW 면 아무것도 안 함)
+- mysql:    스키마 + 다중 행 INSERT IGNORE (MYSQL_BATCH 행씩), 문자열은 MySQL 이스케이프 규칙으로 인용
+- postgres: 디렉터리에 schema.sql, 테이블별 COPY text 형식 .tsv, load.sql
+            (load.sql: 임시 staging 테이블로 \\copy 후 INSERT ... ON CONFLICT DO NOTHING)
+- sqlite:   바로 쓸 수 있는 .db 파일 (executemany, 한 트랜잭션)
+- summary() 의 행 수: mysql/postgres 는 파일에 쓴 행 수(중복 제거 후), sqlite 는 실제로 INSERT 된 행 수
+사용법:
+  python exporter.py                                   # last_result.json → 3가지 모두 out/export/
+  python exporter.py --dialect=postgres --out=out/pg scrape_results/1763668970.json
+"""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import json_codec
+from keyword_dict import KeywordDictionary
+from records import Place, as_place
+
+BASE_DIR = Path(__file__).parent.resolve()
+EXPORT_DIR = BASE_DIR / "out" / "export"
+MYSQL_BATCH = 500
+SQLITE_BATCH = 5000
+
+# (테이블, [(컬럼, 논리 타입)], 기본키, 유니크, [(컬럼, 참조 테이블, 참조 컬럼)])
+TABLES = [
+    ("industry_master",
+     [("business_id", "id"), ("name", "text"), ("category_code", "code"), ("category_path", "longtext"),
+      ("algorithm_type", "short")],
+     ("business_id",), (), []),
+    ("keywords",
+     [("keyword_id", "int"), ("keyword", "text"), ("keyword_code", "code")],
+     ("keyword_id",), ("keyword", "keyword_code"), []),
+    ("keyword_counts",
+     [("business_id", "id"), ("keyword_id", "int"), ("cnt", "int"), ("snapshot_ts", "bigint")],
+     ("business_id", "keyword_id", "snapshot_ts"), (),
+     [("business_id", "industry_master", "business_id"), ("keyword_id", "keywords", "keyword_id")]),
+]
+VIEW_SQL = ("SELECT c.business_id, k.keyword, k.keyword_code, c.cnt, c.snapshot_ts "
+            "FROM keyword_counts c JOIN keywords k ON k.keyword_id = c.keyword_id")
+LEGACY_TABLE = "keyword_templates_legacy"
+
+# keyword_templates 가 (예전 스키마의) 일반 테이블일 때만 이름 변경 — 조건부 DDL 은 dialect 마다 방식이 다름
+MIGRATION_SQL = {
+    "mysql": [
+        "SET @kt_is_table = (SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() "
+        "AND table_name = 'keyword_templates' AND table_type = 'BASE TABLE');",
+        f"SET @kt_sql = IF(@kt_is_table > 0, 'RENAME TABLE keyword_templates TO {LEGACY_TABLE}', 'DO 0');",
+        "PREPARE kt_stmt FROM @kt_sql;",
+        "EXECUTE kt_stmt;",
+        "DEALLOCATE PREPARE kt_stmt;",
+    ],
+    "postgres": [
+        "DO $$ BEGIN IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_schema = current_schema() "
+        "AND table_name = 'keyword_templates' AND table_type = 'BASE TABLE') THEN "
+        f"ALTER TABLE keyword_templates RENAME TO {LEGACY_TABLE}; END IF; END $$;",
+    ],
+    "sqlite": [],  # SQLiteExporter.begin() 에서 sqlite_master 를 보고 처리
+}
+
+TYPE_MAP = {
+    "mysql": {"id": "VARCHAR(64)", "text": "VARCHAR(255)", "code": "VARCHAR(64)", "longtext": "TEXT",
+              "short": "VARCHAR(16)", "int": "INT", "bigint": "BIGINT"},
+    "postgres": {"id": "VARCHAR(64)", "text": "TEXT", "code": "VARCHAR(64)", "longtext": "TEXT",
+                 "short": "VARCHAR(16)", "int": "INTEGER", "bigint": "BIGINT"},
+    "sqlite": {"id": "TEXT", "text": "TEXT", "code": "TEXT", "longtext": "TEXT",
+               "short": "TEXT", "int": "INTEGER", "bigint": "INTEGER"},
+}
+
+Row = Tuple[Any, ...]
+
+
+def iter_rows(records: Iterable[Union[Place, Dict[str, Any]]], keywords: KeywordDictionary,
+              snapshot_ts: int) -> Iterator[Tuple[str, Row]]:
+    """
+    레코드(Place 또는 스냅샷 dict) → (테이블, 행).
+    참조 무결성 순서 보장: 업체 행과 처음 보는 키워드 행이 그 사실 행보다 먼저 나옴.
+    id 는 스냅샷에 적힌 keyword_id 를 믿지 않고 항상 (keyword, keyword_code) 로 사전에서 다시 찾음
+    (다른 사전으로 만든 스냅샷이어도 keywords 행과 사실 행이 어긋나지 않도록).
+    같은 (업체, 키워드) 사실 행은 한 번만 나옴 → 백엔드 행 수 = 실제로 넣는 행 수.
+    """
+    seen_biz = set()
+    seen_kw = set()
+    seen_counts = set()
+    for rec in records:
+        place = as_place(rec)
+        biz = place.key
+        if biz not in seen_biz:
+            seen_biz.add(biz)
+            yield "industry_master", (biz, place.name, place.category_code, ",".join(place.category),
+                                      place.algorithm_type)
+        for kw in place.keywords:
+            kid = keywords.intern(kw.keyword, kw.keyword_code)
+            if kid not in seen_kw:
+                seen_kw.add(kid)
+                yield "keywords", (kid, kw.keyword, kw.keyword_code)
+            if (biz, kid) in seen_counts:
+                continue
+            seen_counts.add((biz, kid))
+            yield "keyword_counts", (biz, kid, kw.count, snapshot_ts)
+
+
+def create_table_sql(dialect: str, table: str, columns, pk, unique, fks) -> str:
+    types = TYPE_MAP[dialect]
+    parts = [f"{name} {types[kind]}" for name, kind in columns]
+    parts.append(f"PRIMARY KEY ({', '.join(pk)})")
+    if unique:
+        parts.append(f"UNIQUE ({', '.join(unique)})")
+    for col, ref_table, ref_col in fks:
+        parts.append(f"FOREIGN KEY ({col}) REFERENCES {ref_table}({ref_col})")
+    return f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(parts)});"
+
+
+def schema_sql(dialect: str) -> List[str]:
+    out = list(MIGRATION_SQL[dialect])
+    out += [create_table_sql(dialect, *spec) for spec in TABLES]
+    if dialect == "sqlite":
+        out.append(f"CREATE VIEW IF NOT EXISTS keyword_templates AS {VIEW_SQL};")
+    else:
+        out.append(f"CREATE OR REPLACE VIEW keyword_templates AS {VIEW_SQL};")
+    return out
+
+
+# ---------- 백엔드 ----------
+class Exporter:
+    dialect = ""
+
+    def __init__(self, target: Path):
+        self.target = Path(target)
+        self.counts: Dict[str, int] = {spec[0]: 0 for spec in TABLES}
+
+    def begin(self) -> None:
+        pass
+
+    def write(self, table: str, row: Row) -> None:
+        raise NotImplementedError
+
+    def end(self) -> None:
+        pass
+
+    def summary(self) -> str:
+        rows = ", ".join(f"{t}={n}" for t, n in self.counts.items())
+        return f"{self.dialect} -> {self.target} ({rows})"
+
+
+def mysql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    s = str(value)
+    s = (s.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n")
+         .replace("\r", "\\r").replace("\0", "\\0").replace("\x1a", "\\Z"))
+    return f"'{s}'"
+
+
+class MySQLExporter(Exporter):
+    dialect = "mysql"
+
+    def __init__(self, target: Path, batch: int = MYSQL_BATCH):
+        super().__init__(target)
+        self.batch = batch
+        self.buffers: Dict[str, List[str]] = {spec[0]: [] for spec in TABLES}
+        self.lines = 0
+
+    def begin(self) -> None:
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.f = open(self.target, "w", encoding="utf-8")
+        for stmt in schema_sql(self.dialect):
+            self._emit(stmt)
+
+    def _emit(self, stmt: str) -> None:
+        self.f.write(stmt + "\n")
+        self.lines += 1
+
+    def _flush(self, table: str) -> None:
+        buf = self.buffers[table]
+        if buf:
+            self._emit(f"INSERT IGNORE INTO {table} VALUES " + ",".join(buf) + ";")
+            buf.clear()
+
+    def write(self, table: str, row: Row) -> None:
+        self.counts[table] += 1
+        buf = self.buffers[table]
+        buf.append("(" + ",".join(mysql_literal(v) for v in row) + ")")
+        if len(buf) >= self.batch:
+            if table == "keyword_counts":
+                # 사실 행이 참조하는 업체/키워드 행이 먼저 들어가도록
+                self._flush("industry_master")
+                self._flush("keywords")
+            self._flush(table)
+
+    def end(self) -> None:
+        for spec in TABLES:
+            self._flush(spec[0])
+        self.f.close()
+
+
+def copy_escape(value: Any) -> str:
+    """PostgreSQL COPY text 형식: NULL = \\N, 역슬래시/탭/개행 이스케이프"""
+    if value is None:
+        return "\\N"
+    s = str(value)
+    return s.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class PostgresExporter(Exporter):
+    dialect = "postgres"
+
+    def begin(self) -> None:
+        self.target.mkdir(parents=True, exist_ok=True)
+        self.files = {spec[0]: open(self.target / f"{spec[0]}.tsv", "w", encoding="utf-8", newline="\n")
+                      for spec in TABLES}
+
+    def write(self, table: str, row: Row) -> None:
+        self.counts[table] += 1
+        self.files[table].write("\t".join(copy_escape(v) for v in row) + "\n")
+
+    def end(self) -> None:
+        for f in self.files.values():
+            f.close()
+        (self.target / "schema.sql").write_text("\n".join(schema_sql(self.dialect)) + "\n", encoding="utf-8")
+        # psql -f load.sql (tsv 와 같은 디렉터리에서 실행)
+        load = ["\\i schema.sql", "BEGIN;"]
+        for table, columns, pk, unique, _fks in TABLES:
+            cols = ", ".join(name for name, _ in columns)
+            conflict = "ON CONFLICT DO NOTHING"
+            load += [
+                f"CREATE TEMP TABLE staging_{table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;",
+                f"\\copy staging_{table} ({cols}) FROM '{table}.tsv' WITH (FORMAT text)",
+                f"INSERT INTO {table} ({cols}) SELECT {cols} FROM staging_{table} {conflict};",
+            ]
+        load.append("COMMIT;")
+        (self.target / "load.sql").write_text("\n".join(load) + "\n", encoding="utf-8")
+
+
+class SQLiteExporter(Exporter):
+    dialect = "sqlite"
+
+    def __init__(self, target: Path, batch: int = SQLITE_BATCH):
+        super().__init__(target)
+        self.batch = batch
+        self.buffers: Dict[str, List[Row]] = {spec[0]: [] for spec in TABLES}
+
+    def begin(self) -> None:
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.target))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        legacy = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'keyword_templates'")
+        if legacy.fetchone():
+            self.conn.execute(f"ALTER TABLE keyword_templates RENAME TO {LEGACY_TABLE}")
+        for stmt in schema_sql(self.dialect):
+            self.conn.execute(stmt)
+        self.conn.execute("BEGIN")
+
+    def _flush(self, table: str) -> None:
+        rows = self.buffers[table]
+        if rows:
+            marks = ",".join("?" * len(rows[0]))
+            before = self.conn.total_changes
+            self.conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES ({marks})", rows)
+            # 이미 DB 에 있어 무시된 행은 빼고 셈
+            self.counts[table] += self.conn.total_changes - before
+            rows.clear()
+
+    def write(self, table: str, row: Row) -> None:
+        buf = self.buffers[table]
+        buf.append(row)
+        if len(buf) >= self.batch:
+            self._flush(table)
+
+    def end(self) -> None:
+        for spec in TABLES:
+            self._flush(spec[0])
+        self.conn.commit()
+        self.conn.close()
+
+
+EXPORTERS = {"mysql": MySQLExporter, "postgres": PostgresExporter, "sqlite": SQLiteExporter}
+DEFAULT_TARGETS = {"mysql": "init_master_data.sql", "postgres": "postgres", "sqlite": "master_data.db"}
+
+
+def export(records: Iterable[Union[Place, Dict[str, Any]]], targets: Dict[str, Path], keywords: KeywordDictionary,
+           snapshot_ts: Optional[int] = None) -> List[Exporter]:
+    """
+    targets: dialect → 출력 경로. 레코드는 한 번만 순회하고 모든 백엔드에 같은 행을 흘려보냄.
+    """
+    snapshot_ts = snapshot_ts or int(time.time())
+    backends = [EXPORTERS[d](Path(path)) for d, path in targets.items()]
+    for b in backends:
+        b.begin()
+    try:
+        for table, row in iter_rows(records, keywords, snapshot_ts):
+            for b in backends:
+                b.write(table, row)
+    finally:
+        for b in backends:
+            b.end()
+    return backends
+
+
+def main():
+    dialects = list(EXPORTERS)
+    out_dir = EXPORT_DIR
+    sources = []
+    for a in sys.argv[1:]:
+        if a.startswith("--dialect="):
+            dialects = [d for d in a.split("=", 1)[1].split(",") if d != "all"] or list(EXPORTERS)
+        elif a.startswith("--out="):
+            out_dir = Path(a.split("=", 1)[1])
+        else:
+            sources.append(Path(a))
+    unknown = [d for d in dialects if d not in EXPORTERS]
+    if unknown:
+        print(f"[ERROR] unknown dialect: {', '.join(unknown)} (choose from {', '.join(EXPORTERS)})")
+        sys.exit(1)
+    keywords = KeywordDictionary.load()
+    for src in sources or [BASE_DIR / "last_result.json"]:
+        ts, records, _fallback = json_codec.read_snapshot(src)
+        for place in records:
+            for kw in place.keywords:
+                keywords.intern(kw.keyword, kw.keyword_code)
+        keywords.save()  # 새 키워드 id 를 파일에 확정한 뒤 내보냄
+        t0 = time.perf_counter()
+        targets = {d: out_dir / DEFAULT_TARGETS[d] for d in dialects}
+        for b in export(records, targets, keywords, ts):
+            print(f"[INFO] {b.summary()}")
+        print(f"[INFO] {src.name} exported in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 간 파일 잠금 (여러 작업이 같은 산출물을 동시에 고치는 곳용)
+- <대상>.lock 파일에 배타 잠금: POSIX 는 fcntl.flock, Windows 는 msvcrt.locking
+- 재진입 불가, 같은 프로세스 안의 스레드끼리는 각자 threading.Lock 을 먼저 잡을 것
+- 잠금은 프로세스가 죽으면 OS 가 풀어 줌 (lock 파일이 남아 있어도 상관없음)
+사용법:
+  with FileLock(path.with_name(path.name + ".lock")):
+      ... 다시 읽고 합친 뒤 저장 ...
+"""
+import os
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+POLL_SEC = 0.05
+
+
+class FileLock:
+    def __init__(self, path: Path, timeout: float = 60.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fd = None
+
+    def _try_lock(self, fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._try_lock(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"lock busy for {self.timeout:.0f}s: {self.path}")
+                time.sleep(POLL_SEC)
+        self._fd = fd
+        return self
+
+    def __exit__(self, *exc) -> None:
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
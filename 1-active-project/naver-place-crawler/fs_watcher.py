@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+결과 파일 변경 감시 (gui.py 자동 새로고침용)
+- Linux: inotify(ctypes, 추가 패키지 없음)로 디렉터리 감시 → 쓰기가 끝난(IN_CLOSE_WRITE) / 이동돼 들어온 / 삭제된 파일만 알림
+- 그 외 OS 나 inotify 를 쓸 수 없으면 POLL_SEC 마다 (mtime, 크기) 비교로 대체
+  (쓰는 중인 파일을 잡지 않도록 두 번 연속 같은 값일 때만 알림)
+- 알림은 callback(kind, path), kind = "created" | "modified" | "deleted", 감시 스레드에서 호출됨
+사용법:
+  python fs_watcher.py [dir_or_file ...]     # 변경 내용을 출력 (기본: scrape_results, last_result.json)
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+POLL_SEC = 2.0
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_CREATE | IN_MODIFY
+EVENT_HEADER = struct.Struct("iIII")
+
+Callback = Callable[[str, Path], None]
+
+
+class FileWatcher:
+    """
+    targets: 디렉터리(안의 파일 전체) 또는 개별 파일. 개별 파일은 그 부모 디렉터리를 감시하고 이름으로 거름.
+    suffixes: 디렉터리 감시 시 알림을 받을 확장자 (예: {".json"})
+    """
+
+    def __init__(self, targets: Iterable[Path], callback: Callback, suffixes: Optional[Set[str]] = None,
+                 poll_sec: float = POLL_SEC):
+        self.callback = callback
+        self.suffixes = suffixes
+        self.poll_sec = poll_sec
+        self.dirs: Set[Path] = set()
+        self.files: Set[Path] = set()
+        for t in targets:
+            t = Path(t).resolve()
+            if t.is_dir() or not t.suffix:
+                self.dirs.add(t)
+            else:
+                self.files.add(t)
+        self.backend = ""
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wants(self, path: Path) -> bool:
+        if path in self.files:
+            return True
+        return path.parent in self.dirs and (self.suffixes is None or path.suffix in self.suffixes)
+
+    def start(self) -> "FileWatcher":
+        fd = self._inotify_init()
+        if fd is not None:
+            self.backend = "inotify"
+            target = lambda: self._run_inotify(fd)
+        else:
+            self.backend = "poll"
+            target = self._run_poll
+        self._thread = threading.Thread(target=target, name="fs-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- inotify ----------
+    def _watch_dirs(self) -> Set[Path]:
+        return self.dirs | {f.parent for f in self.files}
+
+    def _inotify_init(self) -> Optional[int]:
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            self._wd: Dict[int, Path] = {}
+            for d in self._watch_dirs():
+                d.mkdir(parents=True, exist_ok=True)
+                wd = libc.inotify_add_watch(fd, str(d).encode(), WATCH_MASK)
+                if wd < 0:
+                    os.close(fd)
+                    return None
+                self._wd[wd] = d
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _run_inotify(self, fd: int) -> None:
+        # IN_MODIFY 는 쓰는 도중에도 여러 번 오므로 기록만 해 두고 IN_CLOSE_WRITE 에서 알림
+        created: Set[Path] = set()
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 1.0)
+                if not ready:
+                    continue
+                try:
+                    buf = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                pos = 0
+                while pos + EVENT_HEADER.size <= len(buf):
+                    wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buf, pos)
+                    pos += EVENT_HEADER.size
+                    name = buf[pos:pos + length].rstrip(b"\0").decode("utf-8", errors="replace")
+                    pos += length
+                    base = self._wd.get(wd)
+                    if base is None or not name:
+                        continue
+                    path = base / name
+                    if not self.wants(path):
+                        continue
+                    if mask & IN_CREATE:
+                        created.add(path)
+                    elif mask & IN_CLOSE_WRITE:
+                        if path in created:
+                            created.discard(path)
+                            self._emit("created", path)
+                        else:
+                            self._emit("modified", path)
+                    elif mask & IN_MOVED_TO:
+                        self._emit("created", path)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        created.discard(path)
+                        self._emit("deleted", path)
+        finally:
+            os.close(fd)
+
+    # ---------- polling ----------
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snap = {}
+        for d in self.dirs:
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        path = Path(entry.path)
+                        if entry.is_file() and self.wants(path):
+                            st = entry.stat()
+                            snap[path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        for f in self.files:
+            try:
+                st = f.stat()
+                snap[f] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return snap
+
+    def _run_poll(self) -> None:
+        known = self._snapshot()
+        pending: Dict[Path, Tuple[int, int]] = {}  # 바뀐 뒤 아직 안정되지 않은 파일
+        while not self._stop.wait(self.poll_sec):
+            snap = self._snapshot()
+            for path in [p for p in known if p not in snap]:
+                known.pop(path)
+                pending.pop(path, None)
+                self._emit("deleted", path)
+            for path, sig in snap.items():
+                if known.get(path) == sig:
+                    pending.pop(path, None)
+                    continue
+                if pending.get(path) != sig:
+                    pending[path] = sig  # 다음 주기에도 같으면 쓰기가 끝난 것으로 봄
+                    continue
+                kind = "modified" if path in known else "created"
+                known[path] = sig
+                pending.pop(path)
+                self._emit(kind, path)
+
+    def _emit(self, kind: str, path: Path) -> None:
+        try:
+            self.callback(kind, path)
+        except Exception as e:
+            print(f"[WARN] watcher callback failed for {path}: {e}")
+
+
+def main():
+    base = Path(__file__).parent.resolve()
+    targets = [Path(a) for a in sys.argv[1:]] or [base / "scrape_results", base / "last_result.json"]
+    watcher = FileWatcher(targets, lambda kind, path: print(f"[WATCH] {kind} {path}", flush=True)).start()
+    print(f"[INFO] watching {', '.join(str(t) for t in targets)} ({watcher.backend})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,34 @@ Naver Place Crawler GUI
 - collect_master_data.py 실행/로그 확인
 - SQL 미리보기, 스크래핑 히스토리(JSON) 조회, 누적 키워드, 카테고리 보기
 - GUI에서 seed 키워드, 로그인 Cookie, 디버그 옵션을 설정해 실행 가능
+- 누적 키워드는 keyword_index.KeywordMapIndex 로 증분 집계 (새 스냅샷만 파싱, last_result 중복 합산 제거)
+- 키워드맵 창은 keyword_db.py 의 SQLite 미러를 검색(FTS)/묶음/페이지 단위로 조회
+- 히스토리/최근 결과/SQL 미리보기는 paged_viewer.py 로 보이는 줄만 그림 (줄 오프셋 색인, JSON 은 레코드 목록 탭)
+- 카테고리 창은 CategoryIndex 트리를 루트만 먼저 그리고 펼칠 때 하위 삽입, 이름/ID 접두사 검색
+- 크롤링/카테고리 수집은 job_manager.JobManager 큐로 실행 (동시 실행 수 제한, 작업별 설정, 취소 시 부분 결과 저장)
+- 하단 진행 패널(progress_panel.py): 크롤러의 진행 이벤트로 req/s, 수집/중복, 쿨다운, 남은 요청, ETA, 지연 sparkline 표시
+- 히스토리 목록/누적 키워드는 fs_watcher 로 scrape_results, last_result.json, 카테고리 결과 변경을 받아 자동 갱신
+- 로그 창은 LogSink 로 100ms 마다 묶어서 갱신, 최근 LOG_MAX_LINES 줄만 유지 (전체 로그는 logs/gui.log)
 """
-import os
 import sys
+import queue
 import threading
+import time
 import subprocess
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, ttk
-import json
 from pathlib import Path
 
+import json_codec
+import keyword_db
+from category_index import CategoryIndex
+from fs_watcher import FileWatcher
+from job_control import parse_progress
+from job_manager import JobManager
+from keyword_index import KeywordMapIndex
+from paged_viewer import PagedTextView, SnapshotView
+from progress_panel import ProgressPanel
+
 # 모든 경로를 gui.py 위치 기준으로 고정
 BASE_DIR = Path(__file__).parent.resolve()
 
@@ -26,6 +44,18 @@ LAST_JSON = BASE_DIR / "last_result.json"
 CATEGORY_JSON = BASE_DIR / "category_token_result.json"
 CATEGORY_JSON_FALLBACK = BASE_DIR / "category_master.json"
 CONFIG_FILE = BASE_DIR / "runtime_config.json"
+LOG_FILE = BASE_DIR / "logs" / "gui.log"
+LOG_MAX_LINES = 5000
+LOG_FLUSH_MS = 100
+
+JOB_POLL_MS = 500
+WATCH_PUMP_MS = 300
+JOB_MAX_LIMIT = 4
+KEYWORD_PAGE_SIZE = 200
+KEYWORD_SEARCH_DELAY_MS = 200
+CATEGORY_SEARCH_LIMIT = 300
+
+KEYWORD_INDEX = KeywordMapIndex(data_dir=DATA_DIR, last_json=LAST_JSON)
 
 # SEED 키워드 로드
 try:
@@ -38,14 +68,14 @@ except Exception:
 def load_config():
     if CONFIG_FILE.exists():
         try:
-            return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+            return json_codec.read(CONFIG_FILE)
         except Exception:
             return {}
     return {}
 
 def load_json(path: Path):
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return json_codec.read(path)
     except Exception:
         return None
 
@@ -55,65 +85,87 @@ def list_history_files():
     return sorted([p.name for p in DATA_DIR.glob("*.json")], reverse=True)
 
 
-def format_ts(ts: int) -> str:
-    try:
-        import datetime
-        return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        return str(ts)
+class LogSink:
+    """
+    워커 스레드 → 로그 창 전달용 버퍼.
+    - write() 는 어느 스레드에서든 호출 가능 (큐에만 쌓음)
+    - Tk 스레드에서 LOG_FLUSH_MS 마다 쌓인 줄을 한 번에 insert, 위젯은 최근 max_lines 줄만 유지
+    - 모든 줄은 LOG_FILE 에도 기록
+    """
+
+    def __init__(self, widget, max_lines: int = LOG_MAX_LINES, flush_ms: int = LOG_FLUSH_MS, spill_path: Path = LOG_FILE):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.flush_ms = flush_ms
+        self.pending = queue.SimpleQueue()
+        self.spill = None
+        try:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self.spill = spill_path.open("a", encoding="utf-8")
+            self.spill.write(f"\n===== GUI session {time.strftime('%Y-%m-%d %H:%M:%S')} =====\n")
+        except Exception as e:
+            print(f"[WARN] log file unavailable: {e}")
+        widget.after(self.flush_ms, self._flush)
 
-def run_scraper(log_box, status_var, run_btn, refresh_fn, kw_input, cookie_input, debug_var):
-    if not SCRIPT.exists():
-        messagebox.showerror("오류", f"{SCRIPT} 파일이 없습니다.")
-        return
-    run_btn.config(state="disabled")
-    status_var.set("실행 중...")
-    log_box.delete("1.0", tk.END)
+    def write(self, msg: str) -> None:
+        self.pending.put(msg)
 
-    def append(msg: str):
-        log_box.after(0, lambda: (log_box.insert(tk.END, msg), log_box.see(tk.END)))
+    def clear(self) -> None:
+        self.widget.delete("1.0", tk.END)
 
-    def worker():
-        env = os.environ.copy()
-        env["PYTHONUTF8"] = "1"
-        config_payload = {
-            "seed_keywords": [kw.strip() for kw in kw_input.get("1.0", tk.END).split(",") if kw.strip()],
-            "cookie": cookie_input.get().strip(),
-            "debug": bool(debug_var.get()),
-        }
+    def _flush(self) -> None:
+        chunks = []
         try:
-            CONFIG_FILE.write_text(json.dumps(config_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception as e:
-            append(f"[WARN] 설정 파일 저장 실패: {e}\n")
-        try:
-            proc = subprocess.Popen(
-                [sys.executable, str(SCRIPT)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                env=env,
-                cwd=str(BASE_DIR),
-            )
-            for line in proc.stdout:
-                append(line)
-            proc.wait()
-            if proc.returncode == 0:
-                status_var.set("완료")
-                size = SQL_FILE.stat().st_size if SQL_FILE.exists() else 0
-                append(f"\n[INFO] 완료. SQL: {SQL_FILE.resolve()} (size={size} bytes)\n")
-                refresh_fn()
-            else:
-                status_var.set(f"실패(code={proc.returncode})")
-                append(f"\n[ERROR] 프로세스 실패(code={proc.returncode})\n")
-        except Exception as e:
-            status_var.set("실패")
-            append(f"\n[ERROR] 실행 중 예외: {e}\n")
-        finally:
-            run_btn.config(state="normal")
-
-    threading.Thread(target=worker, daemon=True).start()
+            while True:
+                chunks.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+        if chunks:
+            text = "".join(chunks)
+            if self.spill:
+                self.spill.write(text)
+                self.spill.flush()
+            w = self.widget
+            w.insert(tk.END, text)
+            # Text 위젯은 끝에 항상 빈 줄 하나가 있으므로 -1
+            excess = int(w.index("end-1c").split(".")[0]) - self.max_lines
+            if excess > 0:
+                w.delete("1.0", f"{excess + 1}.0")
+            w.see(tk.END)
+        self.widget.after(self.flush_ms, self._flush)
+
+
+def run_scraper(jobs, status_var, kw_input, cookie_input, debug_var):
+    if not SCRIPT.exists():
+        messagebox.showerror("오류", f"{SCRIPT} 파일이 없습니다.")
+        return
+    config_payload = {
+        "seed_keywords": [kw.strip() for kw in kw_input.get("1.0", tk.END).split(",") if kw.strip()],
+        "cookie": cookie_input.get().strip(),
+        "debug": bool(debug_var.get()),
+    }
+    try:
+        json_codec.write(CONFIG_FILE, config_payload)
+    except Exception as e:
+        messagebox.showwarning("경고", f"설정 파일 저장 실패: {e}")
+    # 작업마다 설정을 따로 넘기므로 실행 대기 중에 키워드를 바꿔 또 넣어도 섞이지 않음
+    config = {**load_config(), **config_payload}
+
+    def on_done(job):
+        if job.status == "done":
+            size = SQL_FILE.stat().st_size if SQL_FILE.exists() else 0
+            status_var.set(f"#{job.id} 완료")
+            jobs.on_output(job, f"[INFO] 완료. SQL: {SQL_FILE.resolve()} (size={size} bytes)\n")
+        elif job.status == "cancelled":
+            status_var.set(f"#{job.id} 취소됨")
+            jobs.on_output(job, "[INFO] 취소됨 (중단 시점까지의 결과 저장)\n")
+        else:
+            status_var.set(f"#{job.id} 실패(code={job.returncode})")
+            jobs.on_output(job, f"[ERROR] 프로세스 실패(code={job.returncode})\n")
+        # 히스토리/키워드 요약은 파일 감시(fs_watcher)가 새 결과 파일을 보고 갱신
+
+    job = jobs.submit("크롤링", SCRIPT, config=config, on_done=on_done)
+    status_var.set(f"#{job.id} 크롤링 대기열 추가 (키워드 {len(config_payload['seed_keywords'])}개)")
 
 def open_sql():
     if not SQL_FILE.exists():
@@ -122,146 +174,239 @@ def open_sql():
     win = tk.Toplevel()
     win.title("init_master_data.sql 미리보기")
     win.geometry("900x600")
-    txt = scrolledtext.ScrolledText(win, wrap="none", font=("Consolas", 10))
-    txt.pack(fill="both", expand=True)
-    txt.insert("1.0", SQL_FILE.read_text(encoding="utf-8"))
-    txt.see("1.0")
+    view = PagedTextView(win, font=("Consolas", 10))
+    view.pack(fill="both", expand=True)
+    view.open(SQL_FILE)
 
 def view_keyword_map_window():
-    if not SQL_FILE.exists():
-        messagebox.showinfo("알림", "먼저 크롤러를 실행해 SQL을 생성하세요")
+    # last_result.json 의 SQLite 미러(keyword_db.py)를 검색/묶음/페이지 단위로 조회
+    if not LAST_JSON.exists():
+        messagebox.showinfo("알림", "먼저 크롤러를 실행해 결과를 생성하세요")
         return
-    kv = {}
-    for line in SQL_FILE.read_text(encoding="utf-8").splitlines():
-        if "INSERT IGNORE INTO keyword_templates" in line:
-            try:
-                vals = line.split("VALUES", 1)[1]
-                vals = vals.split("(", 1)[1].rsplit(")", 1)[0]
-                parts = [v.strip().strip("'") for v in vals.split(",")]
-                # 값 포맷: business_id, keyword, [keyword_code], cnt
-                if len(parts) >= 3:
-                    keyword = parts[1]
-                    cnt = parts[-1]
-                    kv[keyword] = kv.get(keyword, 0) + int(cnt)
-            except Exception:
-                continue
+    conn = keyword_db.connect()
+    keyword_db.sync(conn, LAST_JSON)
+
     win = tk.Toplevel()
     win.title("키워드맵")
-    win.geometry("420x520")
-    tree = ttk.Treeview(win, columns=("kw", "cnt"), show="headings", height=20)
-    tree.heading("kw", text="keyword")
-    tree.heading("cnt", text="count")
-    tree.column("kw", width=260)
-    tree.column("cnt", width=80, anchor="e")
-    for kw, c in sorted(kv.items(), key=lambda x: x[1], reverse=True):
-        tree.insert("", "end", values=(kw, c))
+    win.geometry("560x560")
+    state = {"offset": 0, "total": 0, "pending": None}
+
+    bar = tk.Frame(win)
+    bar.pack(fill="x", padx=6, pady=(6, 0))
+    tk.Label(bar, text="검색").pack(side="left")
+    search_var = tk.StringVar()
+    tk.Entry(bar, textvariable=search_var, width=24).pack(side="left", padx=(4, 8))
+    tk.Label(bar, text="묶음").pack(side="left")
+    group_var = tk.StringVar(value="keyword")
+    group_box = ttk.Combobox(bar, textvariable=group_var, values=list(keyword_db.GROUPINGS),
+                             state="readonly", width=10)
+    group_box.pack(side="left", padx=4)
+
+    tree = ttk.Treeview(win, columns=("c0", "c1", "c2"), show="headings", height=20)
+    tree.column("c0", width=300)
+    tree.column("c1", width=100, anchor="e")
+    tree.column("c2", width=100, anchor="e")
     tree.pack(fill="both", expand=True, padx=6, pady=6)
 
-
-def aggregate_keyword_map():
-    kv = {}
-    paths = []
-    if LAST_JSON.exists():
-        paths.append(LAST_JSON)
-    if DATA_DIR.exists():
-        paths.extend(DATA_DIR.glob("*.json"))
-    for p in paths:
-        data = load_json(p)
-        if not data:
-            continue
-        for rec in data.get("records", []):
-            for kw in rec.get("keywords", []):
-                k = kw.get("keyword", "")
-                c = kw.get("count", 0)
-                if not k:
-                    continue
-                kv[k] = kv.get(k, 0) + int(c)
-    return sorted(kv.items(), key=lambda x: x[1], reverse=True)
-
-def refresh_history(history_list, detail_box, kwmap_box):
-    history_list.delete(0, tk.END)
-    for f in list_history_files():
-        history_list.insert(tk.END, f)
-    detail_box.delete("1.0", tk.END)
+    nav = tk.Frame(win)
+    nav.pack(fill="x", padx=6, pady=(0, 6))
+    page_var = tk.StringVar()
+    prev_btn = tk.Button(nav, text="◀ 이전", command=lambda: move(-1))
+    prev_btn.pack(side="left")
+    next_btn = tk.Button(nav, text="다음 ▶", command=lambda: move(1))
+    next_btn.pack(side="left", padx=4)
+    tk.Label(nav, textvariable=page_var).pack(side="left", padx=8)
+
+    def render():
+        group_by = group_var.get()
+        text = search_var.get()
+        for i, title in enumerate(keyword_db.columns(group_by)):
+            tree.heading(f"c{i}", text=title)
+        tree.column("c1", anchor="w" if group_by == "row" else "e")
+        state["total"] = keyword_db.count(conn, text, group_by)
+        rows = keyword_db.query(conn, text, group_by, state["offset"], KEYWORD_PAGE_SIZE)
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert("", "end", values=row)
+        start = state["offset"] + 1 if rows else 0
+        page_var.set(f"{start}-{state['offset'] + len(rows)} / {state['total']}")
+        prev_btn.config(state="normal" if state["offset"] > 0 else "disabled")
+        next_btn.config(state="normal" if state["offset"] + KEYWORD_PAGE_SIZE < state["total"] else "disabled")
+
+    def move(step):
+        state["offset"] = max(0, state["offset"] + step * KEYWORD_PAGE_SIZE)
+        render()
+
+    def schedule(*_):
+        # 입력할 때마다 쿼리하지 않고 KEYWORD_SEARCH_DELAY_MS 동안 멈추면 한 번 조회
+        if state["pending"]:
+            win.after_cancel(state["pending"])
+        state["offset"] = 0
+        state["pending"] = win.after(KEYWORD_SEARCH_DELAY_MS, render)
+
+    search_var.trace_add("write", schedule)
+    group_box.bind("<<ComboboxSelected>>", schedule)
+    win.bind("<Destroy>", lambda e: conn.close() if e.widget is win else None)
+    render()
+
+
+def render_keyword_summary(kwmap_box):
     kwmap_box.delete("1.0", tk.END)
-    items = aggregate_keyword_map()
-    if not items:
+    top = KEYWORD_INDEX.top(30)
+    if not top:
         kwmap_box.insert("1.0", "데이터 없음")
     else:
-        top = items[:30]
         lines = [f"{kw} : {cnt}" for kw, cnt in top]
         kwmap_box.insert("1.0", "\n".join(lines))
-        kwmap_box.insert("end", f"\n\n(총 {len(items)} 키워드)")
+        kwmap_box.insert("end", f"\n\n(총 {len(KEYWORD_INDEX)} 키워드)")
 
-def show_history_item(history_list, detail_box):
+def refresh_history(history_list, detail_view, kwmap_box):
+    history_list.delete(0, tk.END)
+    for f in list_history_files():
+        history_list.insert(tk.END, f)
+    detail_view.clear()
+    KEYWORD_INDEX.update()
+    render_keyword_summary(kwmap_box)
+
+def apply_file_changes(changes, history_list, kwmap_box, status_var):
+    """
+    fs_watcher 가 알려준 (kind, path) 만 반영: 히스토리 목록에 끼워 넣거나 빼고,
+    키워드 인덱스는 바뀐 파일만 다시 접음 (디렉터리 전체 재탐색 없음)
+    """
+    data_dir = DATA_DIR.resolve()
+    result_paths = []
+    for kind, path in changes:
+        if path.parent == data_dir:
+            result_paths.append(path)
+            names = list(history_list.get(0, tk.END))  # 이름 내림차순
+            if kind == "deleted":
+                if path.name in names:
+                    history_list.delete(names.index(path.name))
+            elif path.name not in names:
+                pos = next((i for i, n in enumerate(names) if n < path.name), len(names))
+                history_list.insert(pos, path.name)
+        elif path == LAST_JSON.resolve():
+            result_paths.append(path)
+        elif path.name in (CATEGORY_JSON.name, CATEGORY_JSON_FALLBACK.name):
+            status_var.set(f"{path.name} 갱신됨 ({time.strftime('%H:%M:%S')})")
+    if result_paths:
+        KEYWORD_INDEX.update_paths(result_paths)
+        render_keyword_summary(kwmap_box)
+
+def show_history_item(history_list, detail_view):
     sel = history_list.curselection()
     if not sel:
         return
     fname = history_list.get(sel[0])
     path = DATA_DIR / fname
-    data = load_json(path)
-    detail_box.delete("1.0", tk.END)
-    if not data:
-        detail_box.insert("1.0", "불러오기 실패")
-    else:
-        # 메타 정보(파일명, 타임스탬프) 우선 표시
-        ts = data.get("timestamp")
-        header = f"file: {fname}\n"
-        if ts:
-            header += f"timestamp: {ts} ({format_ts(ts)})\n"
-        detail_box.insert("1.0", header + "\n" + json.dumps(data, ensure_ascii=False, indent=2))
-
-def load_last_result(detail_box):
-    detail_box.delete("1.0", tk.END)
-    path = LAST_JSON
     if not path.exists():
-        detail_box.insert("1.0", "last_result.json 이 없습니다. 먼저 크롤링을 실행하세요")
+        detail_view.show_message("불러오기 실패")
         return
-    data = load_json(path)
-    ts = data.get("timestamp")
-    header = f"file: {path.name}\n"
-    if ts:
-        header += f"timestamp: {ts} ({format_ts(ts)})\n"
-    detail_box.insert("1.0", header + "\n" + json.dumps(data, ensure_ascii=False, indent=2))
+    # 파일 전체를 읽지 않고 줄 오프셋 색인 + 레코드 목록으로 표시 (paged_viewer.py)
+    detail_view.open(path)
+
+def load_last_result(detail_view):
+    if not LAST_JSON.exists():
+        detail_view.show_message("last_result.json 이 없습니다. 먼저 크롤링을 실행하세요")
+        return
+    detail_view.open(LAST_JSON)
+
+def load_category_index():
+    # category_token_result.json 은 category_index.pkl 캐시를 사용, fallback 파일은 그때그때 구성
+    if CATEGORY_JSON.exists():
+        return CategoryIndex.load_or_build(source=CATEGORY_JSON), CATEGORY_JSON
+    if CATEGORY_JSON_FALLBACK.exists():
+        return CategoryIndex.from_file(CATEGORY_JSON_FALLBACK), CATEGORY_JSON_FALLBACK
+    return None, None
+
 
 def show_category_map():
-    path = CATEGORY_JSON if CATEGORY_JSON.exists() else CATEGORY_JSON_FALLBACK
-    if not path or not path.exists():
+    try:
+        index, path = load_category_index()
+    except Exception as e:
+        messagebox.showerror("오류", f"카테고리 인덱스 로드 실패: {e}")
+        return
+    if index is None:
         messagebox.showinfo("알림", "category_token_result.json 또는 category_master.json 이 없습니다.")
         return
-    data = load_json(path)
-    if not data or not data.get("categories"):
+    if not len(index):
         messagebox.showinfo("알림", "카테고리 데이터가 비어있습니다.")
         return
     win = tk.Toplevel()
     win.title(f"최종 카테고리 ({path.name})")
-    win.geometry("480x560")
-    tree = ttk.Treeview(win, columns=("code", "name", "path"), show="headings", height=25)
+    win.geometry("560x600")
+    state = {"pending": None}
+
+    bar = tk.Frame(win)
+    bar.pack(fill="x", padx=6, pady=(6, 0))
+    tk.Label(bar, text="검색(이름/ID)").pack(side="left")
+    search_var = tk.StringVar()
+    tk.Entry(bar, textvariable=search_var, width=28).pack(side="left", padx=4)
+
+    tree = ttk.Treeview(win, columns=("code", "path"), height=25)
+    tree.heading("#0", text="name")
     tree.heading("code", text="code")
-    tree.heading("name", text="name")
     tree.heading("path", text="path/lPath")
+    tree.column("#0", width=220)
     tree.column("code", width=80)
-    tree.column("name", width=180)
-    tree.column("path", width=200)
-    cats = data.get("categories", [])
-    for c in cats:
-        code = c.get("id") or c.get("code") or c.get("categoryId")
-        name = c.get("name") or c.get("categoryName")
-        path_val = c.get("path") or c.get("lPath", "")
-        tree.insert("", "end", values=(code, name, path_val))
+    tree.column("path", width=240)
     tree.pack(fill="both", expand=True, padx=6, pady=6)
-    tk.Label(win, text=f"총 {len(cats)}건").pack(anchor="e", padx=6, pady=(0, 6))
-
-
-def run_cookie_login(log_box, status_var, btn):
+    count_var = tk.StringVar()
+    tk.Label(win, textvariable=count_var).pack(anchor="e", padx=6, pady=(0, 6))
+
+    # iid = 인덱스 배열 위치. 자식은 펼칠 때 삽입하고, 그 전까지는 빈 자리 노드만 둠
+    def insert_node(parent_iid, pos, lazy=True):
+        iid = tree.insert(parent_iid, "end", iid=str(pos), text=index.names[pos],
+                          values=(index.ids[pos], index.paths[pos]))
+        if lazy and index.has_children(pos):
+            tree.insert(iid, "end", iid=f"{iid}:stub")
+        return iid
+
+    def show_roots():
+        tree.delete(*tree.get_children())
+        for pos in index.root_positions():
+            insert_node("", pos)
+        count_var.set(f"총 {len(index)}건")
+
+    def on_open(_event):
+        iid = tree.focus()
+        stub = f"{iid}:stub"
+        if not tree.exists(stub):
+            return
+        tree.delete(stub)
+        for pos in index.children_of(int(iid)):
+            insert_node(iid, pos)
+
+    def run_search():
+        state["pending"] = None
+        text = search_var.get().strip()
+        if not text:
+            show_roots()
+            return
+        tree.delete(*tree.get_children())
+        hits = index.search_positions(text, limit=CATEGORY_SEARCH_LIMIT)
+        for pos in hits:
+            insert_node("", pos, lazy=False)
+        suffix = "+" if len(hits) >= CATEGORY_SEARCH_LIMIT else ""
+        count_var.set(f"검색 결과 {len(hits)}{suffix}건 / 총 {len(index)}건")
+
+    def schedule(*_):
+        if state["pending"]:
+            win.after_cancel(state["pending"])
+        state["pending"] = win.after(KEYWORD_SEARCH_DELAY_MS, run_search)
+
+    tree.bind("<<TreeviewOpen>>", on_open)
+    search_var.trace_add("write", schedule)
+    show_roots()
+
+
+def run_cookie_login(log_sink, status_var, btn):
     if not COOKIE_SCRIPT.exists():
         messagebox.showerror("오류", f"{COOKIE_SCRIPT} 파일이 없습니다.")
         return
     btn.config(state="disabled")
     status_var.set("브라우저 로그인 대기...")
-
-    def append(msg: str):
-        log_box.after(0, lambda: (log_box.insert(tk.END, msg), log_box.see(tk.END)))
+    append = log_sink.write
 
     def worker():
         try:
@@ -292,50 +437,84 @@ def run_cookie_login(log_box, status_var, btn):
     threading.Thread(target=worker, daemon=True).start()
 
 
-def run_category_scraper(log_box, status_var, btn, refresh_fn):
+def run_category_scraper(jobs, status_var):
     if not CATEGORY_SCRIPT.exists():
         messagebox.showerror("오류", f"{CATEGORY_SCRIPT} 파일이 없습니다.")
         return
-    btn.config(state="disabled")
-    status_var.set("카테고리 수집 중...")
-
-    def append(msg: str):
-        log_box.after(0, lambda: (log_box.insert(tk.END, msg), log_box.see(tk.END)))
 
-    def worker():
-        try:
-            proc = subprocess.Popen(
-                [sys.executable, str(CATEGORY_SCRIPT)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                cwd=str(BASE_DIR),
-            )
-            for line in proc.stdout:
-                append(line)
-            proc.wait()
-            if proc.returncode == 0:
-                status_var.set("카테고리 수집 완료")
-                append("[INFO] category_token_scraper 완료\n")
-                refresh_fn()
+    def on_done(job):
+        if job.status == "done":
+            status_var.set(f"#{job.id} 카테고리 수집 완료")
+            jobs.on_output(job, "[INFO] category_token_scraper 완료\n")
+        elif job.status == "cancelled":
+            status_var.set(f"#{job.id} 카테고리 수집 취소됨")
+            jobs.on_output(job, "[INFO] 취소됨 (중단 시점까지의 결과 저장)\n")
+        else:
+            status_var.set(f"#{job.id} 카테고리 수집 실패(code={job.returncode})")
+            jobs.on_output(job, f"[ERROR] category_token_scraper 실패(code={job.returncode})\n")
+
+    job = jobs.submit("카테고리", CATEGORY_SCRIPT, on_done=on_done)
+    status_var.set(f"#{job.id} 카테고리 수집 대기열 추가")
+
+
+def build_jobs_panel(parent, jobs, status_var):
+    """작업 목록 표 + 취소/정리 버튼 + 동시 실행 수. JOB_POLL_MS 마다 이벤트를 가져와 갱신."""
+    frame = tk.Frame(parent)
+    bar = tk.Frame(frame)
+    bar.pack(fill="x")
+    tk.Label(bar, text="작업 목록", font=("Segoe UI", 10, "bold")).pack(side="left")
+    limit_var = tk.IntVar(value=jobs.limit)
+    tk.Spinbox(bar, from_=1, to=JOB_MAX_LIMIT, width=3, textvariable=limit_var,
+               command=lambda: jobs.set_limit(limit_var.get())).pack(side="right")
+    tk.Label(bar, text="동시 실행").pack(side="right", padx=4)
+    tk.Button(bar, text="완료 작업 정리", command=lambda: (jobs.clear_finished(), render())).pack(side="right", padx=4)
+    tk.Button(bar, text="선택 작업 취소", command=lambda: cancel_selected()).pack(side="right", padx=4)
+
+    cols = ("id", "name", "status", "started", "elapsed", "returncode")
+    tree = ttk.Treeview(frame, columns=cols, show="headings", height=4)
+    for col, width in zip(cols, (40, 120, 90, 90, 80, 60)):
+        tree.heading(col, text=col)
+        tree.column(col, width=width, anchor="w" if col == "name" else "center")
+    tree.pack(fill="x")
+
+    def cancel_selected():
+        for iid in tree.selection():
+            jobs.cancel(int(iid))
+
+    def render():
+        live = set()
+        for job in jobs.jobs:
+            row = job.row()
+            iid = str(job.id)
+            live.add(iid)
+            values = tuple(row[c] for c in cols)
+            if tree.exists(iid):
+                tree.item(iid, values=values)
             else:
-                status_var.set(f"카테고리 수집 실패(code={proc.returncode})")
-                append(f"[ERROR] category_token_scraper 실패(code={proc.returncode})\n")
-        except Exception as e:
-            status_var.set("카테고리 수집 실패")
-            append(f"[ERROR] 실행 중 예외: {e}\n")
-        finally:
-            btn.config(state="normal")
-
-    threading.Thread(target=worker, daemon=True).start()
+                tree.insert("", "end", iid=iid, values=values)
+        for iid in tree.get_children():
+            if iid not in live:
+                tree.delete(iid)
+
+    def pump():
+        for kind, job in jobs.drain_events():
+            if kind == "finished" and job.on_done and job.started is not None:
+                job.on_done(job)
+            elif kind == "started":
+                status_var.set(f"#{job.id} {job.name} 실행 중...")
+            elif kind == "stopping":
+                status_var.set(f"#{job.id} {job.name} 중단 요청 (부분 결과 저장 대기)")
+        render()
+        frame.after(JOB_POLL_MS, pump)
+
+    pump()
+    return frame
 
 
 def main():
     root = tk.Tk()
     root.title("Naver Place Crawler GUI")
-    root.geometry("980x720")
+    root.geometry("980x820")
 
     status_var = tk.StringVar(value="대기")
     cfg = load_config()
@@ -365,23 +544,22 @@ def main():
     top_frame.pack(fill="x", padx=10)
 
     run_btn = tk.Button(top_frame, text="크롤링 실행", width=16,
-                        command=lambda: run_scraper(log_box, status_var, run_btn, refresh_history_async,
-                                                    kw_box, cookie_entry, debug_var))
+                        command=lambda: run_scraper(jobs, status_var, kw_box, cookie_entry, debug_var))
     run_btn.pack(side="left", padx=4)
 
     cookie_btn = tk.Button(top_frame, text="쿠키 수동로그인", width=14,
-                           command=lambda: run_cookie_login(log_box, status_var, cookie_btn))
+                           command=lambda: run_cookie_login(log_sink, status_var, cookie_btn))
     cookie_btn.pack(side="left", padx=4)
 
     cat_btn = tk.Button(top_frame, text="카테고리 수집 실행", width=16,
-                        command=lambda: run_category_scraper(log_box, status_var, cat_btn, refresh_history_async))
+                        command=lambda: run_category_scraper(jobs, status_var))
     cat_btn.pack(side="left", padx=4)
 
     tk.Button(top_frame, text="SQL 미리보기", width=12, command=open_sql).pack(side="left", padx=4)
     tk.Button(top_frame, text="키워드맵 보기", width=12, command=view_keyword_map_window).pack(side="left", padx=4)
     tk.Button(top_frame, text="카테고리 보기", width=12, command=show_category_map).pack(side="left", padx=4)
-    tk.Button(top_frame, text="히스토리 새로고침", width=14, command=lambda: refresh_history(history_list, detail_box, kwmap_box)).pack(side="left", padx=4)
-    tk.Button(top_frame, text="최근 결과 보기", width=12, command=lambda: load_last_result(detail_box)).pack(side="left", padx=4)
+    tk.Button(top_frame, text="히스토리 새로고침", width=14, command=lambda: refresh_history(history_list, detail_view, kwmap_box)).pack(side="left", padx=4)
+    tk.Button(top_frame, text="최근 결과 보기", width=12, command=lambda: load_last_result(detail_view)).pack(side="left", padx=4)
     tk.Label(top_frame, textvariable=status_var, fg="blue").pack(side="left", padx=10)
 
     mid_frame = tk.Frame(root)
@@ -389,6 +567,19 @@ def main():
 
     log_box = scrolledtext.ScrolledText(mid_frame, wrap="none", height=18, font=("Consolas", 10))
     log_box.pack(side="left", fill="both", expand=True, padx=(0, 6))
+    log_sink = LogSink(log_box)
+    progress = ProgressPanel(root)
+
+    def on_job_output(job, line):
+        # 진행 이벤트 줄은 대시보드로, 나머지는 로그 창으로
+        ev = parse_progress(line)
+        if ev is not None:
+            progress.feed(job.id, ev)
+        else:
+            log_sink.write(f"[#{job.id} {job.name}] {line}")
+
+    jobs = JobManager(on_output=on_job_output)
+    root.protocol("WM_DELETE_WINDOW", lambda: (jobs.cancel_all(), root.destroy()))
 
     right = tk.Frame(mid_frame, width=320)
     right.pack(side="left", fill="y")
@@ -396,21 +587,41 @@ def main():
     tk.Label(right, text="저장된 크롤링 결과").pack(anchor="w")
     history_list = tk.Listbox(right, height=10)
     history_list.pack(fill="x")
-    history_list.bind("<<ListboxSelect>>", lambda e: show_history_item(history_list, detail_box))
+    history_list.bind("<<ListboxSelect>>", lambda e: show_history_item(history_list, detail_view))
 
     tk.Label(right, text="선택 결과 미리보기").pack(anchor="w", pady=(4, 0))
-    detail_box = scrolledtext.ScrolledText(right, wrap="word", height=10, font=("Consolas", 9))
-    detail_box.pack(fill="x", pady=(0, 4))
+    detail_view = SnapshotView(right, height=10)
+    detail_view.pack(fill="x", pady=(0, 4))
 
     tk.Label(right, text="누적 키워드 상위(상위 30)").pack(anchor="w")
     kwmap_box = scrolledtext.ScrolledText(right, wrap="word", height=8, font=("Consolas", 9))
     kwmap_box.pack(fill="x")
 
-    def refresh_history_async():
-        refresh_history(history_list, detail_box, kwmap_box)
+    progress.pack(fill="x", padx=10, pady=(0, 4))
+    build_jobs_panel(root, jobs, status_var).pack(fill="x", padx=10, pady=(0, 8))
+
+    refresh_history(history_list, detail_view, kwmap_box)
 
-    refresh_history_async()
+    # 결과 파일 감시: GUI 밖에서 실행한 크롤링 결과도 자동 반영
+    file_changes = queue.SimpleQueue()
+    watcher = FileWatcher([DATA_DIR, LAST_JSON, CATEGORY_JSON, CATEGORY_JSON_FALLBACK],
+                          lambda kind, path: file_changes.put((kind, path)), suffixes={".json"}).start()
+    log_sink.write(f"[INFO] 결과 파일 감시 시작 ({watcher.backend})\n")
+
+    def pump_file_changes():
+        changes = []
+        try:
+            while True:
+                changes.append(file_changes.get_nowait())
+        except queue.Empty:
+            pass
+        if changes:
+            apply_file_changes(changes, history_list, kwmap_box, status_var)
+        root.after(WATCH_PUMP_MS, pump_file_changes)
+
+    pump_file_changes()
     root.mainloop()
+    watcher.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+GUI 작업 관리자(job_manager.py)와 크롤러 스크립트 사이의 약속
+- CRAWL_CONFIG_FILE: 작업마다 따로 쓴 설정 파일 경로 (없으면 runtime_config.json)
+- CRAWL_STOP_FILE: 이 파일이 생기면 중단 요청 → 크롤러는 루프를 빠져나와 지금까지 모은 결과를 저장하고 종료
+  (Windows 에서도 동일하게 동작하도록 시그널 대신 파일 사용, POSIX 에서는 SIGTERM 도 같은 의미)
+- emit_progress(): stdout 에 "@@progress {json}" 한 줄을 찍어 GUI 대시보드로 진행 상황 전달
+  (GUI 밖에서 실행해도 로그에 한 줄 더 보일 뿐 동작은 같음)
+"""
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import json_codec
+
+CONFIG_ENV = "CRAWL_CONFIG_FILE"
+STOP_ENV = "CRAWL_STOP_FILE"
+PROGRESS_PREFIX = "@@progress "
+
+_stop_signalled = False
+
+
+def config_path(default: Path) -> Path:
+    value = os.environ.get(CONFIG_ENV)
+    return Path(value) if value else Path(default)
+
+
+def _on_term(signum, frame):
+    global _stop_signalled
+    _stop_signalled = True
+
+
+def install_stop_handler() -> None:
+    if hasattr(signal, "SIGTERM"):
+        try:
+            signal.signal(signal.SIGTERM, _on_term)
+        except ValueError:  # 메인 스레드가 아니면 등록 불가
+            pass
+
+
+def stop_requested() -> bool:
+    if _stop_signalled:
+        return True
+    stop_file = os.environ.get(STOP_ENV)
+    return bool(stop_file) and os.path.exists(stop_file)
+
+
+def sleep(seconds: float, step: float = 0.5) -> bool:
+    """중단 요청이 오면 일찍 깨는 sleep. 중단 요청으로 깼으면 True."""
+    deadline = time.monotonic() + seconds
+    while True:
+        if stop_requested():
+            return True
+        left = deadline - time.monotonic()
+        if left <= 0:
+            return False
+        time.sleep(min(step, left))
+
+
+def emit_progress(event: str, **fields) -> None:
+    fields["event"] = event
+    fields["t"] = round(time.time(), 3)
+    print(PROGRESS_PREFIX + json_codec.dumps(fields), flush=True)
+
+
+def parse_progress(line: str) -> Optional[Dict[str, Any]]:
+    """진행 이벤트 줄이면 dict, 일반 로그 줄이면 None"""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json_codec.loads(line[len(PROGRESS_PREFIX):])
+    except json_codec.DecodeError:
+        return None
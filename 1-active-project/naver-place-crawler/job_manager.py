@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+GUI 작업 큐 / 스케줄러
+- submit() 으로 스크립트 실행 작업을 큐에 넣고, 동시 실행 수(limit) 안에서 순서대로 시작
+- 같은 스크립트 작업은 한 번에 하나만 실행 (크롤링 두 개가 last_result.json / init_master_data.sql /
+  키워드 사전 / 원문 저장소 인덱스를 동시에 쓰지 않도록) → 크롤링과 카테고리 수집은 함께 돌 수 있음
+- 작업마다 설정 파일(out/jobs/<id>.config.json)을 따로 써서 CRAWL_CONFIG_FILE 로 전달
+  → 서로 다른 seed 키워드 묶음을 여러 개 쌓아 둘 수 있음
+- cancel(): 대기 중이면 바로 취소, 실행 중이면 CRAWL_STOP_FILE 을 만들어 크롤러가 부분 결과를 저장하고
+  끝나도록 요청 (CANCEL_GRACE_SEC 안에 안 끝나면 terminate, 그래도 KILL_WAIT_SEC 안에 안 끝나면 kill
+  — POSIX 에선 SIGTERM 도 job_control 의 stop 핸들러가 받아 플래그만 세우므로)
+- 상태 변화는 events 큐로 알림 → GUI 가 Tk 스레드에서 drain_events() 로 가져감
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import json_codec
+from job_control import CONFIG_ENV, STOP_ENV
+
+BASE_DIR = Path(__file__).parent.resolve()
+JOB_DIR = BASE_DIR / "out" / "jobs"
+CANCEL_GRACE_SEC = 30
+KILL_WAIT_SEC = 10
+DEFAULT_LIMIT = 2
+
+QUEUED, RUNNING, STOPPING = "queued", "running", "stopping"
+DONE, FAILED, CANCELLED = "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    def __init__(self, jid: int, name: str, script: Path, config: Optional[Dict[str, Any]] = None,
+                 on_done: Optional[Callable[["Job"], None]] = None):
+        self.id = jid
+        self.name = name
+        self.script = Path(script)
+        self.config = config
+        self.on_done = on_done
+        self.status = QUEUED
+        self.returncode: Optional[int] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_requested = False
+        self.proc: Optional[subprocess.Popen] = None
+        self.stop_file = JOB_DIR / f"{jid}.stop"
+        self.config_file = JOB_DIR / f"{jid}.config.json"
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "started": time.strftime("%H:%M:%S", time.localtime(self.started)) if self.started else "",
+            "elapsed": f"{self.elapsed():.0f}s" if self.started else "",
+            "returncode": "" if self.returncode is None else self.returncode,
+        }
+
+
+class JobManager:
+    def __init__(self, limit: int = DEFAULT_LIMIT, on_output: Optional[Callable[[Job, str], None]] = None,
+                 cwd: Path = BASE_DIR):
+        self.limit = max(1, limit)
+        self.on_output = on_output
+        self.cwd = Path(cwd)
+        self.jobs: List[Job] = []
+        self.events: "queue.SimpleQueue" = queue.SimpleQueue()  # (kind, job)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        JOB_DIR.mkdir(parents=True, exist_ok=True)
+
+    # ---------- 큐 ----------
+    def submit(self, name: str, script: Path, config: Optional[Dict[str, Any]] = None,
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        with self._lock:
+            job = Job(self._next_id, name, script, config, on_done)
+            self._next_id += 1
+            self.jobs.append(job)
+        self.events.put(("queued", job))
+        self._dispatch()
+        return job
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self._dispatch()
+
+    def running(self) -> List[Job]:
+        return [j for j in self.jobs if j.status in (RUNNING, STOPPING)]
+
+    def get(self, jid: int) -> Optional[Job]:
+        return next((j for j in self.jobs if j.id == jid), None)
+
+    def cancel(self, jid: int) -> bool:
+        with self._lock:
+            job = self.get(jid)
+            if job is None or job.status in FINISHED:
+                return False
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished = time.time()
+                self.events.put(("finished", job))
+                return True
+            job.status = STOPPING
+        # 크롤러는 stop 파일을 보고 부분 결과를 저장한 뒤 종료
+        job.stop_file.write_text(str(time.time()), encoding="utf-8")
+        self.events.put(("stopping", job))
+        timer = threading.Timer(CANCEL_GRACE_SEC, self._force_stop, args=(job,))
+        timer.daemon = True
+        timer.start()
+        return True
+
+    def cancel_all(self) -> None:
+        for job in list(self.jobs):
+            self.cancel(job.id)
+
+    def clear_finished(self) -> None:
+        with self._lock:
+            self.jobs = [j for j in self.jobs if j.status not in FINISHED]
+
+    def drain_events(self) -> List[tuple]:
+        out = []
+        try:
+            while True:
+                out.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return out
+
+    # ---------- 실행 ----------
+    def _dispatch(self) -> None:
+        with self._lock:
+            free = self.limit - len(self.running())
+            busy = {j.script for j in self.running()}
+            starting = []
+            for job in self.jobs:
+                if len(starting) >= free:
+                    break
+                if job.status != QUEUED or job.script in busy:
+                    continue  # 같은 스크립트가 실행 중이면 끝날 때까지 대기
+                busy.add(job.script)
+                starting.append(job)
+            for job in starting:
+                job.status = RUNNING
+                job.started = time.time()
+        for job in starting:
+            self.events.put(("started", job))
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job: Job) -> None:
+        env = os.environ.copy()
+        env["PYTHONUTF8"] = "1"
+        env[STOP_ENV] = str(job.stop_file)
+        if job.stop_file.exists() and not job.cancel_requested:
+            job.stop_file.unlink()  # 이전 실행이 남긴 파일
+        try:
+            if job.config is not None:
+                json_codec.write(job.config_file, job.config)
+                env[CONFIG_ENV] = str(job.config_file)
+            job.proc = subprocess.Popen(
+                [sys.executable, str(job.script)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                env=env,
+                cwd=str(self.cwd),
+            )
+            for line in job.proc.stdout:
+                if self.on_output:
+                    self.on_output(job, line)
+            job.proc.wait()
+            with self._lock:
+                job.returncode = job.proc.returncode
+                if job.cancel_requested:
+                    job.status = CANCELLED
+                else:
+                    job.status = DONE if job.returncode == 0 else FAILED
+        except Exception as e:
+            with self._lock:
+                job.status = FAILED
+            if self.on_output:
+                self.on_output(job, f"[ERROR] 실행 중 예외: {e}\n")
+        finally:
+            with self._lock:
+                job.finished = time.time()
+            if job.stop_file.exists():
+                job.stop_file.unlink()
+            self.events.put(("finished", job))
+            self._dispatch()
+
+    def _force_stop(self, job: Job) -> None:
+        with self._lock:
+            proc = job.proc if job.status == STOPPING else None
+        if proc is None or proc.poll() is not None:
+            return
+        if self.on_output:
+            self.on_output(job, f"[WARN] {CANCEL_GRACE_SEC}s 안에 종료되지 않아 강제 종료합니다\n")
+        proc.terminate()
+        try:
+            proc.wait(timeout=KILL_WAIT_SEC)
+        except subprocess.TimeoutExpired:
+            if self.on_output:
+                self.on_output(job, f"[WARN] terminate 후 {KILL_WAIT_SEC}s 지나도 살아 있어 kill 합니다\n")
+            proc.kill()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 코덱 계층 (스냅샷/설정/인덱스 읽기·쓰기 공통)
+- orjson → msgspec → 표준 json 순서로 설치된 것을 사용 (CRAWL_JSON_CODEC=json|orjson|msgspec 로 강제 가능)
+- 출력 형식은 백엔드와 상관없이 같음: UTF-8, 한글 그대로(ensure_ascii=False), indent=True 면 들여쓰기 2칸, 아니면 공백 없는 한 줄
+- read()/write(): 파일은 바이트로 읽고 써서 str 변환을 한 번 줄임, write(atomic=True) 는 임시 파일 후 교체
+- read_snapshot(): 스냅샷 → records.Place 목록
+  msgspec 이 있으면 스키마 Struct 로 바로 타입 디코딩(중간 dict 없음), 없으면 dict 로 읽은 뒤 Place.from_dict
+사용법:
+  python json_codec.py bench [파일 ...]     # 설치된 백엔드별 encode/decode 처리량 (기본: scrape_results + last_result.json)
+  python json_codec.py check [파일 ...]     # msgspec typed 디코딩이 Place.from_dict 와 같은지 실제 스냅샷으로 확인
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+try:
+    import msgspec
+except ImportError:  # 선택 의존성
+    msgspec = None
+
+BASE_DIR = Path(__file__).parent.resolve()
+CODEC_ENV = "CRAWL_JSON_CODEC"
+
+
+class _Stdlib:
+    name = "json"
+    DecodeError: Tuple[type, ...] = (ValueError,)
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    @staticmethod
+    def dumpb(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Orjson:
+    name = "orjson"
+    DecodeError: Tuple[type, ...] = (ValueError,)  # orjson.JSONDecodeError 는 ValueError 하위
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    @staticmethod
+    def dumpb(obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+class _Msgspec:
+    name = "msgspec"
+
+    def __init__(self):
+        self.DecodeError = (ValueError, msgspec.DecodeError)
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumpb(self, obj: Any, indent: bool = False) -> bytes:
+        buf = self._encoder.encode(obj)
+        return msgspec.json.format(buf, indent=2) if indent else buf
+
+
+def _available() -> Dict[str, Callable[[], Any]]:
+    out: Dict[str, Callable[[], Any]] = {}
+    if orjson is not None:
+        out["orjson"] = _Orjson
+    if msgspec is not None:
+        out["msgspec"] = _Msgspec
+    out["json"] = _Stdlib
+    return out
+
+
+def _select(name: str = "") -> Any:
+    backends = _available()
+    if name and name not in backends:
+        print(f"[WARN] JSON codec '{name}' not installed, using {next(iter(backends))}")
+    factory = backends.get(name) or next(iter(backends.values()))
+    return factory()
+
+
+CODEC = _select(os.environ.get(CODEC_ENV, ""))
+BACKEND = CODEC.name
+DecodeError = CODEC.DecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return CODEC.loads(data)
+
+
+def dumpb(obj: Any, indent: bool = False) -> bytes:
+    return CODEC.dumpb(obj, indent)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    return CODEC.dumpb(obj, indent).decode("utf-8")
+
+
+def read(path: Path) -> Any:
+    return CODEC.loads(Path(path).read_bytes())
+
+
+def write(path: Path, obj: Any, indent: bool = True, atomic: bool = False) -> None:
+    path = Path(path)
+    data = CODEC.dumpb(obj, indent)
+    if not atomic:
+        path.write_bytes(data)
+        return
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+# ---------- 스냅샷 → Place ----------
+if msgspec is not None:
+    # 기존 스냅샷에는 null 인 필드가 있음 (keyword_id/fallback 등) → 모두 Optional, _place 에서 정규화
+    class _KeywordStruct(msgspec.Struct):
+        keyword: Optional[str] = None
+        keyword_code: Optional[str] = None
+        keyword_id: Optional[int] = None
+        count: Union[int, str, None] = None
+
+    class _PlaceStruct(msgspec.Struct):
+        id: Optional[str] = None
+        name: Optional[str] = None
+        categoryCode: Optional[str] = None
+        category: Optional[List[str]] = None
+        algorithm_type: Optional[str] = None
+        keywords: Optional[List[_KeywordStruct]] = None
+        fallback: Optional[str] = None
+
+    class _SnapshotStruct(msgspec.Struct):
+        timestamp: Optional[int] = None
+        records: Optional[List[_PlaceStruct]] = None
+        fallback_records: Optional[List[_PlaceStruct]] = None
+
+    _SNAPSHOT_DECODER = msgspec.json.Decoder(_SnapshotStruct)
+
+    def _count(value: Any) -> int:
+        try:
+            return int(value or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _place(p: "_PlaceStruct"):
+        from records import KeywordCount, Place
+        kws = tuple(KeywordCount(sys.intern(k.keyword or ""), sys.intern(k.keyword_code or ""), k.keyword_id or 0,
+                                 _count(k.count)) for k in p.keywords or ())
+        return Place(p.id or "", p.name or "", sys.intern(p.categoryCode or ""),
+                     tuple(sys.intern(c) for c in p.category or ()), sys.intern(p.algorithm_type or ""), kws,
+                     p.fallback or "")
+
+
+def read_snapshot(path: Path, typed: bool = True) -> Tuple[Optional[int], List[Any], List[Any]]:
+    """
+    스냅샷 파일 → (timestamp, records, fallback_records).
+    msgspec 이 설치돼 있으면 (CODEC 과 무관하게) 스키마로 바로 디코딩 (스키마 밖의 키는 버림),
+    그 외에는 dict 로 읽고 Place.from_dict (모르는 키는 Place.extra 에 보존).
+    """
+    from records import Place  # records → keyword_dict → json_codec 순환 import 방지
+    raw = Path(path).read_bytes()
+    if typed and msgspec is not None:
+        snap = _SNAPSHOT_DECODER.decode(raw)
+        return (snap.timestamp, [_place(p) for p in snap.records or ()],
+                [_place(p) for p in snap.fallback_records or ()])
+    data = CODEC.loads(raw)
+    return (data.get("timestamp"), [Place.from_dict(r) for r in data.get("records") or ()],
+            [Place.from_dict(r) for r in data.get("fallback_records") or ()])
+
+
+def _fields(place: Any) -> Tuple:
+    # extra 는 typed 경로에서 버려지므로 비교에서 제외
+    return (place.id, place.name, place.category_code, place.category, place.algorithm_type,
+            tuple((k.keyword, k.keyword_code, k.keyword_id, k.count) for k in place.keywords), place.fallback)
+
+
+def check(paths: List[Path]) -> int:
+    """스냅샷마다 typed 디코딩과 dict → Place.from_dict 결과가 같은지 확인 → 실패한 파일 수"""
+    if msgspec is None:
+        print("[WARN] msgspec not installed — typed decoding path not available, nothing to check")
+        return 0
+    failed = 0
+    for path in paths:
+        try:
+            typed = read_snapshot(path, typed=True)
+            plain = read_snapshot(path, typed=False)
+        except Exception as e:
+            print(f"[ERROR] {path.name}: {type(e).__name__}: {e}")
+            failed += 1
+            continue
+        same = typed[0] == plain[0] and all(
+            [_fields(p) for p in a] == [_fields(p) for p in b] for a, b in zip(typed[1:], plain[1:]))
+        if not same:
+            print(f"[ERROR] {path.name}: typed decoding differs from Place.from_dict")
+            failed += 1
+    print(f"[INFO] checked {len(paths)} snapshot(s), {failed} failed")
+    return failed
+
+
+# ---------- 벤치마크 ----------
+def bench(paths: List[Path], repeat: int = 5) -> None:
+    blobs = [(p, p.read_bytes()) for p in paths if p.exists()]
+    total = sum(len(b) for _, b in blobs)
+    if not total:
+        print("[WARN] no files to benchmark")
+        return
+    print(f"[INFO] {len(blobs)} file(s), {total / 1024:.0f} KB, x{repeat}")
+    for name, factory in _available().items():
+        codec = factory()
+        objs = [codec.loads(b) for _, b in blobs]
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for _, b in blobs:
+                codec.loads(b)
+        dec = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for obj in objs:
+                codec.dumpb(obj, indent=True)
+        enc = time.perf_counter() - t0
+        mb = total * repeat / 2 ** 20
+        print(f"[BENCH] {name:8s} decode {mb / dec:8.1f} MB/s   encode(indent) {mb / enc:8.1f} MB/s")
+    if orjson is None and msgspec is None:
+        print("[INFO] orjson / msgspec not installed — only the stdlib backend was measured")
+
+
+def _snapshot_files() -> List[Path]:
+    return sorted((BASE_DIR / "scrape_results").glob("*.json")) + [BASE_DIR / "last_result.json"]
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == "bench":
+        paths = [Path(a) for a in args[1:]]
+        bench(paths or _snapshot_files())
+    elif args and args[0] == "check":
+        paths = [Path(a) for a in args[1:]] or _snapshot_files()
+        sys.exit(1 if check([p for p in paths if p.exists()]) else 0)
+    else:
+        print(f"[INFO] JSON codec: {BACKEND} (available: {', '.join(_available())})")
+
+
+if __name__ == "__main__":
+    main()
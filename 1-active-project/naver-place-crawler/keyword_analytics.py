@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+수집 이력 컬럼형 분석 (분석용 CLI)
+- scrape_results/*.json 을 한 번만 읽어 out/analytics/ 에 컬럼 파일로 저장 (새 스냅샷만 뒤에 덧붙임)
+  · 행 단위: ts.q / biz.i / kw.i / cnt.i  (스냅샷 × 업체 × 키워드 한 행, 원시 바이너리 배열)
+  · 업체 단위: cat.i / algo.i (업체의 마지막 category_path / algorithm_type 번호)
+  · 문자열 차원(업체 id·이름, 카테고리, 알고리즘, 키워드)은 meta.json
+- 조회 시 컬럼 파일을 mmap 으로 열어 CHUNK_ROWS 행씩 처리 → 이력이 RAM 보다 커도 동작
+- numpy 가 설치돼 있으면 bincount / ufunc.at 으로 벡터 연산, 없으면 표준 라이브러리 array + memoryview 로 같은 계산
+  (결과는 동일, 속도만 차이)
+- 조회: 카테고리별 상위 키워드, algorithm_type 별 키워드 비중, 키워드 구성이 가장 많이 바뀐 업체
+  기본은 업체마다 가장 최근 스냅샷만 집계 (--all: 전체 스냅샷 합)
+사용법:
+  python keyword_analytics.py build [--rebuild]
+  python keyword_analytics.py top [N] [카테고리 일부] [--all]
+  python keyword_analytics.py share [N] [--all]
+  python keyword_analytics.py changes [N]
+  python keyword_analytics.py bench [행 수=1000000]      # 합성 데이터로 백엔드별 시간 측정
+  (--stdlib: numpy 가 있어도 표준 라이브러리 경로 사용)
+"""
+import mmap
+import random
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성
+    np = None
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent.resolve()
+DATA_DIR = BASE_DIR / "scrape_results"
+STORE_DIR = BASE_DIR / "out" / "analytics"
+CHUNK_ROWS = 1 << 20
+ROW_COLUMNS = {"ts": "q", "biz": "i", "kw": "i", "cnt": "i"}
+BIZ_COLUMNS = {"cat": "i", "algo": "i"}
+NP_TYPES = {"q": "int64", "i": "int32"}
+BINCOUNT_MAX = 1 << 26  # 그룹 × 키워드 칸 수가 이보다 크면 np.unique 로 압축
+
+
+class ColumnStore:
+    """컬럼 파일 + 문자열 차원. append_* 로 쌓고 save() 로 meta/업체 컬럼 기록."""
+
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = Path(root)
+        self.sources: List[str] = []
+        self.businesses: List[str] = []
+        self.names: List[str] = []
+        self.categories: List[str] = []
+        self.algorithms: List[str] = []
+        self.keywords: List[str] = []
+        self.rows = 0
+        self.biz_cols = {name: array(code) for name, code in BIZ_COLUMNS.items()}
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    # ---------- 저장 ----------
+    def _load(self) -> None:
+        meta_path = self.root / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json_codec.read(meta_path)
+                for key in ("sources", "businesses", "names", "categories", "algorithms", "keywords"):
+                    setattr(self, key, meta.get(key, []))
+                self.rows = meta.get("rows", 0)
+                for name, code in BIZ_COLUMNS.items():
+                    self.biz_cols[name] = array(code, (self.root / f"{name}.{code}").read_bytes())
+                self._truncate_rows()
+            except Exception as e:
+                print(f"[WARN] analytics store unreadable, rebuilding: {e}")
+                self.clear()
+        else:
+            self._truncate_rows()  # meta 를 한 번도 못 쓴 채 중단된 build 의 행 제거
+        for key in ("businesses", "categories", "algorithms", "keywords"):
+            self._ids[key] = {v: i for i, v in enumerate(getattr(self, key))}
+
+    def _truncate_rows(self) -> None:
+        """
+        행 컬럼은 스냅샷마다 파일에 덧붙이고 meta(rows/sources)는 build 끝에 쓰므로, 중단된 build 는
+        meta.rows 뒤에 고아 행을 남김 → 모든 행 컬럼을 meta.rows 길이로 잘라 컬럼끼리 다시 맞춤
+        """
+        for name, code in ROW_COLUMNS.items():
+            path = self.root / f"{name}.{code}"
+            want = self.rows * array(code).itemsize
+            size = path.stat().st_size if path.exists() else 0
+            if size < want:
+                raise ValueError(f"column {path.name} has {size} bytes, meta expects {want}")
+            if size > want:
+                print(f"[WARN] analytics: dropping {size - want} orphan bytes from {path.name} (interrupted build)")
+                with open(path, "r+b") as f:
+                    f.truncate(want)
+
+    def clear(self) -> None:
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self.sources, self.businesses, self.names = [], [], []
+        self.categories, self.algorithms, self.keywords = [], [], []
+        self.rows = 0
+        self.biz_cols = {name: array(code) for name, code in BIZ_COLUMNS.items()}
+        self._ids = {key: {} for key in ("businesses", "categories", "algorithms", "keywords")}
+
+    def _id(self, dim: str, value: str) -> int:
+        ids = self._ids[dim]
+        i = ids.get(value)
+        if i is None:
+            values = getattr(self, dim)
+            i = ids[value] = len(values)
+            values.append(value)
+        return i
+
+    def _business(self, biz: str, name: str, category: str, algo: str) -> int:
+        b = self._id("businesses", biz)
+        cat, alg = self._id("categories", category), self._id("algorithms", algo)
+        if b == len(self.names):
+            self.names.append(name)
+            self.biz_cols["cat"].append(cat)
+            self.biz_cols["algo"].append(alg)
+        else:  # 최신 스냅샷의 분류로 갱신
+            self.names[b] = name or self.names[b]
+            self.biz_cols["cat"][b] = cat
+            self.biz_cols["algo"][b] = alg
+        return b
+
+    def append_rows(self, cols: Dict[str, array]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        for name, code in ROW_COLUMNS.items():
+            with open(self.root / f"{name}.{code}", "ab") as f:
+                cols[name].tofile(f)
+        self.rows += len(cols["ts"])
+
+    def append_snapshot(self, ts: int, records: Iterable[Dict[str, Any]], source: str = "") -> int:
+        cols = {name: array(code) for name, code in ROW_COLUMNS.items()}
+        for rec in records:
+            biz = rec.get("id") or rec.get("name")
+            if not biz:
+                continue
+            b = self._business(biz, rec.get("name", ""), ",".join(rec.get("category", [])),
+                               rec.get("algorithm_type", "") or "")
+            for kw in rec.get("keywords", []):
+                try:
+                    cnt = int(kw.get("count", 0))
+                except (TypeError, ValueError):
+                    continue
+                cols["ts"].append(ts)
+                cols["biz"].append(b)
+                cols["kw"].append(self._id("keywords", kw.get("keyword", "")))
+                cols["cnt"].append(cnt)
+        self.append_rows(cols)
+        if source:
+            self.sources.append(source)
+        return len(cols["ts"])
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        for name, code in BIZ_COLUMNS.items():
+            with open(self.root / f"{name}.{code}", "wb") as f:
+                self.biz_cols[name].tofile(f)
+        meta = {key: getattr(self, key) for key in
+                ("sources", "businesses", "names", "categories", "algorithms", "keywords", "rows")}
+        json_codec.write(self.root / "meta.json", meta, indent=False, atomic=True)
+
+    def build(self, data_dir: Path = DATA_DIR) -> int:
+        """아직 반영하지 않은 스냅샷만 시간 순으로 덧붙임 → 추가된 파일 수"""
+        done = set(self.sources)
+        paths = sorted((p for p in Path(data_dir).glob("*.json") if p.name not in done),
+                       key=lambda p: (int(p.stem), "") if p.stem.isdigit() else (2 ** 62, p.name))
+        added = 0
+        for path in paths:
+            try:
+                data = json_codec.read(path)
+            except Exception as e:
+                print(f"[WARN] analytics: cannot read {path.name}: {e}")
+                continue
+            ts = data.get("timestamp") or (int(path.stem) if path.stem.isdigit() else 0)
+            self.append_snapshot(int(ts), data.get("records", []), path.name)
+            added += 1
+        if added:
+            self.save()
+        return added
+
+    # ---------- 읽기 ----------
+    def open_columns(self, use_numpy: bool) -> Dict[str, Any]:
+        """행 컬럼을 mmap 으로 열어 numpy 배열 또는 memoryview 로 반환 (복사 없음)"""
+        cols: Dict[str, Any] = {}
+        self._maps = []
+        for name, code in ROW_COLUMNS.items():
+            path = self.root / f"{name}.{code}"
+            if not self.rows or not path.exists():
+                cols[name] = np.zeros(0, dtype=NP_TYPES[code]) if use_numpy else array(code)
+                continue
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            if use_numpy:
+                cols[name] = np.frombuffer(mm, dtype=NP_TYPES[code], count=self.rows)
+            else:
+                cols[name] = memoryview(mm).cast(code)[:self.rows]
+        for name, code in BIZ_COLUMNS.items():
+            cols[name] = np.asarray(self.biz_cols[name], dtype=NP_TYPES[code]) if use_numpy else self.biz_cols[name]
+        return cols
+
+
+class Analytics:
+    def __init__(self, store: ColumnStore, use_numpy: Optional[bool] = None):
+        self.store = store
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self.cols = store.open_columns(self.use_numpy)
+        self.backend = "numpy" if self.use_numpy else "stdlib"
+
+    def _chunks(self, names: Tuple[str, ...]):
+        n = self.store.rows
+        for lo in range(0, n, CHUNK_ROWS):
+            hi = min(n, lo + CHUNK_ROWS)
+            yield tuple(self.cols[name][lo:hi] for name in names)
+
+    # ---------- 업체별 첫/마지막 스냅샷 ----------
+    def _ts_bounds(self):
+        """업체별 (최초 ts, 최근 ts)"""
+        nb = len(self.store.businesses)
+        if self.use_numpy:
+            first = np.full(nb, np.iinfo(np.int64).max, dtype=np.int64)
+            last = np.full(nb, np.iinfo(np.int64).min, dtype=np.int64)
+            for ts, biz in self._chunks(("ts", "biz")):
+                np.minimum.at(first, biz, ts)
+                np.maximum.at(last, biz, ts)
+            return first, last
+        first = array("q", [2 ** 63 - 1]) * nb
+        last = array("q", [-2 ** 63]) * nb
+        for ts, biz in self._chunks(("ts", "biz")):
+            for t, b in zip(ts, biz):
+                if t < first[b]:
+                    first[b] = t
+                if t > last[b]:
+                    last[b] = t
+        return first, last
+
+    def _group_sums(self, group_col: str, n_groups: int, latest_only: bool):
+        """(그룹, 키워드) 별 cnt 합 — 길이 n_groups × 키워드 수의 1차원 배열"""
+        nk = len(self.store.keywords)
+        group = self.cols[group_col]
+        last = self._ts_bounds()[1] if latest_only else None
+        if self.use_numpy:
+            size = n_groups * nk
+            acc = np.zeros(size, dtype=np.int64)
+            for ts, biz, kw, cnt in self._chunks(("ts", "biz", "kw", "cnt")):
+                if last is not None:
+                    m = ts == last[biz]
+                    biz, kw, cnt = biz[m], kw[m], cnt[m]
+                key = group[biz].astype(np.int64) * nk + kw
+                if size <= BINCOUNT_MAX:
+                    acc += np.bincount(key, weights=cnt, minlength=size).astype(np.int64)
+                else:
+                    uniq, inv = np.unique(key, return_inverse=True)
+                    acc[uniq] += np.bincount(inv, weights=cnt).astype(np.int64)
+            return acc
+        acc = array("q", [0]) * (n_groups * nk)
+        for ts, biz, kw, cnt in self._chunks(("ts", "biz", "kw", "cnt")):
+            if last is None:
+                for b, k, c in zip(biz, kw, cnt):
+                    acc[group[b] * nk + k] += c
+            else:
+                for t, b, k, c in zip(ts, biz, kw, cnt):
+                    if t == last[b]:
+                        acc[group[b] * nk + k] += c
+        return acc
+
+    def _top_per_group(self, acc, labels: List[str], n: int, share: bool):
+        nk = len(self.store.keywords)
+        out: Dict[str, List[Tuple[str, float]]] = {}
+        for g, label in enumerate(labels):
+            row = acc[g * nk:(g + 1) * nk]
+            total = int(row.sum()) if self.use_numpy else sum(row)
+            if not total:
+                continue
+            if self.use_numpy:
+                k = min(n, nk)
+                # argpartition 은 동점을 임의로 자르므로 k 번째 값과 같은 항목을 모두 후보에 넣고
+                # (-count, index) 로 정렬해 자름 → 표준 라이브러리 경로와 같은 결과
+                kth = row[np.argpartition(-row, k - 1)[k - 1]]
+                idx = np.flatnonzero(row >= kth)
+                idx = idx[np.lexsort((idx, -row[idx]))][:k]
+                top = [(int(i), int(row[i])) for i in idx if row[i]]
+            else:
+                top = sorted(((i, c) for i, c in enumerate(row) if c), key=lambda x: (-x[1], x[0]))[:n]
+            out[label] = [(self.store.keywords[i], c / total if share else c) for i, c in top]
+        return out
+
+    # ---------- 조회 ----------
+    def top_keywords_by_category(self, n: int = 10, latest_only: bool = True) -> Dict[str, List[Tuple[str, float]]]:
+        acc = self._group_sums("cat", len(self.store.categories), latest_only)
+        return self._top_per_group(acc, self.store.categories, n, share=False)
+
+    def keyword_share_by_algorithm(self, n: int = 10, latest_only: bool = True) -> Dict[str, List[Tuple[str, float]]]:
+        acc = self._group_sums("algo", len(self.store.algorithms), latest_only)
+        return self._top_per_group(acc, self.store.algorithms, n, share=True)
+
+    def biggest_changes(self, n: int = 20) -> List[Tuple[str, str, int, int, int]]:
+        """
+        최초 스냅샷과 최근 스냅샷 사이 키워드별 |count 차이| 합이 큰 업체
+        → (business_id, 이름, 변화량, 최초 ts, 최근 ts). 스냅샷이 하나뿐인 업체는 제외.
+        """
+        first, last = self._ts_bounds()
+        nk = max(1, len(self.store.keywords))
+        nb = len(self.store.businesses)
+        if self.use_numpy:
+            keys, vals = [], []
+            for ts, biz, kw, cnt in self._chunks(("ts", "biz", "kw", "cnt")):
+                f, l = first[biz], last[biz]
+                m = (f != l) & ((ts == f) | (ts == l))
+                sign = np.where(ts[m] == l[m], 1, -1)
+                keys.append(biz[m].astype(np.int64) * nk + kw[m])
+                vals.append(sign * cnt[m])
+            score = np.zeros(nb, dtype=np.int64)
+            if keys:
+                uniq, inv = np.unique(np.concatenate(keys), return_inverse=True)
+                net = np.bincount(inv, weights=np.concatenate(vals))
+                score = np.bincount(uniq // nk, weights=np.abs(net), minlength=nb).astype(np.int64)
+            order = np.argsort(-score, kind="stable")[:n]
+            picked = [(int(b), int(score[b])) for b in order if score[b] > 0]
+        else:
+            net: Dict[int, int] = {}
+            for ts, biz, kw, cnt in self._chunks(("ts", "biz", "kw", "cnt")):
+                for t, b, k, c in zip(ts, biz, kw, cnt):
+                    f, l = first[b], last[b]
+                    if f == l or (t != f and t != l):
+                        continue
+                    key = b * nk + k
+                    net[key] = net.get(key, 0) + (c if t == l else -c)
+            scores: Dict[int, int] = {}
+            for key, v in net.items():
+                if v:
+                    scores[key // nk] = scores.get(key // nk, 0) + abs(v)
+            picked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:n]
+        return [(self.store.businesses[b], self.store.names[b], s, int(first[b]), int(last[b])) for b, s in picked]
+
+
+# ---------- 합성 벤치마크 ----------
+def synthetic_store(root: Path, rows: int, snapshots: int = 10, businesses: int = 20000,
+                    keywords: int = 300, categories: int = 200, seed: int = 7) -> ColumnStore:
+    rng = random.Random(seed)
+    store = ColumnStore(root)
+    store.clear()
+    store.keywords = [f"키워드{i}" for i in range(keywords)]
+    store.categories = [f"대분류{i // 20},소분류{i}" for i in range(categories)]
+    store.algorithms = ["TYPE_A", "TYPE_B", "TYPE_C", "TYPE_D"]
+    store.businesses = [f"biz{i}" for i in range(businesses)]
+    store.names = [f"가게{i}" for i in range(businesses)]
+    store.biz_cols["cat"] = array("i", (rng.randrange(categories) for _ in range(businesses)))
+    store.biz_cols["algo"] = array("i", (rng.randrange(4) for _ in range(businesses)))
+    per_snapshot = rows // snapshots
+    for s in range(snapshots):
+        cols = {
+            "ts": array("q", [1_700_000_000 + s * 86400]) * per_snapshot,
+            "biz": array("i", (rng.randrange(businesses) for _ in range(per_snapshot))),
+            "kw": array("i", (min(keywords - 1, int(rng.expovariate(0.02))) for _ in range(per_snapshot))),
+            "cnt": array("i", (rng.randrange(1, 200) for _ in range(per_snapshot))),
+        }
+        store.append_rows(cols)
+    store.save()
+    return store
+
+
+def bench(rows: int) -> None:
+    root = Path(tempfile.mkdtemp(prefix="kw_analytics_"))
+    try:
+        t0 = time.perf_counter()
+        synthetic_store(root, rows)
+        print(f"[INFO] synthetic store: {rows} rows ({time.perf_counter() - t0:.1f}s to generate)")
+        backends = [True, False] if np is not None else [False]
+        for use_numpy in backends:
+            an = Analytics(ColumnStore(root), use_numpy)
+            for label, fn in (("top_by_category", lambda: an.top_keywords_by_category(10)),
+                              ("share_by_algorithm", lambda: an.keyword_share_by_algorithm(10)),
+                              ("biggest_changes", lambda: an.biggest_changes(20))):
+                t0 = time.perf_counter()
+                fn()
+                print(f"[BENCH] {an.backend:6s} {label:20s} {(time.perf_counter() - t0) * 1000:8.0f} ms")
+        if np is None:
+            print("[INFO] numpy not installed — only the stdlib backend was measured")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    flags = {a for a in args if a.startswith("--")}
+    args = [a for a in args if not a.startswith("--")]
+    cmd = args[0] if args else "top"
+    n = int(args[1]) if len(args) > 1 and args[1].isdigit() else None
+    if cmd == "bench":
+        bench(n or 1_000_000)
+        return
+    store = ColumnStore()
+    if cmd == "build" or "--rebuild" in flags:
+        if "--rebuild" in flags:
+            store.clear()
+        t0 = time.perf_counter()
+        added = store.build()
+        print(f"[INFO] analytics store: +{added} snapshot(s), {store.rows} rows ({time.perf_counter() - t0:.2f}s)")
+        if cmd == "build":
+            return
+    elif store.build():
+        print(f"[INFO] analytics store updated ({store.rows} rows)")
+    an = Analytics(store, use_numpy=False if "--stdlib" in flags else None)
+    latest_only = "--all" not in flags
+    t0 = time.perf_counter()
+    if cmd == "top":
+        needle = args[2] if len(args) > 2 else ""
+        for cat, items in an.top_keywords_by_category(n or 10, latest_only).items():
+            if needle in cat:
+                print(f"{cat or '-'}\t" + ", ".join(f"{kw}({c})" for kw, c in items))
+    elif cmd == "share":
+        for algo, items in an.keyword_share_by_algorithm(n or 10, latest_only).items():
+            print(f"{algo or '-'}\t" + ", ".join(f"{kw} {s:.1%}" for kw, s in items))
+    elif cmd == "changes":
+        for biz, name, score, first, last in an.biggest_changes(n or 20):
+            print(f"{biz}\t{name}\t{score}\t{first} -> {last}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+    print(f"[INFO] {cmd}: {an.backend} backend, {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링 결과 로컬 SQLite 미러 (GUI 키워드맵 창용)
+- last_result.json (init_master_data.sql 과 같은 실행 결과)을 out/keyword_map.db 로 옮겨 둠
+  · place(business_id, name, category_code, category_path, algorithm_type)
+  · keyword_row(id, business_id, keyword, keyword_code, cnt)
+  · keyword_fts: keyword 컬럼 FTS5(trigram) 인덱스 → 부분 문자열 검색
+- 원본 파일의 mtime/크기가 같으면 다시 적재하지 않음
+- query(): 검색어 + 묶음 기준(keyword/business/category/row) + LIMIT/OFFSET 페이지 조회
+  검색어가 3글자 미만이거나 FTS5 를 쓸 수 없으면 keyword LIKE 'x%' (인덱스 사용)로 대체
+사용법:
+  python keyword_db.py               # 미러 동기화 후 상위 20 키워드
+  python keyword_db.py 맛있 business # 검색 + 묶음 기준
+"""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent.resolve()
+LAST_JSON = BASE_DIR / "last_result.json"
+DB_FILE = BASE_DIR / "out" / "keyword_map.db"
+FTS_MIN_CHARS = 3  # trigram 토크나이저는 3글자 이상부터 매치
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS place (
+    business_id TEXT PRIMARY KEY, name TEXT, category_code TEXT, category_path TEXT, algorithm_type TEXT);
+CREATE TABLE IF NOT EXISTS keyword_row (
+    id INTEGER PRIMARY KEY, business_id TEXT, keyword TEXT, keyword_code TEXT, cnt INTEGER DEFAULT 0);
+CREATE INDEX IF NOT EXISTS idx_keyword_row_keyword ON keyword_row(keyword);
+CREATE INDEX IF NOT EXISTS idx_keyword_row_business ON keyword_row(business_id);
+"""
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS keyword_fts USING fts5(
+    keyword, content='keyword_row', content_rowid='id', tokenize='trigram');
+"""
+
+# 묶음 기준별 SELECT (컬럼 제목, SQL). {where} 자리에 검색 조건이 들어감
+GROUPINGS = {
+    "keyword": (
+        ("keyword", "count", "places"),
+        "SELECT k.keyword, SUM(k.cnt), COUNT(DISTINCT k.business_id) FROM keyword_row k {where} "
+        "GROUP BY k.keyword ORDER BY 2 DESC, 1",
+    ),
+    "business": (
+        ("business", "count", "keywords"),
+        "SELECT COALESCE(p.name, k.business_id), SUM(k.cnt), COUNT(*) FROM keyword_row k "
+        "LEFT JOIN place p ON p.business_id = k.business_id {where} "
+        "GROUP BY k.business_id ORDER BY 2 DESC, 1",
+    ),
+    "category": (
+        ("category", "count", "places"),
+        "SELECT COALESCE(NULLIF(p.category_path, ''), '-'), SUM(k.cnt), COUNT(DISTINCT k.business_id) "
+        "FROM keyword_row k LEFT JOIN place p ON p.business_id = k.business_id {where} "
+        "GROUP BY 1 ORDER BY 2 DESC, 1",
+    ),
+    "row": (
+        ("business", "keyword", "count"),
+        "SELECT COALESCE(p.name, k.business_id), k.keyword, k.cnt FROM keyword_row k "
+        "LEFT JOIN place p ON p.business_id = k.business_id {where} ORDER BY k.cnt DESC, k.id",
+    ),
+}
+
+
+def connect(db_path: Path = DB_FILE) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        print(f"[WARN] FTS5 unavailable, keyword search falls back to LIKE: {e}")
+    return conn
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'keyword_fts'").fetchone()
+    return row is not None
+
+
+def sync(conn: sqlite3.Connection, source: Path = LAST_JSON) -> bool:
+    """source 가 바뀌었으면 미러를 다시 채움. 다시 채웠으면 True."""
+    source = Path(source)
+    if not source.exists():
+        return False
+    st = source.stat()
+    stamp = f"{source.name}:{st.st_mtime_ns}:{st.st_size}"
+    row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+    if row and row[0] == stamp:
+        return False
+    t0 = time.perf_counter()
+    try:
+        data = json_codec.read(source)
+    except Exception as e:
+        print(f"[WARN] keyword db: cannot read {source.name}: {e}")
+        return False
+    places = []
+    rows = []
+    for rec in data.get("records", []):
+        biz = rec.get("id") or rec.get("name") or ""
+        places.append((biz, rec.get("name", ""), rec.get("categoryCode", ""),
+                       ",".join(rec.get("category", [])), rec.get("algorithm_type", "")))
+        for kw in rec.get("keywords", []):
+            if not kw.get("keyword"):
+                continue
+            try:
+                cnt = int(kw.get("count", 0))
+            except (TypeError, ValueError):
+                cnt = 0
+            rows.append((biz, kw["keyword"], kw.get("keyword_code", ""), cnt))
+    with conn:
+        conn.execute("DELETE FROM place")
+        conn.execute("DELETE FROM keyword_row")
+        # init_master_data.sql 의 INSERT IGNORE 와 같은 규칙: 같은 업체는 처음 것만
+        conn.executemany("INSERT OR IGNORE INTO place VALUES (?, ?, ?, ?, ?)", places)
+        conn.executemany("INSERT INTO keyword_row (business_id, keyword, keyword_code, cnt) VALUES (?, ?, ?, ?)", rows)
+        if has_fts(conn):
+            conn.execute("INSERT INTO keyword_fts(keyword_fts) VALUES ('rebuild')")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (stamp,))
+    print(f"[INFO] keyword db: loaded {len(places)} places / {len(rows)} keyword rows "
+          f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return True
+
+
+def _where(conn: sqlite3.Connection, text: str) -> Tuple[str, list]:
+    text = text.strip()
+    if not text:
+        return "", []
+    if len(text) >= FTS_MIN_CHARS and has_fts(conn):
+        phrase = '"' + text.replace('"', '""') + '"'
+        return "WHERE k.id IN (SELECT rowid FROM keyword_fts WHERE keyword_fts MATCH ?)", [phrase]
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return "WHERE k.keyword LIKE ? ESCAPE '\\'", [escaped + "%"]
+
+
+def columns(group_by: str) -> Tuple[str, ...]:
+    return GROUPINGS[group_by][0]
+
+
+def count(conn: sqlite3.Connection, text: str = "", group_by: str = "keyword") -> int:
+    where, params = _where(conn, text)
+    sql = GROUPINGS[group_by][1].format(where=where)
+    return conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+
+def query(conn: sqlite3.Connection, text: str = "", group_by: str = "keyword",
+          offset: int = 0, limit: int = 200) -> List[tuple]:
+    where, params = _where(conn, text)
+    sql = GROUPINGS[group_by][1].format(where=where) + " LIMIT ? OFFSET ?"
+    return conn.execute(sql, params + [limit, offset]).fetchall()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    text = args[0] if args else ""
+    group_by = args[1] if len(args) > 1 else "keyword"
+    conn = connect()
+    sync(conn)
+    print("\t".join(columns(group_by)))
+    for row in query(conn, text, group_by, limit=20):
+        print("\t".join(str(v) for v in row))
+    print(f"[INFO] {count(conn, text, group_by)} {group_by} row(s)")
+
+
+if __name__ == "__main__":
+    main()
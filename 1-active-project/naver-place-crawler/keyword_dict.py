@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+방문자 리뷰 키워드 사전 (keyword, keyword_code) ↔ 정수 keyword_id
+- 같은 몇 백 개 키워드("친절해요", "청결해요" ...)가 모든 업체에 반복되므로 문자열은 한 번만 보관
+- intern() 은 항상 같은 str 객체를 돌려줌 → 수집 중 메모리에 올라간 레코드도 문자열을 공유
+- id 는 out/keyword_dictionary.json 에 저장해 실행 간 유지 (SQL 의 keywords 차원 테이블 id 와 동일)
+  예전 위치(프로젝트 루트)의 파일은 처음 load() 때 out/ 으로 옮김
+- 새 키워드는 intern() 때 메모리에서만 임시 id 를 받고, save() 가 파일 잠금 안에서 파일을 다시 읽어 합친 뒤
+  한 번에 저장 (키워드마다 파일 전체를 다시 쓰지 않음). 그사이 다른 프로세스가 같은 번호를 먼저 저장했으면
+  이쪽의 새 항목은 그 뒤 번호로 밀림 → 레코드에 붙은 id 는 save() 뒤에 records.refresh_keyword_ids 로 다시 맞춤
+  (exporter 는 항상 사전에서 id 를 다시 찾으므로 save() 뒤에 내보내면 됨). path=None 이면 메모리 전용
+"""
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import json_codec
+from file_lock import FileLock
+
+BASE_DIR = Path(__file__).parent.resolve()
+DICT_FILE = BASE_DIR / "out" / "keyword_dictionary.json"
+LEGACY_DICT_FILE = BASE_DIR / "keyword_dictionary.json"
+
+
+class KeywordDictionary:
+    def __init__(self, path: Optional[Path] = DICT_FILE):
+        self.path = Path(path) if path is not None else None
+        self.entries: List[Tuple[str, str]] = []        # keyword_id - 1 → (keyword, keyword_code)
+        self.ids: Dict[Tuple[str, str], int] = {}
+        self._saved = 0  # entries[:_saved] 은 파일과 같은 id, 뒤쪽은 아직 저장 안 한 임시 id
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = DICT_FILE) -> "KeywordDictionary":
+        d = cls(path)
+        if d.path == DICT_FILE and not DICT_FILE.exists() and LEGACY_DICT_FILE.exists():
+            with d._file_lock():
+                if not DICT_FILE.exists() and LEGACY_DICT_FILE.exists():
+                    LEGACY_DICT_FILE.replace(DICT_FILE)
+                    print(f"[INFO] keyword dictionary moved -> {DICT_FILE}")
+        try:
+            d._merge_file()
+        except Exception as e:
+            print(f"[WARN] keyword dictionary unreadable ({d.path.name}), starting fresh: {e}")
+            d.entries, d.ids = [], {}
+        d._saved = len(d.entries)
+        return d
+
+    def _file_lock(self) -> FileLock:
+        return FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    def _merge_file(self) -> None:
+        """파일에 있고 메모리에 없는 (다른 프로세스가 발급한) id 를 뒤에 이어 붙임"""
+        if self.path is None or not self.path.exists():
+            return
+        rows: List[Dict[str, Any]] = json_codec.read(self.path).get("keywords", [])
+        for row in sorted(rows, key=lambda r: r["id"]):
+            kid, key = row["id"], (row["keyword"], row.get("keyword_code", ""))
+            if kid > len(self.entries):
+                self._add(key[0], key[1], expected_id=kid)
+            elif self.entries[kid - 1] != key:
+                raise ValueError(f"keyword id {kid} is {key} in {self.path.name} "
+                                 f"but {self.entries[kid - 1]} in memory")
+
+    def _add(self, keyword: str, code: str, expected_id: Optional[int] = None) -> int:
+        keyword = sys.intern(keyword)
+        code = sys.intern(code)
+        kid = len(self.entries) + 1
+        if expected_id is not None and expected_id != kid:
+            raise ValueError(f"keyword ids must be contiguous (got {expected_id}, expected {kid})")
+        self.entries.append((keyword, code))
+        self.ids[(keyword, code)] = kid
+        return kid
+
+    def intern(self, keyword: str, code: str = "") -> int:
+        kid = self.ids.get((keyword, code))
+        if kid is not None:
+            return kid
+        with self._lock:
+            kid = self.ids.get((keyword, code))
+            if kid is None:
+                kid = self._add(keyword, code)  # 임시 id — save() 때 확정
+            return kid
+
+    def keyword(self, kid: int) -> str:
+        return self.entries[kid - 1][0]
+
+    def code(self, kid: int) -> str:
+        return self.entries[kid - 1][1]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Tuple[int, str, str]]:
+        for i, (keyword, code) in enumerate(self.entries, start=1):
+            yield i, keyword, code
+
+    def _write(self) -> None:
+        payload = {"keywords": [{"id": i, "keyword": k, "keyword_code": c} for i, k, c in self]}
+        json_codec.write(self.path, payload, atomic=True)
+
+    def save(self) -> bool:
+        """
+        파일 잠금 안에서 다른 프로세스가 저장한 항목을 먼저 합치고, 아직 없는 새 키워드만 그 뒤 번호로 붙여 한 번 씀.
+        이 프로세스의 임시 id 가 하나라도 바뀌었으면 True (레코드의 id 를 다시 맞춰야 함).
+        """
+        if self.path is None:
+            return False
+        with self._lock:
+            if self._saved == len(self.entries) and self.path.exists():
+                return False
+            entries, ids = list(self.entries), dict(self.ids)
+            pending = self.entries[self._saved:]
+            with self._file_lock():
+                try:
+                    del self.entries[self._saved:]
+                    for key in pending:
+                        del self.ids[key]
+                    self._merge_file()
+                except Exception:
+                    self.entries, self.ids = entries, ids
+                    raise
+                for key in pending:
+                    if key not in self.ids:
+                        self._add(*key)
+                self._write()
+            self._saved = len(self.entries)
+            return any(self.ids[key] != ids[key] for key in pending)
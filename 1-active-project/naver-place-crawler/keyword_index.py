@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+누적 키워드맵 증분 인덱스 (gui.py 히스토리 패널용)
+- scrape_results/*.json 과 last_result.json 을 파일 이름 + mtime + 크기로 기록해 두고
+  새로 생기거나 바뀐 파일만 파싱, 삭제된 파일은 기여분을 빼서 합계를 유지
+- last_result.json 은 보통 scrape_results/<timestamp>.json 의 사본 → 같은 timestamp 파일이 있으면 합계에서 제외
+- 합계는 out/keyword_map_index.json 에 저장 → GUI 재시작 후에도 파싱 없이 바로 상위 N 개 조회
+사용법:
+  python keyword_index.py          # 인덱스 갱신 후 상위 30 출력
+  python keyword_index.py --rebuild
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent.resolve()
+DATA_DIR = BASE_DIR / "scrape_results"
+LAST_JSON = BASE_DIR / "last_result.json"
+INDEX_FILE = BASE_DIR / "out" / "keyword_map_index.json"
+INDEX_VERSION = 1
+
+
+def count_keywords(path: Path) -> Tuple[Optional[int], Dict[str, int]]:
+    """스냅샷 하나의 (timestamp, 키워드별 count 합) — 읽기 실패 시 빈 dict"""
+    try:
+        ts, records, _fallback = json_codec.read_snapshot(path)
+    except Exception as e:
+        print(f"[WARN] keyword index: cannot read {path.name}: {e}")
+        return None, {}
+    counts: Dict[str, int] = {}
+    for rec in records:
+        for kw in rec.keywords:
+            if kw.keyword:
+                counts[kw.keyword] = counts.get(kw.keyword, 0) + kw.count  # count 는 디코딩 때 이미 int
+    return ts, counts
+
+
+class KeywordMapIndex:
+    def __init__(self, index_path: Path = INDEX_FILE, data_dir: Path = DATA_DIR, last_json: Path = LAST_JSON):
+        self.index_path = Path(index_path)
+        self.data_dir = Path(data_dir).resolve()
+        self.last_json = Path(last_json).resolve()
+        # name → {"mtime": ns, "size": bytes, "ts": timestamp, "counts": {...}, "included": bool}
+        self.files: Dict[str, Dict] = {}
+        self.totals: Dict[str, int] = {}
+        self._ranked: Optional[List[Tuple[str, int]]] = None
+        self.load()
+
+    def load(self) -> None:
+        if not self.index_path.exists():
+            return
+        try:
+            data = json_codec.read(self.index_path)
+        except Exception as e:
+            print(f"[WARN] keyword index unreadable, rebuilding: {e}")
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.files = data.get("files", {})
+        self.totals = data.get("totals", {})
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": INDEX_VERSION, "files": self.files, "totals": self.totals}
+        json_codec.write(self.index_path, payload, indent=False, atomic=True)
+
+    def clear(self) -> None:
+        self.files = {}
+        self.totals = {}
+        self._ranked = None
+
+    def _apply(self, counts: Dict[str, int], sign: int) -> None:
+        totals = self.totals
+        for k, c in counts.items():
+            v = totals.get(k, 0) + sign * c
+            if v:
+                totals[k] = v
+            else:
+                totals.pop(k, None)
+
+    def _scan_dir(self) -> Dict[str, Tuple[int, int, Path]]:
+        found = {}
+        paths = list(self.data_dir.glob("*.json")) if self.data_dir.exists() else []
+        if self.last_json.exists():
+            paths.append(self.last_json)
+        for p in paths:
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            found[p.name] = (st.st_mtime_ns, st.st_size, p)
+        return found
+
+    def _drop(self, name: str) -> None:
+        entry = self.files.pop(name)
+        if entry.get("included"):
+            self._apply(entry["counts"], -1)
+
+    def _fold(self, name: str, mtime: int, size: int, path: Path) -> bool:
+        """name 을 (mtime, size) 기준으로 반영. 새로 파싱했으면 True."""
+        entry = self.files.get(name)
+        if entry and entry["mtime"] == mtime and entry["size"] == size:
+            return False
+        if entry and entry.get("included"):
+            self._apply(entry["counts"], -1)
+        ts, counts = count_keywords(path)
+        self.files[name] = {"mtime": mtime, "size": size, "ts": ts, "counts": counts, "included": False}
+        return True
+
+    def _reconcile(self) -> bool:
+        # 포함 여부 재평가: last_result 는 같은 timestamp 스냅샷이 없을 때만 합산
+        changed = False
+        for name, entry in self.files.items():
+            want = not (name == self.last_json.name and f"{entry.get('ts')}.json" in self.files)
+            if want != entry.get("included"):
+                self._apply(entry["counts"], 1 if want else -1)
+                entry["included"] = want
+                changed = True
+        return changed
+
+    def _finish(self, changed: bool, parsed: int, t0: float) -> None:
+        if changed:
+            self._ranked = None
+            self.save()
+        if parsed:
+            print(f"[INFO] keyword index: parsed {parsed} file(s), {len(self.totals)} keywords "
+                  f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    def update(self) -> int:
+        """디스크와 동기화. 새로 파싱한 파일 수를 반환 (0 이면 stat 만 하고 끝)."""
+        t0 = time.perf_counter()
+        current = self._scan_dir()
+        changed = False
+        parsed = 0
+        for name in [n for n in self.files if n not in current]:
+            self._drop(name)
+            changed = True
+        for name, (mtime, size, path) in current.items():
+            if self._fold(name, mtime, size, path):
+                parsed += 1
+                changed = True
+        changed = self._reconcile() or changed
+        self._finish(changed, parsed, t0)
+        return parsed
+
+    def update_paths(self, paths: Iterable[Path]) -> int:
+        """
+        변경 알림을 받은 파일만 반영 (fs_watcher 용). 디렉터리 전체를 다시 훑지 않음.
+        없어진 파일은 합계에서 빼고, 새로 생기거나 바뀐 파일만 파싱.
+        """
+        t0 = time.perf_counter()
+        changed = False
+        parsed = 0
+        for path in paths:
+            path = Path(path).resolve()
+            if path != self.last_json and (path.parent != self.data_dir or path.suffix != ".json"):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                if path.name in self.files:
+                    self._drop(path.name)
+                    changed = True
+                continue
+            if self._fold(path.name, st.st_mtime_ns, st.st_size, path):
+                parsed += 1
+                changed = True
+        changed = self._reconcile() or changed
+        self._finish(changed, parsed, t0)
+        return parsed
+
+    def ranked(self) -> List[Tuple[str, int]]:
+        if self._ranked is None:
+            self._ranked = sorted(self.totals.items(), key=lambda x: x[1], reverse=True)
+        return self._ranked
+
+    def top(self, n: int = 30) -> List[Tuple[str, int]]:
+        return self.ranked()[:n]
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+
+def main():
+    idx = KeywordMapIndex()
+    if "--rebuild" in sys.argv[1:]:
+        idx.clear()
+    idx.update()
+    for kw, cnt in idx.top(30):
+        print(f"{kw}\t{cnt}")
+    print(f"[INFO] {len(idx)} keywords from {len(idx.files)} file(s)")
+
+
+if __name__ == "__main__":
+    main()
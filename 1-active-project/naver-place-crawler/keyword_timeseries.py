@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+방문자 키워드 count 시계열 저장소 (스냅샷 간 변화분만 보관)
+- 시계열 키: (business_id, keyword_code) — keyword_code 가 비어 있는 예전 데이터는 keyword 문자열을 코드로 사용
+- delta(series_id, ts, cnt): 직전 관측값과 달라진 경우에만 한 행 (cnt NULL = 그 시점에 키워드가 사라짐)
+- observation(business_id, ts): 그 스냅샷에서 업체를 실제로 수집했는지
+  → 수집되지 않은 업체는 "변화 없음"으로 보고 마지막 값을 유지 (실행마다 시드 키워드가 달라도 안전)
+- 스냅샷을 순서와 상관없이 넣어도 됨: 과거 시점을 끼워 넣으면 다음 관측 시점의 delta 를 보정
+- 저장 위치: out/keyword_timeseries.db (SQLite)
+사용법:
+  python keyword_timeseries.py import [scrape_results]          # 아직 없는 스냅샷만 가져오기
+  python keyword_timeseries.py history <business_id> [keyword_code] [start_ts] [end_ts]
+  python keyword_timeseries.py range <start_ts> <end_ts> [keyword_code]
+  python keyword_timeseries.py at <ts> [business_id]             # 그 시점의 count 복원
+  python keyword_timeseries.py stats
+"""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import json_codec
+
+BASE_DIR = Path(__file__).parent.resolve()
+DATA_DIR = BASE_DIR / "scrape_results"
+DB_FILE = BASE_DIR / "out" / "keyword_timeseries.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot (ts INTEGER PRIMARY KEY, source TEXT, places INTEGER, rows INTEGER);
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY, business_id TEXT NOT NULL, keyword_code TEXT NOT NULL, keyword TEXT,
+    UNIQUE (business_id, keyword_code));
+CREATE TABLE IF NOT EXISTS observation (
+    business_id TEXT NOT NULL, ts INTEGER NOT NULL, PRIMARY KEY (business_id, ts)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS delta (
+    series_id INTEGER NOT NULL, ts INTEGER NOT NULL, cnt INTEGER, PRIMARY KEY (series_id, ts)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_delta_ts ON delta(ts);
+CREATE INDEX IF NOT EXISTS idx_series_code ON series(keyword_code);
+"""
+
+
+def connect(db_path: Path = DB_FILE) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def series_key(kw: Dict[str, Any]) -> Tuple[str, str]:
+    """(keyword_code, keyword) — 코드가 없으면 keyword 문자열이 코드 역할"""
+    keyword = kw.get("keyword") or ""
+    return kw.get("keyword_code") or keyword, keyword
+
+
+def observe(records: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Tuple[str, int]]], int]:
+    """레코드 → {business_id: {keyword_code: (keyword, cnt)}}, 키워드 행 수"""
+    obs: Dict[str, Dict[str, Tuple[str, int]]] = {}
+    rows = 0
+    for rec in records:
+        biz = rec.get("id") or rec.get("name")
+        if not biz:
+            continue
+        counts = obs.setdefault(biz, {})
+        for kw in rec.get("keywords", []):
+            code, keyword = series_key(kw)
+            if not code:
+                continue
+            try:
+                counts[code] = (keyword, int(kw.get("count", 0)))
+            except (TypeError, ValueError):
+                continue
+            rows += 1
+    return obs, rows
+
+
+def _series_ids(conn: sqlite3.Connection, biz: str, counts: Dict[str, Tuple[str, int]]) -> Dict[str, int]:
+    ids = dict(conn.execute("SELECT keyword_code, series_id FROM series WHERE business_id = ?", (biz,)))
+    for code, (keyword, _cnt) in counts.items():
+        if code not in ids:
+            cur = conn.execute("INSERT INTO series (business_id, keyword_code, keyword) VALUES (?, ?, ?)",
+                               (biz, code, keyword))
+            ids[code] = cur.lastrowid
+    return ids
+
+
+def _value_before(conn: sqlite3.Connection, sid: int, ts: int) -> Optional[int]:
+    row = conn.execute("SELECT cnt FROM delta WHERE series_id = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+                       (sid, ts)).fetchone()
+    return row[0] if row else None
+
+
+def import_snapshot(conn: sqlite3.Connection, ts: int, records: Iterable[Dict[str, Any]], source: str = "") -> int:
+    """스냅샷 하나를 반영. 새로 기록한 delta 행 수를 반환 (이미 있는 ts 면 -1)."""
+    if conn.execute("SELECT 1 FROM snapshot WHERE ts = ?", (ts,)).fetchone():
+        return -1
+    obs, rows = observe(records)
+    written = 0
+    with conn:
+        conn.execute("INSERT INTO snapshot VALUES (?, ?, ?, ?)", (ts, source, len(obs), rows))
+        for biz, counts in obs.items():
+            conn.execute("INSERT OR IGNORE INTO observation VALUES (?, ?)", (biz, ts))
+            nxt = conn.execute("SELECT MIN(ts) FROM observation WHERE business_id = ? AND ts > ?",
+                               (biz, ts)).fetchone()[0]
+            for code, sid in _series_ids(conn, biz, counts).items():
+                old = _value_before(conn, sid, ts)
+                new = counts[code][1] if code in counts else None
+                if new != old:
+                    conn.execute("INSERT INTO delta VALUES (?, ?, ?)", (sid, ts, new))
+                    written += 1
+                if nxt is None:
+                    continue
+                # 과거 시점을 끼워 넣은 경우: 다음 관측 시점은 이제 new 와 비교해야 함
+                row = conn.execute("SELECT cnt FROM delta WHERE series_id = ? AND ts = ?", (sid, nxt)).fetchone()
+                if row is not None and row[0] == new:
+                    conn.execute("DELETE FROM delta WHERE series_id = ? AND ts = ?", (sid, nxt))
+                    written -= 1
+                elif row is None and new != old:
+                    conn.execute("INSERT INTO delta VALUES (?, ?, ?)", (sid, nxt, old))
+                    written += 1
+    return written
+
+
+def snapshot_ts(path: Path, data: Dict[str, Any]) -> Optional[int]:
+    ts = data.get("timestamp")
+    if ts is None and path.stem.isdigit():
+        ts = int(path.stem)
+    return int(ts) if ts is not None else None
+
+
+def import_dir(conn: sqlite3.Connection, data_dir: Path = DATA_DIR) -> Tuple[int, int]:
+    """data_dir/*.json 중 아직 없는 스냅샷을 시간 순으로 가져옴 → (가져온 파일 수, delta 행 수)"""
+    known = {row[0] for row in conn.execute("SELECT ts FROM snapshot")}
+    paths = sorted(Path(data_dir).glob("*.json"),
+                   key=lambda p: (int(p.stem), "") if p.stem.isdigit() else (2 ** 62, p.name))
+    imported = written = 0
+    for path in paths:
+        if path.stem.isdigit() and int(path.stem) in known:
+            continue  # 파일 이름이 timestamp 면 파싱 없이 건너뜀
+        try:
+            data = json_codec.read(path)
+        except Exception as e:
+            print(f"[WARN] timeseries: cannot read {path.name}: {e}")
+            continue
+        ts = snapshot_ts(path, data)
+        if ts is None:
+            print(f"[WARN] timeseries: no timestamp in {path.name}, skipped")
+            continue
+        n = import_snapshot(conn, ts, data.get("records", []), path.name)
+        if n >= 0:
+            imported += 1
+            written += n
+            known.add(ts)
+    return imported, written
+
+
+def import_file(path: Path, db_path: Path = DB_FILE) -> int:
+    """수집 직후 새 스냅샷 하나만 반영 (collect_master_data 용)"""
+    path = Path(path)
+    data = json_codec.read(path)
+    ts = snapshot_ts(path, data)
+    if ts is None:
+        return -1
+    conn = connect(db_path)
+    try:
+        return import_snapshot(conn, ts, data.get("records", []), path.name)
+    finally:
+        conn.close()
+
+
+# ---------- 조회 ----------
+def history(conn: sqlite3.Connection, business_id: str, keyword_code: Optional[str] = None,
+            start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, List[Tuple[int, Optional[int]]]]:
+    """
+    업체 하나의 키워드별 변화 이력 {keyword_code: [(ts, cnt), ...]}.
+    start 가 있으면 그 직전 값을 (start, cnt) 로 맨 앞에 붙여 구간 시작 시점의 값도 알 수 있게 함.
+    """
+    sql = "SELECT series_id, keyword_code FROM series WHERE business_id = ?"
+    params: List[Any] = [business_id]
+    if keyword_code:
+        sql += " AND keyword_code = ?"
+        params.append(keyword_code)
+    lo = start if start is not None else -1
+    hi = end if end is not None else 2 ** 62
+    out: Dict[str, List[Tuple[int, Optional[int]]]] = {}
+    for sid, code in conn.execute(sql, params).fetchall():
+        points: List[Tuple[int, Optional[int]]] = []
+        if start is not None:
+            before = conn.execute("SELECT cnt FROM delta WHERE series_id = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+                                  (sid, start)).fetchone()
+            if before is not None:
+                points.append((start, before[0]))
+        points.extend(conn.execute("SELECT ts, cnt FROM delta WHERE series_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                                   (sid, lo, hi)).fetchall())
+        if points:
+            out[code] = points
+    return out
+
+
+def changes(conn: sqlite3.Connection, start: int, end: int, keyword_code: Optional[str] = None,
+            limit: int = 1000) -> List[Tuple[str, str, int, Optional[int], Optional[int]]]:
+    """구간 [start, end] 의 변화 (business_id, keyword_code, ts, 이전 cnt, 새 cnt) — ts 인덱스로 구간만 읽음"""
+    code_filter = "AND s.keyword_code = ?" if keyword_code else ""
+    params: List[Any] = [start, end] + ([keyword_code] if keyword_code else []) + [limit]
+    sql = f"""
+        SELECT s.business_id, s.keyword_code, d.ts,
+               (SELECT p.cnt FROM delta p WHERE p.series_id = d.series_id AND p.ts < d.ts ORDER BY p.ts DESC LIMIT 1),
+               d.cnt
+        FROM delta d JOIN series s ON s.series_id = d.series_id
+        WHERE d.ts BETWEEN ? AND ? {code_filter}
+        ORDER BY d.ts, s.business_id, s.keyword_code
+        LIMIT ?"""
+    return conn.execute(sql, params).fetchall()
+
+
+def counts_at(conn: sqlite3.Connection, ts: int, business_id: Optional[str] = None) -> Dict[Tuple[str, str], int]:
+    """ts 시점에 알려진 마지막 값으로 전체 count 복원 {(business_id, keyword_code): cnt}"""
+    biz_filter = "WHERE s.business_id = ?" if business_id else ""
+    params: List[Any] = [ts] + ([business_id] if business_id else [])
+    sql = f"""
+        SELECT s.business_id, s.keyword_code,
+               (SELECT d.cnt FROM delta d WHERE d.series_id = s.series_id AND d.ts <= ? ORDER BY d.ts DESC LIMIT 1)
+        FROM series s {biz_filter}"""
+    return {(biz, code): cnt for biz, code, cnt in conn.execute(sql, params) if cnt is not None}
+
+
+def stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    snapshots, full_rows = conn.execute("SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM snapshot").fetchone()
+    return {
+        "snapshots": snapshots,
+        "series": conn.execute("SELECT COUNT(*) FROM series").fetchone()[0],
+        "deltas": conn.execute("SELECT COUNT(*) FROM delta").fetchone()[0],
+        "full_rows": full_rows,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    cmd = args[0] if args else "stats"
+    conn = connect()
+    if cmd == "import":
+        t0 = time.perf_counter()
+        imported, written = import_dir(conn, Path(args[1]) if len(args) > 1 else DATA_DIR)
+        print(f"[INFO] imported {imported} snapshot(s), {written} delta row(s) "
+              f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    elif cmd == "history" and len(args) > 1:
+        start = int(args[3]) if len(args) > 3 else None
+        end = int(args[4]) if len(args) > 4 else None
+        for code, points in history(conn, args[1], args[2] if len(args) > 2 and args[2] != "-" else None,
+                                    start, end).items():
+            print(code + "\t" + "  ".join(f"{ts}:{'-' if cnt is None else cnt}" for ts, cnt in points))
+    elif cmd == "range" and len(args) > 2:
+        for biz, code, ts, prev, cnt in changes(conn, int(args[1]), int(args[2]), args[3] if len(args) > 3 else None):
+            print(f"{ts}\t{biz}\t{code}\t{'-' if prev is None else prev} -> {'-' if cnt is None else cnt}")
+    elif cmd == "at" and len(args) > 1:
+        for (biz, code), cnt in sorted(counts_at(conn, int(args[1]), args[2] if len(args) > 2 else None).items()):
+            print(f"{biz}\t{code}\t{cnt}")
+    elif cmd == "stats":
+        s = stats(conn)
+        ratio = s["deltas"] / s["full_rows"] if s["full_rows"] else 0
+        print(f"[INFO] {s['snapshots']} snapshot(s), {s['series']} series, {s['deltas']} delta row(s) "
+              f"for {s['full_rows']} full row(s) ({ratio:.1%})")
+    else:
+        print(__doc__)
+        sys.exit(1)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,15 @@
   python login_cookie_capture.py
   - 뜨는 브라우저에서 직접 로그인/2차 인증을 완료
   - 콘솔에 Enter 입력 → cookies를 runtime_config.json에 저장
+  - 전체 로그인 상태는 storage_state.json 에도 저장 → browser_service / category_playwright 가 재사용
+  - storage_state.json 이 이미 있으면 그 상태로 브라우저를 열어 재로그인을 생략할 수 있음
 """
-import json
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 
+import json_codec
+from browser_service import STORAGE_STATE, connect_sync, context_kwargs, read_service
+
 BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / "runtime_config.json"
 
@@ -19,24 +23,39 @@ def save_cookie_string(cookie_list):
     cfg = {}
     if CONFIG_FILE.exists():
         try:
-            cfg = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+            cfg = json_codec.read(CONFIG_FILE)
         except Exception:
             cfg = {}
     cfg["cookie"] = cookies_str
-    CONFIG_FILE.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+    json_codec.write(CONFIG_FILE, cfg)
     print(f"[INFO] Saved cookies to {CONFIG_FILE}")
 
 
 def main():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        # 로그인은 사용자가 직접 해야 하므로 화면이 있는 브라우저가 필요
+        # → --headed 로 뜬 browser_service 가 있으면 그 프로필에서, 없으면 새로 띄움
+        info = read_service()
+        if info and not info.get("headless"):
+            browser, owned = connect_sync(p, headless=False)
+        else:
+            browser, owned = p.chromium.launch(headless=False), True
+        created = owned or not browser.contexts
+        context = browser.new_context(**context_kwargs()) if created else browser.contexts[0]
+        page = context.new_page()
         page.goto("https://nid.naver.com/nidlogin.login", wait_until="networkidle")
         print("[INFO] 브라우저가 열렸습니다. 로그인/2차 인증을 직접 완료하세요.")
         input("로그인 완료 후 Enter 키를 누르면 쿠키를 저장합니다...")
-        cookies = page.context.cookies()
+        cookies = context.cookies()
         save_cookie_string(cookies)
-        browser.close()
+        context.storage_state(path=str(STORAGE_STATE))
+        print(f"[INFO] Saved storage state to {STORAGE_STATE}")
+        page.close()
+        # 서비스 브라우저는 직접 만든 컨텍스트만 닫고 브라우저는 그대로 둠
+        if owned:
+            browser.close()
+        elif created:
+            context.close()
         print("[DONE] 쿠키 저장 완료.")
 
 
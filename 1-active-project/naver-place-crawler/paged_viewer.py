@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+큰 파일용 지연 로딩 뷰어 (gui.py 히스토리/SQL 미리보기용)
+- LineIndex: 줄 시작 오프셋만 한 번 색인 → 임의의 줄을 seek/read 로 바로 읽음 (파일을 열어 두지 않음,
+  크기/mtime 이 바뀌면 다시 색인 → 수집기가 같은 파일을 덮어써도 안전)
+- PagedTextView: Text 위젯에는 화면에 보이는 줄만 넣고, 스크롤바/휠/PageUp·Down 으로 창을 옮김
+  (파일 전체를 문자열로 만들거나 Tk 에 넣지 않음, 색인은 백그라운드 스레드에서 생성)
+- RecordIndex: JSON 스냅샷을 파싱하지 않고 한 번 훑어 records 배열 원소별 바이트 범위만 색인
+  → 레코드 내용은 필요할 때 그 범위만 읽어 파싱
+- RecordTree: 업체 단위 접힌 목록, 한 페이지(TREE_PAGE)씩만 넣고 스크롤이 끝에 닿으면 다음 페이지 추가,
+  펼칠 때 그 레코드만 읽어 필드/키워드 삽입 (레코드 dict 를 메모리에 들고 있지 않음)
+- SnapshotView: 헤더 + [원문 | 레코드] 탭 묶음
+"""
+import datetime
+import re
+import threading
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from pathlib import Path
+from tkinter import ttk
+from typing import Any, Dict, List, Optional
+
+import json_codec
+
+MAX_LINE_CHARS = 4000   # 한 줄이 너무 길면(압축 JSON 등) 이 길이에서 자름
+POLL_MS = 50
+READ_CHUNK = 1 << 20    # 색인할 때 한 번에 읽는 바이트
+TREE_PAGE = 200         # RecordTree 가 한 번에 insert 하는 레코드 수
+LOAD_MORE_AT = 0.9      # 스크롤 위치가 이 비율을 넘으면 다음 페이지 추가
+JSON_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{}]')  # 문자열 통째로 또는 괄호
+HEAD_TS_RE = re.compile(rb'^\s*\{\s*"timestamp"\s*:\s*(\d+)')
+
+
+def format_ts(ts: int) -> str:
+    try:
+        return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return str(ts)
+
+
+class LineIndex:
+    """
+    줄 시작 오프셋 배열. 파일 크기와 무관하게 줄 하나를 seek/read 한 번으로 읽음.
+    파일은 열어 두지 않음 — 수집기가 last_result.json / SQL 을 덮어쓰는 동안 mmap 을 잡고 있으면
+    잘린 영역을 읽을 때 SIGBUS, Windows 에서는 덮어쓰기 자체가 PermissionError.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        st = self.path.stat()
+        self.size = st.st_size
+        self.stamp = (st.st_size, st.st_mtime_ns)
+        self.offsets = array("Q", [0])
+        append = self.offsets.append
+        base = 0
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                find = chunk.find
+                nl = find(b"\n")
+                while nl >= 0:
+                    append(base + nl + 1)
+                    nl = find(b"\n", nl + 1)
+                base += len(chunk)
+        self.size = base
+        if len(self.offsets) > 1 and self.offsets[-1] == self.size:
+            self.offsets.pop()  # 마지막 개행 뒤의 빈 줄은 세지 않음
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def changed(self) -> bool:
+        """색인 뒤에 파일이 바뀌었거나(크기/mtime) 사라졌으면 True"""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return True
+        return (st.st_size, st.st_mtime_ns) != self.stamp
+
+    def _read(self, f, i: int) -> str:
+        start = self.offsets[i]
+        end = self.offsets[i + 1] - 1 if i + 1 < len(self.offsets) else self.size
+        f.seek(start)
+        text = f.read(max(0, min(end, start + MAX_LINE_CHARS * 4) - start))
+        text = text.decode("utf-8", errors="replace").rstrip("\r\n")
+        if len(text) > MAX_LINE_CHARS:
+            text = text[:MAX_LINE_CHARS] + " …"
+        return text
+
+    def line(self, i: int) -> str:
+        return self.lines(i, 1)[0] if 0 <= i < len(self) else ""
+
+    def lines(self, start: int, count: int) -> List[str]:
+        if self.size == 0:
+            return []
+        try:
+            with open(self.path, "rb") as f:
+                return [self._read(f, i) for i in range(start, min(start + count, len(self)))]
+        except OSError:
+            return []  # 덮어쓰는 중 — 다음 render 에서 다시 색인
+
+    def close(self) -> None:
+        pass  # 잡고 있는 핸들 없음 (PagedTextView 호환용)
+
+
+class RecordIndex:
+    """
+    스냅샷 JSON 의 최상위 "records" 배열 원소별 [시작, 끝) 바이트 오프셋.
+    문자열과 괄호만 정규식으로 건너뛰며 깊이를 세므로 파일 전체를 파싱하지 않음.
+    LineIndex 와 같이 파일은 열어 두지 않음.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        st = self.path.stat()
+        self.stamp = (st.st_size, st.st_mtime_ns)
+        self.starts = array("Q")
+        self.ends = array("Q")
+        self.timestamp: Optional[int] = None
+        depth, last_key = 0, b""
+        in_records, rec_start = False, 0
+        base, carry = 0, b""
+        with open(self.path, "rb") as f:
+            m = HEAD_TS_RE.match(f.read(256))  # 스냅샷은 timestamp 를 맨 앞에 씀
+            if m:
+                self.timestamp = int(m.group(1))
+            f.seek(0)
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                buf = carry + chunk
+                carry = b""
+                for m in JSON_TOKEN_RE.finditer(buf):
+                    tok = m.group()
+                    c = tok[0]
+                    if c == 0x22:  # "
+                        if len(tok) == 1:  # 청크 끝에서 잘린 문자열 → 다음 청크와 이어서
+                            carry = buf[m.start():]
+                            break
+                        if depth == 1:
+                            last_key = tok[1:-1]  # 최상위 키 (값 문자열이면 다음 키에서 덮어씀)
+                    elif c in b"{[":
+                        depth += 1
+                        if depth == 2 and c == 0x5B and last_key == b"records":
+                            in_records = True
+                        elif depth == 3 and in_records:
+                            rec_start = base + m.start()
+                    else:
+                        if depth == 3 and in_records:
+                            self.starts.append(rec_start)
+                            self.ends.append(base + m.end())
+                        elif depth == 2 and in_records:
+                            in_records = False
+                        depth -= 1
+                base += len(buf) - len(carry)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def changed(self) -> bool:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return True
+        return (st.st_size, st.st_mtime_ns) != self.stamp
+
+    def records(self, start: int, count: int) -> List[Dict[str, Any]]:
+        """start 번째부터 count 개 레코드를 파싱해 반환 (필요한 범위만 읽음)"""
+        out = []
+        with open(self.path, "rb") as f:
+            for i in range(start, min(start + count, len(self))):
+                f.seek(self.starts[i])
+                out.append(json_codec.loads(f.read(self.ends[i] - self.starts[i])))
+        return out
+
+    def record(self, i: int) -> Dict[str, Any]:
+        return self.records(i, 1)[0]
+
+
+class PagedTextView(tk.Frame):
+    def __init__(self, master, font=("Consolas", 9), height: int = 10, **kw):
+        super().__init__(master, **kw)
+        self.text = tk.Text(self, wrap="none", font=font, height=height)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        hbar = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=hbar.set)
+        self.vbar.pack(side="right", fill="y")
+        hbar.pack(side="bottom", fill="x")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.linespace = tkfont.Font(font=self.text.cget("font")).metrics("linespace")
+        self.index: Optional[LineIndex] = None
+        self.top = 0
+        self._loading = None  # (thread, 결과 dict)
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda e: self._scroll(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll(3))
+        for key, fn in (("<Prior>", lambda: self._scroll(-self.visible())),
+                        ("<Next>", lambda: self._scroll(self.visible())),
+                        ("<Up>", lambda: self._scroll(-1)),
+                        ("<Down>", lambda: self._scroll(1)),
+                        ("<Control-Home>", lambda: self._goto(0)),
+                        ("<Control-End>", lambda: self._goto(len(self.index or ())))):
+            self.text.bind(key, lambda e, fn=fn: fn() or "break")
+
+    # ---------- 내용 ----------
+    def open(self, path: Path, keep_top: bool = False) -> None:
+        """path 의 줄 색인을 백그라운드에서 만들고, 끝나면 첫 화면을 그림 (keep_top 이면 보던 위치 유지)"""
+        top = self.top if keep_top else 0
+        self.close()
+        if not keep_top:
+            self.show_message(f"{Path(path).name} 색인 중...")
+        result: Dict[str, Any] = {"top": top}
+
+        def build():
+            try:
+                result["index"] = LineIndex(path)
+            except Exception as e:
+                result["error"] = e
+
+        worker = threading.Thread(target=build, daemon=True)
+        self._loading = (worker, result)
+        worker.start()
+        self.after(POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        if self._loading is None:
+            return
+        worker, result = self._loading
+        if worker.is_alive():
+            self.after(POLL_MS, self._poll)
+            return
+        self._loading = None
+        if "error" in result:
+            self.show_message(f"불러오기 실패: {result['error']}")
+            return
+        self.index = result["index"]
+        self.top = result["top"]
+        self.render()
+
+    def show_message(self, msg: str) -> None:
+        self.close()
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", msg)
+        self.vbar.set(0, 1)
+
+    def close(self) -> None:
+        self._loading = None  # 진행 중인 색인 결과는 버림
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def destroy(self) -> None:
+        self.close()
+        super().destroy()
+
+    # ---------- 화면 ----------
+    def visible(self) -> int:
+        return max(1, self.text.winfo_height() // self.linespace)
+
+    def render(self) -> None:
+        if self.index is None:
+            return
+        if self.index.changed():
+            self.open(self.index.path, keep_top=True)  # 바깥에서 다시 쓰인 파일 → 새로 색인
+            return
+        total = len(self.index)
+        rows = self.visible()
+        self.top = max(0, min(self.top, total - rows))
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(self.index.lines(self.top, rows)))
+        self.vbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+
+    def _goto(self, line: int) -> None:
+        self.top = line
+        self.render()
+
+    def _scroll(self, lines: int) -> None:
+        self._goto(self.top + lines)
+
+    def _on_wheel(self, event):
+        self._scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _yview(self, *args) -> None:
+        if self.index is None:
+            return
+        if args[0] == "moveto":
+            self._goto(int(float(args[1]) * len(self.index)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._scroll(step * self.visible() if args[2] == "pages" else step)
+
+
+class RecordTree(tk.Frame):
+    """RecordIndex 의 레코드를 업체별로 접어서 표시. 스크롤하면 페이지 추가, 자식 노드는 펼칠 때 삽입."""
+
+    def __init__(self, master, height: int = 10, **kw):
+        super().__init__(master, **kw)
+        self.tree = ttk.Treeview(self, columns=("value",), height=height)
+        self.tree.heading("#0", text="record")
+        self.tree.heading("value", text="value")
+        self.tree.column("#0", width=200)
+        self.tree.column("value", width=120)
+        bar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.bar = bar
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+        bar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+        self.index: Optional[RecordIndex] = None
+        self._next = 0
+        self._more_pending = False
+
+    def load(self, index: RecordIndex) -> None:
+        self.clear()
+        self.index = index
+        self._append_page()
+
+    def clear(self) -> None:
+        self.index = None
+        self._next = 0
+        self.tree.delete(*self.tree.get_children())
+
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self.bar.set(first, last)
+        if (self.index is not None and self._next < len(self.index) and not self._more_pending
+                and float(last) >= LOAD_MORE_AT):
+            self._more_pending = True
+            self.after_idle(self._append_page)
+
+    def _append_page(self) -> None:
+        self._more_pending = False
+        if self.index is None:
+            return
+        try:
+            page = self.index.records(self._next, TREE_PAGE)
+        except Exception as e:
+            self.tree.insert("", "end", text=f"(레코드 읽기 실패: {e})")
+            self._next = len(self.index)
+            return
+        for i, rec in enumerate(page, start=self._next):
+            label = rec.get("name") or rec.get("id") or f"#{i}"
+            iid = self.tree.insert("", "end", iid=str(i), text=label,
+                                   values=(",".join(rec.get("category", [])),))
+            self.tree.insert(iid, "end", text="…")  # 펼침 표시용 자리
+        self._next += len(page)
+
+    def _on_open(self, _event) -> None:
+        iid = self.tree.focus()
+        if not iid or self.tree.parent(iid) or not iid.isdigit() or self.index is None:
+            return
+        self.tree.delete(*self.tree.get_children(iid))
+        try:
+            rec = self.index.record(int(iid))
+        except Exception as e:
+            self.tree.insert(iid, "end", text=f"(레코드 읽기 실패: {e})")
+            return
+        for key, value in rec.items():
+            if key in ("name", "keywords"):
+                continue
+            if isinstance(value, list):
+                value = ",".join(str(v) for v in value)
+            self.tree.insert(iid, "end", text=key, values=(value,))
+        for kw in rec.get("keywords", []):
+            self.tree.insert(iid, "end", text=f"# {kw.get('keyword', '')}", values=(kw.get("count", 0),))
+
+
+class SnapshotView(tk.Frame):
+    """헤더 + [원문(PagedTextView) | 레코드(RecordTree)] 탭"""
+
+    def __init__(self, master, height: int = 10, **kw):
+        super().__init__(master, **kw)
+        self.header = tk.StringVar()
+        tk.Label(self, textvariable=self.header, anchor="w", justify="left").pack(fill="x")
+        self.tabs = ttk.Notebook(self)
+        self.tabs.pack(fill="both", expand=True)
+        self.raw = PagedTextView(self.tabs, height=height)
+        self.records = RecordTree(self.tabs, height=height)
+        self.tabs.add(self.raw, text="원문")
+        self.tabs.add(self.records, text="레코드")
+        self._parse = None
+
+    def open(self, path: Path) -> None:
+        path = Path(path)
+        self.header.set(f"file: {path.name}")
+        self.raw.open(path)
+        self.records.clear()
+        if path.suffix != ".json":
+            return
+        result: Dict[str, Any] = {}
+
+        def parse():
+            try:
+                result["index"] = RecordIndex(path)
+            except Exception as e:
+                result["error"] = e
+
+        worker = threading.Thread(target=parse, daemon=True)
+        self._parse = (path, worker, result)
+        worker.start()
+        self.after(POLL_MS, self._poll)
+
+    def _poll(self) -> None:
+        if self._parse is None:
+            return
+        path, worker, result = self._parse
+        if worker.is_alive():
+            self.after(POLL_MS, self._poll)
+            return
+        self._parse = None
+        index = result.get("index")
+        if index is None:
+            self.header.set(f"file: {path.name}  (레코드 색인 실패: {result.get('error')})")
+            return
+        ts = index.timestamp
+        header = f"file: {path.name}"
+        if ts:
+            header += f"  timestamp: {ts} ({format_ts(ts)})"
+        self.header.set(header + f"  records: {len(index)}")
+        self.records.load(index)
+
+    def show_message(self, msg: str) -> None:
+        self._parse = None
+        self.header.set("")
+        self.raw.show_message(msg)
+        self.records.clear()
+
+    def clear(self) -> None:
+        self.show_message("")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+응답 본문 → 레코드 파서 (네트워크/설정과 무관한 순수 함수)
+- collect_master_data 의 수집과 response_archive 의 reparse 가 같은 함수를 사용
+  → 파서를 고치면 보관된 원문에 다시 돌려 과거 데이터에도 바로 반영
+- 업체 id 는 이름의 crc32 (프로세스마다 값이 바뀌는 hash() 대신 → 재파싱/프로세스 풀에서도 같은 id)
+"""
+import html as htmllib
+import re
+import zlib
+from typing import Any, Dict, List
+
+# 차단 페이지 판별: 차단/캡차 페이지는 안내 문구만 있는 작은 문서 → 작은 문서에서만 문구를 찾음
+# (정상 검색 HTML 은 수백 KB 이고 스크립트/에셋 이름에 captcha 가 들어갈 수 있어 단어 하나로는 판단하지 않음)
+BLOCK_MARKERS = ("비정상적인 접근", "자동입력 방지")
+BLOCK_PAGE_MAX = 20000             # 이보다 큰 문서는 차단 페이지로 보지 않음 (상태 코드/리다이렉트로만 판단)
+CAPTCHA_URL_RE = re.compile(r"captcha", re.I)
+
+NAME_RE = re.compile(r'"name":"([^"]+)"')
+CATEGORY_RE = re.compile(r'"category":"([^"]+)"')
+TAG_RE = re.compile(r"<.*?>")
+
+
+def blocked_reason(status: int, text: str, url: str = "") -> str:
+    """
+    429/403, 캡차 주소로 리다이렉트(url = 최종 응답 주소), 또는 차단 문구만 있는 작은 페이지면 이유 문자열,
+    정상이면 빈 문자열
+    """
+    if status in (403, 429):
+        return f"blocked status {status}"
+    if url and CAPTCHA_URL_RE.search(url.split("?", 1)[0]):
+        return f"redirected to captcha ({url.split('?', 1)[0]})"
+    if len(text) > BLOCK_PAGE_MAX:
+        return ""
+    for marker in BLOCK_MARKERS:
+        if marker in text:
+            return f"block page ({marker})"
+    return ""
+
+
+def place_id(name: str) -> str:
+    return f"html_{zlib.crc32(name.encode('utf-8'))}"
+
+
+def clean(txt: str) -> str:
+    # mark 태그, HTML escape 제거
+    txt = htmllib.unescape(txt)
+    txt = txt.replace("\\u003C", "<").replace("\\u003E", ">")
+    txt = TAG_RE.sub("", txt)
+    return txt.strip()
+
+
+def parse_search_html(html: str, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """검색 HTML 에 박힌 "name"/"category" 쌍 → 플레이스 목록 (최대 limit, 없으면 빈 목록)"""
+    names = [clean(n) for n in NAME_RE.findall(html)]
+    cats = [clean(c) for c in CATEGORY_RE.findall(html)]
+    cleaned = []
+    seen = set()
+    for n, c in zip(names, cats + [""] * len(names)):
+        if n.strip() == "" or n.strip() == keyword or n in seen:
+            continue
+        seen.add(n)
+        cleaned.append({
+            "id": place_id(n),
+            "name": n,
+            "categoryCode": "",
+            "category": [c] if c else [],
+        })
+        if len(cleaned) >= limit:
+            break
+    return cleaned
+
+
+def parse_visitor_keywords(data: Any) -> List[Dict[str, Any]]:
+    """
+    getVisitorReviewStats GraphQL 응답 → [{keyword, keyword_code, count}] (정상 응답에 키워드가 없으면 빈 목록).
+    GraphQL errors 만 있고 data 가 없는 응답은 실패이므로 ValueError.
+    """
+    if data.get("errors") and not data.get("data"):
+        raise ValueError(f"graphql errors: {data['errors']}")
+    details = data.get("data", {}).get("getVisitorReviewStats", {}).get("votedKeyword", {}).get("details", [])
+    out = []
+    for d in details or []:
+        if not isinstance(d, dict):
+            continue
+        keyword = d.get("keyword") or d.get("name")
+        keyword_code = d.get("keywordCode") or d.get("code")
+        count = d.get("count") or d.get("value") or 0
+        if keyword:
+            try:
+                cnt_int = int(count)
+            except Exception:
+                cnt_int = 0
+            out.append({
+                "keyword": str(keyword),
+                "keyword_code": str(keyword_code) if keyword_code else "",
+                "count": cnt_int,
+            })
+    return out
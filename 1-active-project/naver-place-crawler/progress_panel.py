@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링 진행 대시보드 (gui.py 하단 패널)
+- collect_master_data 가 찍는 진행 이벤트(job_control.emit_progress)를 받아 집계
+- 표시: 초당 요청 수(최근 RATE_WINDOW 초), 수집/중복/실패 건수, 쿨다운·회로 차단 대기 여부, 남은 MAX_REQUESTS,
+  예상 남은 시간, 요청별 지연 sparkline
+- feed() 는 출력 읽기 스레드에서 호출 → 큐에 쌓고 Tk 스레드에서 REFRESH_MS 마다 반영
+"""
+import queue
+import time
+import tkinter as tk
+from collections import deque
+from typing import Any, Dict, Optional
+
+RATE_WINDOW = 60       # 초당 요청 수 계산 구간(초)
+SPARK_POINTS = 60      # sparkline 에 그릴 최근 요청 수
+REFRESH_MS = 500
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+class ProgressTracker:
+    """한 작업의 진행 이벤트 집계 (Tk 와 무관)"""
+
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.keywords_total = 0
+        self.keyword_index = 0
+        self.max_requests = 0
+        self.per_keyword = 5
+        self.requests = 0
+        self.collected = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.throttle = "대기"
+        self.finished = False
+        self.request_times: deque = deque()
+        self.latencies: deque = deque(maxlen=SPARK_POINTS)
+
+    def apply(self, ev: Dict[str, Any]) -> None:
+        kind = ev.get("event")
+        now = ev.get("t") or time.time()
+        if kind == "start":
+            self.__init__()
+            self.started = now
+            self.keywords_total = ev.get("keywords", 0)
+            self.max_requests = ev.get("max_requests", 0)
+            self.per_keyword = ev.get("per_keyword", 5) or 5
+            self.throttle = "실행 중"
+        elif kind == "keyword":
+            self.keyword_index = ev.get("index", self.keyword_index)
+        elif kind == "request":
+            self.requests = ev.get("requests", self.requests + 1)
+            self.collected = ev.get("collected", self.collected)
+            self.duplicates = ev.get("duplicates", self.duplicates)
+            self.failed += 1 if ev.get("failed") else 0
+            self.latencies.append(float(ev.get("latency", 0)))
+            self.request_times.append(now)
+            while self.request_times and self.request_times[0] < now - RATE_WINDOW:
+                self.request_times.popleft()
+        elif kind == "throttle":
+            state = ev.get("state")
+            if state == "cooldown":
+                self.throttle = f"쿨다운 {ev.get('seconds', 0):.0f}s"
+            elif state == "breaker":
+                self.throttle = f"차단 대기 {ev.get('seconds', 0):.0f}s"
+            else:
+                self.throttle = "실행 중"
+        elif kind == "end":
+            self.finished = True
+            self.throttle = "완료"
+
+    def rate(self) -> float:
+        """최근 RATE_WINDOW 초 동안의 초당 요청 수"""
+        times = self.request_times
+        if len(times) < 2:
+            return 0.0
+        span = max(time.time(), times[-1]) - times[0]
+        return (len(times) - 1) / span if span > 0 else 0.0
+
+    def remaining_requests(self) -> int:
+        budget = max(0, self.max_requests - self.requests)
+        done_kw = max(0, self.keyword_index - 1)
+        per_kw = self.requests / done_kw if done_kw else self.per_keyword
+        planned = int(round(per_kw * self.keywords_total))
+        return min(budget, max(0, planned - self.requests))
+
+    def eta(self) -> Optional[float]:
+        # 쿨다운 시간까지 포함한 전체 평균 속도로 계산
+        if self.finished:
+            return 0.0
+        if not self.started or not self.requests:
+            return None
+        overall = self.requests / max(1e-6, time.time() - self.started)
+        return self.remaining_requests() / overall if overall else None
+
+
+class ProgressPanel(tk.Frame):
+    def __init__(self, master, **kw):
+        super().__init__(master, **kw)
+        self.pending: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.trackers: Dict[int, ProgressTracker] = {}
+        self.current: Optional[int] = None
+        self.title_var = tk.StringVar(value="진행 상황: 대기")
+        tk.Label(self, textvariable=self.title_var, font=("Segoe UI", 10, "bold")).pack(side="left", padx=(0, 8))
+        self.vars: Dict[str, tk.StringVar] = {}
+        for key, label in (("rate", "req/s"), ("collected", "수집"), ("duplicates", "중복"), ("failed", "실패"),
+                           ("throttle", "상태"), ("budget", "남은 요청"), ("eta", "ETA")):
+            var = tk.StringVar(value="-")
+            self.vars[key] = var
+            tk.Label(self, text=label, fg="gray").pack(side="left")
+            tk.Label(self, textvariable=var, width=9 if key == "throttle" else 6, anchor="w").pack(side="left", padx=(2, 6))
+        tk.Label(self, text="지연", fg="gray").pack(side="left")
+        self.spark = tk.Canvas(self, width=160, height=28, bg="white", highlightthickness=1,
+                               highlightbackground="#ccc")
+        self.spark.pack(side="left", padx=4)
+        self.after(REFRESH_MS, self._refresh)
+
+    def feed(self, job_id: int, ev: Dict[str, Any]) -> None:
+        """어느 스레드에서든 호출 가능"""
+        self.pending.put((job_id, ev))
+
+    def _refresh(self) -> None:
+        changed = False
+        try:
+            while True:
+                job_id, ev = self.pending.get_nowait()
+                tracker = self.trackers.setdefault(job_id, ProgressTracker())
+                tracker.apply(ev)
+                if ev.get("event") == "start":
+                    self.current = job_id  # 가장 최근에 시작한 크롤링을 표시
+                changed = True
+        except queue.Empty:
+            pass
+        tracker = self.trackers.get(self.current)
+        if tracker is not None and (changed or not tracker.finished):
+            self._render(tracker)
+        self.after(REFRESH_MS, self._refresh)
+
+    def _render(self, tr: ProgressTracker) -> None:
+        kw = f"{tr.keyword_index}/{tr.keywords_total}" if tr.keywords_total else "-"
+        self.title_var.set(f"진행 상황 #{self.current} (키워드 {kw})")
+        self.vars["rate"].set(f"{tr.rate():.2f}")
+        self.vars["collected"].set(str(tr.collected))
+        self.vars["duplicates"].set(str(tr.duplicates))
+        self.vars["failed"].set(str(tr.failed))
+        self.vars["throttle"].set(tr.throttle)
+        self.vars["budget"].set(f"{max(0, tr.max_requests - tr.requests)}")
+        self.vars["eta"].set(format_eta(tr.eta()))
+        self._draw_sparkline(list(tr.latencies))
+
+    def _draw_sparkline(self, values) -> None:
+        c = self.spark
+        c.delete("all")
+        if len(values) < 2:
+            return
+        w = int(c.cget("width"))
+        h = int(c.cget("height"))
+        top = max(values) or 1.0
+        step = (w - 4) / (SPARK_POINTS - 1)
+        x0 = w - 2 - step * (len(values) - 1)
+        points = []
+        for i, v in enumerate(values):
+            points.extend((x0 + i * step, h - 2 - (h - 4) * v / top))
+        c.create_line(*points, fill="#1f77b4")
+        c.create_text(2, 2, anchor="nw", text=f"{top:.1f}s", font=("Segoe UI", 7), fill="gray")
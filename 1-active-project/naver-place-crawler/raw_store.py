@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+내용 주소(content-addressed) 원문 저장소
+- 본문 sha256 을 파일 이름으로 사용 → 같은 본문은 몇 번 들어와도 한 번만 저장
+- zstandard 가 설치돼 있으면 .zst, 없으면 .gz 로 압축 (읽기는 두 형식 모두 지원)
+- index.json: sha → {size, codec, first_seen, last_seen, hits, refs(최근 출처 메타 몇 개)}
+- 저장 위치 예: out/categories_raw/ab/abcdef....zst
+- 여러 프로세스가 같은 저장소를 써도 됨: save() 는 파일 잠금 안에서 디스크의 index.json 과 합쳐서 씀,
+  get() 은 인덱스에 없는 sha 도 본문 파일이 있으면 읽음
+"""
+import gzip
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+import json_codec
+from file_lock import FileLock
+
+INDEX_NAME = "index.json"
+MAX_REFS = 5  # sha 당 보관할 출처(url/label 등) 메타 수
+
+
+class ContentStore:
+    def __init__(self, root: Path, level: int = 6):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / INDEX_NAME
+        self.level = level
+        self.codec = "zst" if zstandard is not None else "gz"
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"stored": 0, "deduped": 0, "bytes_in": 0, "bytes_written": 0}
+        self._lock = threading.Lock()
+        self._saved_hits: Dict[str, int] = {}  # 마지막으로 읽거나 쓴 시점의 hits (합칠 때 이 프로세스 증가분 계산)
+        try:
+            self.index = self._read_index()
+        except Exception as e:
+            print(f"[WARN] raw store index unreadable, starting fresh: {e}")
+        self._saved_hits = {sha: e.get("hits", 1) for sha, e in self.index.items()}
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        return json_codec.read(self.index_path) if self.index_path.exists() else {}
+
+    def _path(self, sha: str, codec: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.{codec}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zst":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return gzip.compress(data, compresslevel=self.level)
+
+    def put(self, data: bytes, **meta) -> str:
+        """본문 저장 후 sha256 반환. 이미 있으면 인덱스의 출처 메타만 갱신."""
+        sha = hashlib.sha256(data).hexdigest()
+        now = int(time.time())
+        ref = {k: v for k, v in meta.items() if v is not None}
+        with self._lock:
+            self.stats["bytes_in"] += len(data)
+            entry = self.index.get(sha)
+            if entry is not None and self._path(sha, entry["codec"]).exists():
+                self.stats["deduped"] += 1
+                entry["last_seen"] = now
+                entry["hits"] = entry.get("hits", 1) + 1
+                if ref and ref not in entry["refs"]:
+                    entry["refs"] = (entry["refs"] + [ref])[-MAX_REFS:]
+                return sha
+        blob = self._compress(data)
+        path = self._path(sha, self.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(path)
+        with self._lock:
+            self.stats["stored"] += 1
+            self.stats["bytes_written"] += len(blob)
+            self.index[sha] = {
+                "size": len(data),
+                "codec": self.codec,
+                "first_seen": now,
+                "last_seen": now,
+                "hits": 1,
+                "refs": [ref] if ref else [],
+            }
+        return sha
+
+    def _find(self, sha: str) -> Optional[Path]:
+        """본문 파일 경로. 인덱스에 없어도(다른 프로세스가 저장) 디스크에 있으면 찾음."""
+        entry = self.index.get(sha)
+        codecs = [entry["codec"]] if entry is not None else []
+        for codec in codecs + [c for c in ("zst", "gz") if c not in codecs]:
+            path = self._path(sha, codec)
+            if path.exists():
+                return path
+        return None
+
+    def has(self, sha: str) -> bool:
+        return self._find(sha) is not None
+
+    def get(self, sha: str) -> Optional[bytes]:
+        path = self._find(sha)
+        if path is None:
+            return None
+        blob = path.read_bytes()
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst entries")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.index))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _merge(self, disk: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """디스크 인덱스 + 이 프로세스의 변경 (hits 는 증가분만 더함, refs 는 합집합)"""
+        merged = dict(disk)
+        for sha, mine in self.index.items():
+            other = disk.get(sha)
+            if other is None:
+                merged[sha] = mine
+                continue
+            refs = other.get("refs", []) + [r for r in mine.get("refs", []) if r not in other.get("refs", [])]
+            merged[sha] = {
+                **other,
+                "first_seen": min(other["first_seen"], mine["first_seen"]),
+                "last_seen": max(other["last_seen"], mine["last_seen"]),
+                "hits": other.get("hits", 1) + mine.get("hits", 1) - self._saved_hits.get(sha, 0),
+                "refs": refs[-MAX_REFS:],
+            }
+        return merged
+
+    def save(self) -> None:
+        with self._lock, FileLock(self.index_path.with_name(self.index_path.name + ".lock")):
+            try:
+                disk = self._read_index()
+            except Exception as e:
+                print(f"[WARN] raw store index unreadable, overwriting: {e}")
+                disk = {}
+            self.index = self._merge(disk)
+            self._saved_hits = {sha: e.get("hits", 1) for sha, e in self.index.items()}
+            json_codec.write(self.index_path, self.index, atomic=True)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"stored={s['stored']} deduped={s['deduped']} "
+                f"in={s['bytes_in'] / 1024:.0f}KB written={s['bytes_written'] / 1024:.0f}KB codec={self.codec}")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+수집 레코드 타입 (Place / KeywordCount, __slots__)
+- 예전에는 업체와 키워드가 모두 문자열 키 dict → 업체 10만 개면 dict 수십만 개
+- 슬롯 클래스는 인스턴스 dict 가 없어 훨씬 작고, 키워드/카테고리 문자열은 intern 해서 업체끼리 공유
+- JSON 형식은 그대로: from_dict() / to_dict() 로 기존 스냅샷 파일과 오감 (모르는 키는 extra 에 보존)
+사용법:
+  python records.py bench [업체 수=100000]    # dict vs 슬롯 클래스 메모리/변환 시간 비교
+"""
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import json_codec
+from keyword_dict import KeywordDictionary
+
+PLACE_KEYS = ("id", "name", "categoryCode", "category", "algorithm_type", "keywords", "fallback")
+
+
+class KeywordCount:
+    __slots__ = ("keyword", "keyword_code", "keyword_id", "count")
+
+    def __init__(self, keyword: str, keyword_code: str = "", keyword_id: int = 0, count: int = 0):
+        self.keyword = keyword
+        self.keyword_code = keyword_code
+        self.keyword_id = keyword_id
+        self.count = count
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], keywords: Optional[KeywordDictionary] = None) -> "KeywordCount":
+        try:
+            count = int(d.get("count", 0))
+        except (TypeError, ValueError):
+            count = 0
+        keyword, code = d.get("keyword") or "", d.get("keyword_code") or ""
+        if keywords is not None:
+            kid = keywords.intern(keyword, code)
+            return cls(keywords.keyword(kid), keywords.code(kid), kid, count)
+        return cls(sys.intern(keyword), sys.intern(code), d.get("keyword_id") or 0, count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.keyword_id:
+            return {"keyword": self.keyword, "keyword_code": self.keyword_code, "keyword_id": self.keyword_id,
+                    "count": self.count}
+        return {"keyword": self.keyword, "keyword_code": self.keyword_code, "count": self.count}
+
+    def __repr__(self) -> str:
+        return f"KeywordCount({self.keyword!r}, {self.keyword_code!r}, {self.keyword_id}, {self.count})"
+
+
+class Place:
+    __slots__ = ("id", "name", "category_code", "category", "algorithm_type", "keywords", "fallback", "extra")
+
+    def __init__(self, id: str, name: str = "", category_code: str = "", category: Tuple[str, ...] = (),
+                 algorithm_type: str = "", keywords: Tuple[KeywordCount, ...] = (), fallback: str = "",
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.name = name
+        self.category_code = category_code
+        self.category = category
+        self.algorithm_type = algorithm_type
+        self.keywords = keywords
+        self.fallback = fallback
+        self.extra = extra
+
+    @property
+    def key(self) -> str:
+        return self.id or self.name
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], keywords: Optional[KeywordDictionary] = None) -> "Place":
+        extra = {k: v for k, v in d.items() if k not in PLACE_KEYS} or None
+        return cls(
+            d.get("id") or "",
+            d.get("name") or "",
+            sys.intern(d.get("categoryCode") or ""),
+            tuple(sys.intern(c) for c in d.get("category") or ()),
+            sys.intern(d.get("algorithm_type") or ""),
+            tuple(KeywordCount.from_dict(kw, keywords) for kw in d.get("keywords") or ()),
+            d.get("fallback") or "",
+            extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "categoryCode": self.category_code,
+            "category": list(self.category),
+            "algorithm_type": self.algorithm_type,
+            "keywords": [kw.to_dict() for kw in self.keywords],
+        }
+        if self.fallback:
+            d["fallback"] = self.fallback
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __repr__(self) -> str:
+        return f"Place({self.id!r}, {self.name!r}, keywords={len(self.keywords)})"
+
+
+def as_place(rec: Any, keywords: Optional[KeywordDictionary] = None) -> Place:
+    """dict 든 Place 든 Place 로 (exporter 등 두 형식을 모두 받는 곳용)"""
+    return rec if isinstance(rec, Place) else Place.from_dict(rec, keywords)
+
+
+def places_from_dicts(records: Iterable[Dict[str, Any]], keywords: Optional[KeywordDictionary] = None) -> List[Place]:
+    return [Place.from_dict(r, keywords) for r in records]
+
+
+def places_to_dicts(places: Iterable[Place]) -> List[Dict[str, Any]]:
+    return [p.to_dict() for p in places]
+
+
+def refresh_keyword_ids(places: Iterable[Place], keywords: KeywordDictionary) -> None:
+    """KeywordDictionary.save() 가 임시 id 를 바꿨을 때 사전으로 만든 레코드의 keyword_id 를 다시 맞춤"""
+    for place in places:
+        for kw in place.keywords:
+            if kw.keyword_id:
+                kw.keyword_id = keywords.intern(kw.keyword, kw.keyword_code)
+
+
+# ---------- 합성 벤치마크 ----------
+def synthetic_dicts(n: int, seed: int = 3) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    vocab = [(f"키워드{i}", f"K{i:03d}") for i in range(300)]
+    cats = [[f"대분류{i // 10}", f"소분류{i}"] for i in range(200)]
+    out = []
+    for i in range(n):
+        kws = rng.sample(vocab, rng.randint(3, 12))
+        out.append({
+            "id": f"html_{1000000 + i}",
+            "name": f"가게{i}",
+            "categoryCode": "",
+            "category": list(rng.choice(cats)),
+            "algorithm_type": rng.choice(("TYPE_A", "TYPE_B", "TYPE_C")),
+            # JSON 에서 읽은 것처럼 문자열은 레코드마다 별도 객체
+            "keywords": [{"keyword": "".join(list(k)), "keyword_code": "".join(list(c)),
+                          "count": rng.randint(1, 500)} for k, c in kws],
+        })
+    return out
+
+
+def _measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - t0
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def bench(n: int) -> None:
+    src = synthetic_dicts(n)
+    text = json_codec.dumpb(src)
+    rows = sum(len(r["keywords"]) for r in src)
+    del src
+    dicts, dict_bytes, t_dict = _measure(lambda: json_codec.loads(text))
+    print(f"[BENCH] dict records   : {dict_bytes / 2 ** 20:8.1f} MB  ({n} places, {rows} keyword rows, "
+          f"{json_codec.BACKEND} loads {t_dict:.2f}s)")
+    places, place_bytes, t_place = _measure(lambda: places_from_dicts(dicts))
+    print(f"[BENCH] Place/slots    : {place_bytes / 2 ** 20:8.1f} MB  (from_dict {t_place:.2f}s)")
+    kd = KeywordDictionary(path=None)
+    _interned, kd_bytes, t_kd = _measure(lambda: places_from_dicts(dicts, kd))
+    print(f"[BENCH] Place + dict id: {kd_bytes / 2 ** 20:8.1f} MB  (from_dict with KeywordDictionary {t_kd:.2f}s)")
+    t0 = time.perf_counter()
+    back = places_to_dicts(places)
+    print(f"[BENCH] to_dict        : {time.perf_counter() - t0:.2f}s, round trip equal={back == dicts}")
+    print(f"[INFO] Place objects use {place_bytes / dict_bytes:.0%} of the dict form's memory")
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == "bench":
+        bench(int(args[1]) if len(args) > 1 else 100_000)
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
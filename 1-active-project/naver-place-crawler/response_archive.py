@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+원문 응답 보관소 + 오프라인 재파싱 (collect_master_data 용)
+- 수집 중 받은 검색 HTML / GraphQL 응답 본문을 raw_store.ContentStore 에 저장 (sha256 주소, zstd/gzip, 같은 본문은 한 번)
+- 요청 메타는 requests.jsonl 에 한 줄씩: run, seq, kind(search/keywords), status, url, sha, 요청 인자
+  · keywords 줄은 요청한 업체 id(place_id, GraphQL businessId)와 직전 검색 줄의 seq(search), 그 검색 결과에서의
+    위치(rank)를 기록 → 재파싱 때 id 로 업체와 다시 연결하고, 파서가 바뀌어 id(이름 crc32)가 달라졌으면
+    (search, rank) 로 연결
+  · 실행이 끝나면 run_end 줄에 스냅샷 timestamp 기록
+- reparse: 현재 place_parsers 로 보관된 원문을 프로세스 풀에서 다시 파싱 → 레코드/JSON/SQL 재생성 (네트워크 사용 없음)
+  기본 출력은 out/reparsed/<timestamp>.json/.sql, --in-place 면 scrape_results/<timestamp>.json 을 덮어쓰고
+  last_result.json 이 바로 그 실행의 결과일 때만 last_result.json / init_master_data.sql 도 갱신
+  (보관하지 않은 더 최근 실행이 만든 파일은 건드리지 않음)
+- 저장 위치: out/responses_raw/
+사용법:
+  python response_archive.py list
+  python response_archive.py reparse [run ...] [--in-place] [--workers=4]
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import exporter
+import json_codec
+import place_parsers
+from algorithm_classifier import default_classifier
+from keyword_dict import KeywordDictionary
+from raw_store import ContentStore
+from records import Place, places_to_dicts, refresh_keyword_ids
+
+BASE_DIR = Path(__file__).parent.resolve()
+ARCHIVE_DIR = BASE_DIR / "out" / "responses_raw"
+REPARSE_DIR = BASE_DIR / "out" / "reparsed"
+DATA_DIR = BASE_DIR / "scrape_results"
+LAST_JSON = BASE_DIR / "last_result.json"
+SQL_FILE = BASE_DIR / "init_master_data.sql"
+MANIFEST_NAME = "requests.jsonl"
+WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+class ResponseArchive:
+    """한 번의 수집 실행 동안 원문과 요청 메타를 기록"""
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+        self.store = ContentStore(self.root)
+        self.manifest = self.root / MANIFEST_NAME
+        self.run = int(time.time())
+        self.seq = 0
+        self.last_search = 0  # 직전 search 줄의 seq (keywords 줄 연결용)
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, body: bytes, status: int, url: str, **meta) -> int:
+        sha = self.store.put(body, kind=kind, url=url)
+        with self._lock:
+            self.seq += 1
+            entry = {"run": self.run, "seq": self.seq, "kind": kind, "status": status, "url": url, "sha": sha,
+                     "t": round(time.time(), 3), **meta}
+            with open(self.manifest, "a", encoding="utf-8") as f:
+                f.write(json_codec.dumps(entry) + "\n")
+            if kind == "search":
+                self.last_search = self.seq
+            return self.seq
+
+    def finish(self, snapshot_ts: int) -> None:
+        with self._lock:
+            with open(self.manifest, "a", encoding="utf-8") as f:
+                f.write(json_codec.dumps({"run": self.run, "kind": "run_end", "snapshot_ts": snapshot_ts}) + "\n")
+        self.store.save()
+
+
+def load_runs(root: Path = ARCHIVE_DIR) -> Dict[int, List[Dict[str, Any]]]:
+    """requests.jsonl → {run: [entry, ...]} (seq 순)"""
+    runs: Dict[int, List[Dict[str, Any]]] = {}
+    path = Path(root) / MANIFEST_NAME
+    if not path.exists():
+        return runs
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json_codec.loads(line)
+            except json_codec.DecodeError:
+                continue  # 중간에 끊긴 마지막 줄
+            runs.setdefault(entry["run"], []).append(entry)
+    return runs
+
+
+# ---------- 재파싱 (프로세스 풀) ----------
+_STORE: Optional[ContentStore] = None
+
+
+def _init_worker(root: str) -> None:
+    global _STORE
+    _STORE = ContentStore(Path(root))
+
+
+def _parse_entry(entry: Dict[str, Any]) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+    """보관된 응답 하나를 현재 파서로 다시 파싱 → (seq, 결과). 원문이 없거나 차단/실패 응답이면 None."""
+    blob = _STORE.get(entry["sha"]) if _STORE is not None else None
+    if blob is None:
+        return entry["seq"], None
+    text = blob.decode("utf-8", errors="replace")
+    if place_parsers.blocked_reason(entry.get("status", 200), text) or entry.get("status", 200) >= 400:
+        return entry["seq"], None
+    try:
+        if entry["kind"] == "search":
+            return entry["seq"], place_parsers.parse_search_html(text, entry.get("keyword", ""), entry.get("limit", 5))
+        return entry["seq"], place_parsers.parse_visitor_keywords(json_codec.loads(blob))
+    except Exception:
+        return entry["seq"], None
+
+
+def assemble(entries: List[Dict[str, Any]], parsed: Dict[int, Optional[List[Dict[str, Any]]]],
+             keywords: KeywordDictionary) -> Tuple[List[Place], List[Place]]:
+    """
+    한 실행의 파싱 결과 → (records, fallback_records). 수집 때와 같은 규칙:
+    업체 id 로 중복 제거, 키워드 응답이 없거나 실패했으면 fallback 으로 분리 (더미 데이터는 채우지 않고 사전에도
+    넣지 않음). 정상 응답에 키워드가 없으면 빈 키워드의 정상 레코드.
+    """
+    classifier = default_classifier()
+    kw_by_place: Dict[str, List[int]] = {}  # place_id → keywords 줄 seq 목록
+    kw_by_slot: Dict[Tuple[int, int], List[int]] = {}  # (search 줄 seq, 결과 위치) → keywords 줄 seq 목록
+    for e in entries:
+        if e["kind"] != "keywords":
+            continue
+        if e.get("place_id"):
+            kw_by_place.setdefault(e["place_id"], []).append(e["seq"])
+        if e.get("search") and e.get("rank", -1) >= 0:
+            kw_by_slot.setdefault((e["search"], e["rank"]), []).append(e["seq"])
+    records: List[Place] = []
+    fallback: List[Place] = []
+    seen = set()
+    for e in entries:
+        if e["kind"] != "search":
+            continue
+        for rank, place in enumerate(parsed.get(e["seq"]) or []):
+            key = place.get("id") or place.get("name")
+            if key in seen:
+                continue
+            place["algorithm_type"] = classifier.classify(place.get("category", []), place.get("categoryCode", ""))
+            # id 가 그대로면 id 로, 파서 변경으로 id 가 달라졌으면 이 검색 결과의 같은 위치로 연결
+            seqs = kw_by_place.get(place.get("id", "")) or kw_by_slot.get((e["seq"], rank), [])
+            # 같은 업체를 여러 검색에서 요청했으면 성공한 가장 나중 응답 (실패/차단은 None)
+            kws = next((parsed[seq] for seq in reversed(seqs) if parsed.get(seq) is not None), None)
+            place["keywords"] = kws or []
+            if kws is None:
+                place["fallback"] = "keywords"
+                fallback.append(Place.from_dict(place))
+                continue
+            seen.add(key)
+            records.append(Place.from_dict(place, keywords))
+    fallback = [r for r in fallback if r.key not in seen]
+    return records, fallback
+
+
+def reparse(run_ids: Optional[List[int]] = None, in_place: bool = False, workers: int = WORKERS,
+            root: Path = ARCHIVE_DIR) -> List[Path]:
+    runs = load_runs(root)
+    if run_ids:
+        runs = {r: runs[r] for r in run_ids if r in runs}
+    if not runs:
+        print("[WARN] no archived runs to reparse")
+        return []
+    last_ts = None
+    if in_place and LAST_JSON.exists():
+        try:
+            last_ts = json_codec.read(LAST_JSON).get("timestamp")
+        except Exception as e:
+            print(f"[WARN] cannot read {LAST_JSON.name}, leaving it untouched: {e}")
+    jobs = [e for entries in runs.values() for e in entries if e["kind"] in ("search", "keywords")]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(root),)) as pool:
+        parsed = dict(pool.map(_parse_entry, jobs, chunksize=64))
+    print(f"[INFO] reparsed {len(jobs)} response(s) with {workers} worker(s) in {time.perf_counter() - t0:.1f}s")
+
+    keywords = KeywordDictionary.load()
+    written = []
+    for run, entries in sorted(runs.items()):
+        end = next((e for e in reversed(entries) if e["kind"] == "run_end"), None)
+        ts = end["snapshot_ts"] if end else run
+        records, fallback = assemble(entries, parsed, keywords)
+        if keywords.save():  # 새 키워드 id 를 확정한 뒤에 JSON/SQL 을 씀
+            refresh_keyword_ids(records, keywords)
+        payload: Dict[str, Any] = {"timestamp": ts, "records": places_to_dicts(records), "reparsed": int(time.time())}
+        if fallback:
+            payload["fallback_records"] = places_to_dicts(fallback)
+        current = in_place and last_ts is not None and ts == last_ts  # last_result.json 이 이 실행의 결과
+        if in_place:
+            json_path, sql_path = DATA_DIR / f"{ts}.json", (SQL_FILE if current else None)
+        else:
+            json_path, sql_path = REPARSE_DIR / f"{ts}.json", REPARSE_DIR / f"{ts}.sql"
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        data = json_codec.dumpb(payload, indent=True)
+        json_path.write_bytes(data)
+        if current:
+            LAST_JSON.write_bytes(data)
+        if sql_path is not None:
+            exporter.export(records, {"mysql": sql_path}, keywords, ts)
+        written.append(json_path)
+        print(f"[INFO] run {run}: {len(records)} record(s), {len(fallback)} fallback -> {json_path}")
+    return written
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else argv
+    cmd = args[0] if args else "list"
+    if cmd == "list":
+        for run, entries in sorted(load_runs().items()):
+            kinds = [e["kind"] for e in entries]
+            end = next((e for e in entries if e["kind"] == "run_end"), None)
+            print(f"{run}\tsearch={kinds.count('search')}\tkeywords={kinds.count('keywords')}\t"
+                  f"snapshot={end['snapshot_ts'] if end else '-'}")
+    elif cmd == "reparse":
+        workers = WORKERS
+        runs = []
+        for a in args[1:]:
+            if a.startswith("--workers="):
+                workers = max(1, int(a.split("=", 1)[1]))
+            elif a.isdigit():
+                runs.append(int(a))
+        reparse(runs or None, in_place="--in-place" in args, workers=workers)
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
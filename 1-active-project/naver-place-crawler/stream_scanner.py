@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+청크 단위 스트리밍 패턴 스캐너
+- 응답 본문(bytes/str 청크)을 한 번만 훑으면서 등록된 정규식 전부를 적용
+- 청크 경계는 "가장 긴 매치 길이(max_len)" 만큼 겹쳐 두어 경계에 걸친 매치도 놓치지 않음
+  (시작 위치가 버퍼 끝 - overlap 이전인 매치만 확정 → 같은 매치를 두 번 내보내지 않음)
+- 패턴마다 리터럴 프리필터('"code":"' 등)를 두어 리터럴이 없는 구간은 정규식 엔진을 아예 돌리지 않음
+- 버퍼는 chunk_size + overlap 이내로 유지 → 응답 크기와 무관하게 메모리 상한 고정
+사용법:
+  python stream_scanner.py                # 합성 8MB 번들로 벤치마크
+  python stream_scanner.py a.js b.js      # 실제 파일로 벤치마크
+"""
+import codecs
+import re
+import sys
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+CHUNK_SIZE = 1 << 20
+LOOKBEHIND = 16  # 청크를 자를 때 남겨 두는 앞쪽 문맥 (정규식 lookbehind 용)
+
+
+class ScanPattern(NamedTuple):
+    """
+    name: 결과 구분용 이름
+    regex: 컴파일된 정규식 (매치 길이가 max_len 을 넘지 않아야 청크 경계에서 안전)
+    literal: 모든 매치에 반드시 포함되는 리터럴 (프리필터)
+    max_len: 매치 최대 길이 → overlap 크기 결정
+    anchored: literal 이 매치 시작과 같으면 True → find() 로 바로 점프
+    """
+    name: str
+    regex: Pattern
+    literal: str
+    max_len: int
+    anchored: bool = True
+
+
+class StreamScanner:
+    def __init__(self, patterns: List[ScanPattern], chunk_size: int = CHUNK_SIZE):
+        self.patterns = list(patterns)
+        self.chunk_size = chunk_size
+        self.overlap = max((p.max_len for p in self.patterns), default=0)
+
+    def scan(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """
+        청크 이터러블을 받아 (패턴 이름, groups) 를 내보낸다. 그룹이 없는 패턴은 (전체 매치,).
+        순서는 패턴별로는 본문 순서, 패턴 간에는 섞일 수 있음.
+        """
+        decoder = None
+        buf = ""
+        base = 0   # buf[0] 의 절대 오프셋
+        floor = 0  # 이 절대 오프셋 이전에서 시작하는 매치는 이미 확정됨
+        resume = {p.name: 0 for p in self.patterns}
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                chunk = decoder.decode(chunk)
+            if not chunk:
+                continue
+            buf += chunk
+            limit = len(buf) - self.overlap
+            if limit <= floor - base:
+                continue
+            yield from self._scan_buffer(buf, base, floor - base, limit, resume)
+            # lookbehind 가 참조할 수 있도록 확정 지점 앞 LOOKBEHIND 글자는 남겨 둠
+            cut = max(limit - LOOKBEHIND, 0)
+            floor = base + limit
+            buf = buf[cut:]
+            base += cut
+        if decoder is not None:
+            buf += decoder.decode(b"", final=True)
+        yield from self._scan_buffer(buf, base, floor - base, len(buf), resume)
+
+    def scan_text(self, text: Union[str, bytes]) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """이미 메모리에 있는 본문(str 또는 bytes)을 chunk_size 단위로 나눠 스캔"""
+        step = self.chunk_size
+        return self.scan(text[i:i + step] for i in range(0, len(text), step))
+
+    def scan_file(self, path, binary_open=open) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """binary_open 에 gzip.open 등을 넘기면 압축 파일도 그대로 스트리밍"""
+        with binary_open(path, "rb") as f:
+            yield from self.scan(iter(lambda: f.read(self.chunk_size), b""))
+
+    def _scan_buffer(self, buf: str, base: int, start: int, limit: int, resume: dict):
+        # [start, limit) 에서 시작하는 매치만 확정 (limit 이후는 다음 청크와 합쳐 다시 검사)
+        for p in self.patterns:
+            pos = max(resume[p.name] - base, start)
+            if pos >= limit:
+                continue
+            literal = p.literal
+            if p.anchored:
+                # 모든 매치가 literal 로 시작 → 빠른 str.find 로 후보 위치만 골라 match()
+                regex_match = p.regex.match
+                while True:
+                    hit = buf.find(literal, pos, limit + len(literal) - 1)
+                    if hit < 0:
+                        break
+                    m = regex_match(buf, hit)
+                    if m is None:
+                        pos = hit + 1
+                        continue
+                    pos = max(m.end(), hit + 1)
+                    resume[p.name] = base + pos
+                    yield p.name, m.groups() or (m.group(0),)
+                continue
+            hit = buf.find(literal, pos)
+            if hit < 0:
+                continue
+            for m in p.regex.finditer(buf, max(pos, hit - p.max_len)):
+                if m.start() >= limit:
+                    break
+                resume[p.name] = base + max(m.end(), m.start() + 1)
+                yield p.name, m.groups() or (m.group(0),)
+
+
+# ---------- 벤치마크 ----------
+def _bench_patterns() -> List[ScanPattern]:
+    # category_playwright 의 PATTERN1/PATTERN2 와 동일
+    p1 = re.compile(r"\"code\":\"([A-Za-z0-9_-]+)\"[^}]{0,400}?\"name\":\"([^\"]+)\"")
+    p2 = re.compile(r"\"categoryCode\":\"([A-Za-z0-9_-]+)\"[^}]{0,400}?\"category\":\"([^\"]+)\"")
+    return [
+        ScanPattern("code", p1, '"code":"', 1024),
+        ScanPattern("categoryCode", p2, '"categoryCode":"', 1024),
+    ]
+
+
+def _synthetic_bundle(size_mb: int = 8) -> str:
+    # 실제 번들처럼 대부분은 일반 코드이고, 카테고리 테이블은 몇 군데에 몰려 있음
+    filler = 'function(e,t,n){var r=n(12);e.exports={code:"x",a:r,b:[1,2,3],"name":"y"}};' * 400
+    table = "".join(
+        f'{{"code":"DE{i}","id":{i},"name":"디저트{i}"}},{{"categoryCode":"FD{i}","x":0,"category":"음식점{i}"}},'
+        for i in range(300)
+    )
+    block = filler * 40 + table
+    return block * (size_mb * (1 << 20) // len(block.encode("utf-8")) + 1)
+
+
+def _naive(patterns: List[ScanPattern], blob: bytes) -> int:
+    # 기존 방식: 본문 전체를 str 로 만든 뒤 search 로 존재 확인 + 패턴별 finditer
+    text = blob.decode("utf-8", errors="replace")
+    for p in patterns:
+        p.regex.search(text)
+    n = 0
+    for p in patterns:
+        n += sum(1 for _ in p.regex.finditer(text))
+    return n
+
+
+def bench(texts: Optional[List[str]] = None, rounds: int = 3) -> None:
+    texts = texts or [_synthetic_bundle()]
+    patterns = _bench_patterns()
+    scanner = StreamScanner(patterns)
+    total_mb = sum(len(t.encode("utf-8")) for t in texts) / (1 << 20)
+    blobs = [t.encode("utf-8") for t in texts]
+
+    def run_naive():
+        return sum(_naive(patterns, b) for b in blobs)
+
+    def run_stream():
+        # 실제 사용처처럼 bytes 청크를 받아 디코딩까지 포함
+        n = 0
+        for b in blobs:
+            n += sum(1 for _ in scanner.scan(b[i:i + CHUNK_SIZE] for i in range(0, len(b), CHUNK_SIZE)))
+        return n
+
+    results = {}
+    for label, fn in (("naive", run_naive), ("stream", run_stream)):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            count = fn()
+            best = min(best, time.perf_counter() - t0)
+        results[label] = (count, best)
+        print(f"[BENCH] {label:6s} matches={count} {total_mb / best:8.1f} MB/s ({best * 1000:.0f} ms, {total_mb:.1f} MB)")
+    if results["naive"][0] != results["stream"][0]:
+        print("[WARN] match counts differ between naive and stream scans")
+    print(f"[BENCH] speedup x{results['naive'][1] / results['stream'][1]:.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        bench([open(p, encoding="utf-8", errors="replace").read() for p in sys.argv[1:]])
+    else:
+        bench()